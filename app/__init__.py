@@ -3,18 +3,33 @@
 Pacote principal do sistema de Professores Substitutos.
 
 Exporta classes centrais para facilitar importações a partir de `app`.
+A `GUI` é importada sob demanda: depende do pyray (raylib), que não é
+necessário para usar o banco, os relatórios ou o benchmark.
 """
 
-from .database import Database
+from .database import Database, FiltroVagas
+from .instrumentacao import Instrumentacao
 from .models import Professor, Instituicao, Vaga
 from .reports import ReportGenerator
-from .gui import GUI
+from .analytics import ColunasVagas
+from .matching import MotorCompatibilidade
 
 __all__ = [
     "Database",
+    "FiltroVagas",
+    "Instrumentacao",
     "Professor",
     "Instituicao",
     "Vaga",
     "ReportGenerator",
+    "ColunasVagas",
+    "MotorCompatibilidade",
     "GUI",
 ]
+
+
+def __getattr__(nome: str):
+    if nome == "GUI":
+        from .gui import GUI
+        return GUI
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
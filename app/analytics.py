@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de análises sobre colunas de vagas
+
+Para estatísticas não precisamos de objetos `Vaga`: os valores numéricos
+ficam em buffers `array` compactos e os textos repetidos (disciplina,
+status) viram códigos de categoria. Se o NumPy estiver instalado, os
+cálculos usam os mesmos buffers sem cópia.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+
+class ColunasVagas:
+    """Vagas em formato colunar.
+
+    - salario: array('d'), NaN quando o salário não foi informado
+    - carga_horaria: array('i'), 0 quando não informada
+    - disciplina / status: array('I') com o código de cada categoria em
+      `disciplinas` / `status_categorias`
+    """
+
+    __slots__ = ("salario", "carga_horaria", "disciplina", "status",
+                 "disciplinas", "status_categorias", "_codigos_disciplina", "_codigos_status")
+
+    def __init__(self):
+        self.salario = array('d')
+        self.carga_horaria = array('i')
+        self.disciplina = array('I')
+        self.status = array('I')
+        self.disciplinas: List[str] = []
+        self.status_categorias: List[str] = []
+        self._codigos_disciplina: Dict[str, int] = {}
+        self._codigos_status: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.salario)
+
+    @staticmethod
+    def _codigo(valor: str, codigos: Dict[str, int], categorias: List[str]) -> int:
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = len(categorias)
+            codigos[valor] = codigo
+            categorias.append(valor)
+        return codigo
+
+    def adicionar(self, disciplina: str, status: Optional[str],
+                  carga_horaria: Optional[int], salario: Optional[float],
+                  chave_disciplina: Optional[str] = None):
+        """Acrescenta uma vaga às colunas.
+
+        Com `chave_disciplina` (a chave normalizada), grafias diferentes da
+        mesma disciplina dividem o código; o rótulo é a primeira grafia vista.
+        """
+        chave = disciplina if chave_disciplina is None else chave_disciplina
+        codigo = self._codigos_disciplina.get(chave)
+        if codigo is None:
+            codigo = len(self.disciplinas)
+            self._codigos_disciplina[chave] = codigo
+            self.disciplinas.append(disciplina)
+        self.disciplina.append(codigo)
+        self.status.append(self._codigo(status or "", self._codigos_status, self.status_categorias))
+        self.carga_horaria.append(int(carga_horaria or 0))
+        self.salario.append(math.nan if salario is None else float(salario))
+
+
+def _percentil(ordenados: Sequence[float], p: float) -> float:
+    """Percentil `p` (0-100) com interpolação linear, como o padrão do NumPy"""
+    posicao = (len(ordenados) - 1) * p / 100.0
+    inferior = math.floor(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fracao = posicao - inferior
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * fracao
+
+
+def _distribuicao_python(colunas: ColunasVagas) -> List[List[float]]:
+    grupos: List[array] = [array('d') for _ in colunas.disciplinas]
+    for codigo, salario in zip(colunas.disciplina, colunas.salario):
+        if salario == salario:  # descarta NaN
+            grupos[codigo].append(salario)
+    return [sorted(g) for g in grupos]
+
+
+def _distribuicao_numpy(colunas: ColunasVagas) -> List[List[float]]:
+    codigos = np.frombuffer(colunas.disciplina, dtype=np.dtype(colunas.disciplina.typecode))
+    salarios = np.frombuffer(colunas.salario, dtype=np.dtype(colunas.salario.typecode))
+    validos = ~np.isnan(salarios)
+    codigos = codigos[validos]
+    salarios = salarios[validos]
+    ordem = np.lexsort((salarios, codigos))
+    tamanhos = np.bincount(codigos, minlength=len(colunas.disciplinas))
+    limites = np.cumsum(tamanhos)[:-1]
+    return np.split(salarios[ordem], limites)
+
+
+def _carga_media_python(colunas: ColunasVagas) -> List[float]:
+    soma = [0] * len(colunas.disciplinas)
+    qtd = [0] * len(colunas.disciplinas)
+    for codigo, carga in zip(colunas.disciplina, colunas.carga_horaria):
+        soma[codigo] += carga
+        qtd[codigo] += 1
+    return [s / q if q else 0.0 for s, q in zip(soma, qtd)]
+
+
+def _carga_media_numpy(colunas: ColunasVagas) -> List[float]:
+    codigos = np.frombuffer(colunas.disciplina, dtype=np.dtype(colunas.disciplina.typecode))
+    cargas = np.frombuffer(colunas.carga_horaria, dtype=np.dtype(colunas.carga_horaria.typecode))
+    n = len(colunas.disciplinas)
+    soma = np.bincount(codigos, weights=cargas, minlength=n)
+    qtd = np.bincount(codigos, minlength=n)
+    return (soma / np.maximum(qtd, 1)).tolist()
+
+
+def distribuicao_salarios_por_disciplina(colunas: ColunasVagas, usar_numpy: Optional[bool] = None
+                                         ) -> List[Tuple[str, int, float, float, float, float, float, float]]:
+    """Distribuição de salários por disciplina a partir das colunas.
+
+    Retorna (disciplina, qtd, mín, Q1, mediana, Q3, máx, carga_média),
+    ordenado pela mediana (maior primeiro). Vagas sem salário ficam fora
+    da contagem e dos quartis, mas entram na carga horária média.
+    `usar_numpy=None` usa o NumPy quando disponível.
+    """
+    if usar_numpy is None:
+        usar_numpy = np is not None
+    if usar_numpy and np is None:
+        raise RuntimeError("NumPy não está instalado")
+    if not colunas.disciplinas:
+        return []
+
+    if usar_numpy:
+        grupos = _distribuicao_numpy(colunas)
+        carga_media = _carga_media_numpy(colunas)
+    else:
+        grupos = _distribuicao_python(colunas)
+        carga_media = _carga_media_python(colunas)
+
+    resultado: List[Tuple[str, int, float, float, float, float, float, float]] = []
+    for codigo, valores in enumerate(grupos):
+        if len(valores) == 0:
+            continue
+        resultado.append((
+            colunas.disciplinas[codigo],
+            len(valores),
+            float(valores[0]),
+            float(_percentil(valores, 25)),
+            float(_percentil(valores, 50)),
+            float(_percentil(valores, 75)),
+            float(valores[-1]),
+            carga_media[codigo],
+        ))
+    resultado.sort(key=lambda x: x[4], reverse=True)
+    return resultado
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Cache LRU para entidades lidas do banco
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+# Marca "não encontrado no cache" (None é um valor válido: id inexistente)
+AUSENTE = object()
+
+
+class CacheLRU:
+    """Cache LRU de tamanho limitado e thread-safe.
+
+    Cada invalidação incrementa uma geração; `colocar` recebe a geração lida
+    antes da consulta ao banco e descarta o valor se houve invalidação no
+    meio, evitando gravar no cache um dado já desatualizado.
+    """
+
+    def __init__(self, capacidade: int = 1024):
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser maior ou igual a 1")
+        self.capacidade = capacidade
+        self._itens: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._geracao = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def geracao(self) -> int:
+        """Geração atual (muda a cada invalidação)"""
+        return self._geracao
+
+    def obter(self, chave: Hashable) -> Any:
+        """Retorna o valor em cache ou AUSENTE"""
+        with self._lock:
+            valor = self._itens.get(chave, AUSENTE)
+            if valor is AUSENTE:
+                self.falhas += 1
+            else:
+                self.acertos += 1
+                self._itens.move_to_end(chave)
+            return valor
+
+    def colocar(self, chave: Hashable, valor: Any, geracao: int):
+        """Guarda o valor se nenhuma invalidação ocorreu desde `geracao`"""
+        with self._lock:
+            if geracao != self._geracao:
+                return
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+                self.despejos += 1
+
+    def invalidar(self, *chaves: Hashable):
+        """Remove as chaves informadas"""
+        with self._lock:
+            self._geracao += 1
+            for chave in chaves:
+                self._itens.pop(chave, None)
+
+    def limpar(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._geracao += 1
+            self._itens.clear()
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores de acertos, falhas e despejos, além do tamanho atual"""
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "despejos": self.despejos,
+                "tamanho": len(self._itens),
+                "capacidade": self.capacidade,
+            }
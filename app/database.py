@@ -3,333 +3,1588 @@
 Módulo de banco de dados usando SQLite
 """
 
+import copy
 import sqlite3
+from datetime import date, datetime
 import os
-from typing import List, Optional
-from .models import Professor, Instituicao, Vaga
+import queue
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from .models import Professor, Instituicao, Vaga, normalizar_texto
+from .analytics import ColunasVagas
+from .cache import AUSENTE, CacheLRU
+from .instrumentacao import Instrumentacao
+
+# Quantidade de registros enviada por executemany nas inserções em lote
+# (mantém o IN (...) da busca de ids abaixo do limite de variáveis do SQLite)
+TAMANHO_LOTE = 500
+
+# Modos aceitos para conflitos de CPF/CNPJ nas inserções em lote
+MODOS_CONFLITO = (None, "ignorar", "atualizar")
+
+# Tamanho padrão de página nas listagens paginadas
+TAMANHO_PAGINA = 50
+
+# Quantidade padrão de resultados das buscas textuais
+LIMITE_BUSCA = 50
+
+# Faixas do aging de vagas abertas: (rótulo, dias mínimos, dias máximos);
+# None = sem limite superior
+FAIXAS_AGING = (
+    ("0-7", 0, 7),
+    ("8-30", 8, 30),
+    ("31-90", 31, 90),
+    ("90+", 91, None),
+)
+
+# Vagas abertas sem data_cadastro (ou com data que o SQLite não entende):
+# ficam fora da listagem de aging e são contadas à parte nesta faixa
+FAIXA_SEM_DATA = "sem data"
+
+# data_cadastro utilizável no aging (strftime de NULL ou texto inválido é NULL)
+_SQL_DATA_VALIDA = "strftime('%s', data_cadastro) IS NOT NULL"
+
+# Dias completos entre data_cadastro e a data de referência (parâmetro),
+# em segundos inteiros para não depender de arredondamento de ponto
+# flutuante; datas futuras contam como 0, datas inválidas/nulas dão NULL
+_SQL_DIAS_ABERTA = ("MAX(0, (CAST(strftime('%s', ?) AS INTEGER) "
+                    "- CAST(strftime('%s', data_cadastro) AS INTEGER)) / 86400)")
+
+
+def faixa_aging(dias: int) -> str:
+    """Rótulo da faixa de FAIXAS_AGING que contém `dias`"""
+    for rotulo, minimo, maximo in FAIXAS_AGING:
+        if dias >= minimo and (maximo is None or dias <= maximo):
+            return rotulo
+    return FAIXAS_AGING[0][0]
+
+
+# Índices FTS5 (external content) e as colunas indexadas de cada tabela.
+# Os pesos do bm25 seguem a ordem das colunas: nome pesa mais que email.
+INDICES_TEXTO = {
+    "professores": ("professores_fts", ("nome", "email", "especialidade"), (10.0, 1.0, 5.0)),
+    "vagas": ("vagas_fts", ("disciplina", "descricao"), (5.0, 1.0)),
+}
+
+# Colunas com chave normalizada (ver models.normalizar_texto), mantidas pelo
+# Database em toda inserção/atualização: tabela -> ((origem, chave), ...)
+COLUNAS_NORMALIZADAS = {
+    "professores": (("nome", "nome_norm"), ("especialidade", "especialidade_norm")),
+    "instituicoes": (("nome", "nome_norm"),),
+    "vagas": (("disciplina", "disciplina_norm"),),
+}
+
+# Grupos da tabela `estatisticas` (contadores mantidos por triggers):
+# - total: chave = nome da tabela, qtd = linhas
+# - vagas_status: chave = status
+# - abertas_disciplina: chave = disciplina_norm, qtd = vagas Abertas
+# - salario_disciplina: chave = disciplina_norm, qtd/soma dos salários informados
+
+
+def _incrementar(grupo: str, chave: str, condicao: str = "1", soma: str = "0") -> str:
+    """Comando de trigger que soma 1 (e `soma`) ao contador quando `condicao`"""
+    return (f"INSERT INTO estatisticas (grupo, chave, qtd, soma) "
+            f"SELECT '{grupo}', {chave}, 1, {soma} WHERE {condicao} "
+            f"ON CONFLICT(grupo, chave) DO UPDATE SET qtd = qtd + 1, soma = soma + excluded.soma;")
+
+
+def _decrementar(grupo: str, chave: str, condicao: str = "1", soma: str = "0") -> str:
+    """Comando de trigger que desfaz um `_incrementar`"""
+    return (f"UPDATE estatisticas SET qtd = qtd - 1, soma = soma - ({soma}) "
+            f"WHERE grupo = '{grupo}' AND chave = {chave} AND {condicao};")
+
+
+def _contadores_vaga(operacao: Callable[..., str], linha: str) -> str:
+    """Comandos por-status/por-disciplina de uma vaga (`linha` = new ou old)"""
+    return "\n".join([
+        operacao("vagas_status", f"COALESCE({linha}.status, '')"),
+        operacao("abertas_disciplina", f"COALESCE({linha}.disciplina_norm, '')",
+                 f"{linha}.status = 'Aberta'"),
+        operacao("salario_disciplina", f"COALESCE({linha}.disciplina_norm, '')",
+                 f"{linha}.salario IS NOT NULL", f"{linha}.salario"),
+    ])
+
+
+# PRAGMAs que podem compor um perfil de desempenho
+PRAGMAS_PERFIL = ("journal_mode", "synchronous", "cache_size", "mmap_size",
+                  "temp_store", "busy_timeout")
+
+# Perfis de desempenho, aplicados uma vez a cada conexão criada pelo pool.
+#
+# - "padrao": mantém os padrões do SQLite (journal em rollback).
+# - "leitura": para uso dominado por listagens e relatórios. WAL permite que
+#   leitores não sejam bloqueados pelo escritor; cache de 64 MB e mmap de
+#   256 MB reduzem as leituras do arquivo.
+# - "escrita": para cargas em lote e muitos cadastros. WAL com
+#   synchronous=NORMAL (sem fsync a cada commit, ainda seguro contra
+#   corrupção), temporários em memória e busy_timeout maior para esperar o
+#   checkpoint em vez de falhar com "database is locked".
+PERFIS: Dict[str, Dict[str, Any]] = {
+    "padrao": {},
+    "leitura": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "escrita": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "busy_timeout": 15000,
+    },
+}
+
+# Colunas aceitas como chave de ordenação nas listagens paginadas
+ORDENACOES_PROFESSORES = ("id", "nome", "especialidade")
+ORDENACOES_INSTITUICOES = ("id", "nome", "cidade")
+ORDENACOES_VAGAS = ("id", "disciplina", "status", "salario", "data_cadastro")
+
+
+def _resolver_perfil(perfil: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """Valida um perfil (nome em PERFIS ou dicionário de PRAGMAs)"""
+    if perfil is None:
+        return {}
+    if isinstance(perfil, str):
+        if perfil not in PERFIS:
+            raise ValueError(f"Perfil desconhecido: {perfil!r} (use um de {sorted(PERFIS)})")
+        return dict(PERFIS[perfil])
+    for nome, valor in perfil.items():
+        if nome not in PRAGMAS_PERFIL:
+            raise ValueError(f"PRAGMA não suportado no perfil: {nome!r}")
+        if not isinstance(valor, int) and not str(valor).isalnum():
+            raise ValueError(f"Valor inválido para {nome}: {valor!r}")
+    return dict(perfil)
+
+
+def _consulta_fts(texto: str) -> str:
+    """Converte o texto digitado em uma consulta FTS5 segura.
+
+    Cada palavra vira um prefixo entre aspas ("mat"*), combinados com AND;
+    operadores e pontuação digitados pelo usuário são descartados.
+    """
+    return " ".join(f'"{termo}"*' for termo in re.findall(r"\w+", texto))
+
+
+def _faixa_prefixo(prefixo: str) -> Tuple[str, str]:
+    """Limites [inicio, fim) das chaves normalizadas que começam com
+    `prefixo`: a comparação por faixa usa o índice, ao contrário de LIKE"""
+    inicio = normalizar_texto(prefixo)
+    return inicio, inicio + "\U0010ffff"
+
+
+def _em_lotes(registros: Iterable[Tuple[Any, ...]], tamanho: int) -> Iterator[List[Tuple[Any, ...]]]:
+    """Consome um iterável em listas de até `tamanho` itens"""
+    it = iter(registros)
+    while True:
+        lote = list(islice(it, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+class Paginador:
+    """Janela de páginas sobre uma listagem keyset (`listar_*_pagina`).
+
+    Carrega apenas as páginas pedidas por `janela()`, pré-carregando a
+    página seguinte, e mantém no máximo `paginas_em_cache` páginas em
+    memória. Guarda o último item de cada página percorrida, que serve de
+    chave para buscar a próxima.
+
+    `preparar`, se informado, é aplicado uma vez a cada item quando a página
+    é carregada (ex.: formatar os textos de um card); `janela()` passa a
+    produzir o resultado de `preparar` no lugar do item.
+    """
+
+    def __init__(self, buscar_pagina: Callable[[Optional[Any], int], List[Any]],
+                 total: int, tamanho_pagina: int = TAMANHO_PAGINA,
+                 paginas_em_cache: int = 4,
+                 preparar: Optional[Callable[[Any], Any]] = None):
+        self._buscar_pagina = buscar_pagina
+        self._preparar = preparar
+        self.total = total
+        self.tamanho_pagina = tamanho_pagina
+        self.paginas_em_cache = paginas_em_cache
+        self._paginas: "OrderedDict[int, List[Any]]" = OrderedDict()
+        self._ultimos: List[Any] = []
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _carregar(self, numero: int) -> List[Any]:
+        """Busca a página `numero`; exige a chave da página anterior"""
+        apos = self._ultimos[numero - 1] if numero > 0 else None
+        pagina = self._buscar_pagina(apos, self.tamanho_pagina)
+        if pagina and numero == len(self._ultimos):
+            self._ultimos.append(pagina[-1])
+        if self._preparar is not None:
+            pagina = [self._preparar(item) for item in pagina]
+        self._paginas[numero] = pagina
+        while len(self._paginas) > self.paginas_em_cache:
+            self._paginas.popitem(last=False)
+        return pagina
+
+    def pagina(self, numero: int) -> List[Any]:
+        """Retorna a página `numero`, buscando-a (e as chaves anteriores) se preciso"""
+        if numero in self._paginas:
+            self._paginas.move_to_end(numero)
+            return self._paginas[numero]
+        # Percorre as páginas ainda sem chave conhecida até chegar à pedida
+        while len(self._ultimos) < numero:
+            if not self._carregar(len(self._ultimos)):
+                return []
+        return self._carregar(numero)
+
+    def janela(self, inicio: int, fim: int) -> Iterator[Tuple[int, Any]]:
+        """Itera (índice, item) de `inicio` até `fim` (exclusivo)"""
+        inicio = max(0, inicio)
+        fim = min(fim, self.total)
+        for indice in range(inicio, fim):
+            pagina = self.pagina(indice // self.tamanho_pagina)
+            deslocamento = indice % self.tamanho_pagina
+            if deslocamento >= len(pagina):
+                break
+            yield indice, pagina[deslocamento]
+        # Pré-carrega a página seguinte à última visível
+        proxima = max(inicio, fim - 1) // self.tamanho_pagina + 1
+        if proxima * self.tamanho_pagina < self.total:
+            self.pagina(proxima)
+
+
+class FiltroVagas:
+    """Critérios combináveis de consulta de vagas (todos opcionais, em AND).
+
+    `compilar()` gera a condição SQL parametrizada usada pelo Database, que
+    cai nos índices de vagas; `aceita()` avalia a mesma regra em Python, para
+    vagas já carregadas em memória.
+
+    - status: um status ou uma sequência de status (IN)
+    - disciplina: comparada pela chave normalizada (disciplina_norm)
+    - instituicao_id
+    - salario_min / salario_max, carga_min / carga_max: faixas inclusivas
+    - cadastrada_desde / cadastrada_antes: data_cadastro >= desde e < antes,
+      como texto 'AAAA-MM-DD[ HH:MM:SS]' ou date/datetime
+
+    Valores NULL nunca satisfazem uma faixa, como no SQL.
+    """
+
+    __slots__ = ("status", "disciplina", "instituicao_id", "salario_min", "salario_max",
+                 "carga_min", "carga_max", "cadastrada_desde", "cadastrada_antes")
+
+    def __init__(self, status: Union[str, Sequence[str], None] = None,
+                 disciplina: Optional[str] = None, instituicao_id: Optional[int] = None,
+                 salario_min: Optional[float] = None, salario_max: Optional[float] = None,
+                 carga_min: Optional[int] = None, carga_max: Optional[int] = None,
+                 cadastrada_desde: Union[str, date, None] = None,
+                 cadastrada_antes: Union[str, date, None] = None):
+        self.status = status
+        self.disciplina = disciplina
+        self.instituicao_id = instituicao_id
+        self.salario_min = salario_min
+        self.salario_max = salario_max
+        self.carga_min = carga_min
+        self.carga_max = carga_max
+        self.cadastrada_desde = cadastrada_desde
+        self.cadastrada_antes = cadastrada_antes
+
+    @classmethod
+    def combinar(cls, filtro: Optional["FiltroVagas"] = None, **criterios: Any) -> "FiltroVagas":
+        """`filtro` (ou um filtro vazio) com os critérios não-None sobrepostos"""
+        base = filtro if filtro is not None else cls()
+        alteracoes = {campo: valor for campo, valor in criterios.items() if valor is not None}
+        return base.com(**alteracoes) if alteracoes else base
+
+    def com(self, **alteracoes: Any) -> "FiltroVagas":
+        """Cópia do filtro com os campos informados substituídos"""
+        for campo in alteracoes:
+            if campo not in self.__slots__:
+                raise TypeError(f"Critério de filtro desconhecido: {campo!r}")
+        valores = {campo: getattr(self, campo) for campo in self.__slots__}
+        valores.update(alteracoes)
+        return FiltroVagas(**valores)
+
+    def criterios(self) -> Dict[str, Any]:
+        """Campos preenchidos do filtro"""
+        return {campo: getattr(self, campo) for campo in self.__slots__
+                if getattr(self, campo) is not None}
+
+    def __bool__(self) -> bool:
+        return bool(self.criterios())
+
+    def __repr__(self):
+        return "FiltroVagas(" + ", ".join(f"{c}={v!r}" for c, v in self.criterios().items()) + ")"
+
+    @staticmethod
+    def _data(valor: Union[str, date]) -> str:
+        """Data no formato texto de data_cadastro (comparável como string)"""
+        if isinstance(valor, datetime):
+            return valor.strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(valor, date):
+            return valor.isoformat()
+        return valor
+
+    def _faixas(self) -> List[Tuple[str, str, Any]]:
+        """(coluna, operador, valor) das faixas preenchidas"""
+        faixas = [
+            ("salario", ">=", self.salario_min), ("salario", "<=", self.salario_max),
+            ("carga_horaria", ">=", self.carga_min), ("carga_horaria", "<=", self.carga_max),
+            ("data_cadastro", ">=", None if self.cadastrada_desde is None else self._data(self.cadastrada_desde)),
+            ("data_cadastro", "<", None if self.cadastrada_antes is None else self._data(self.cadastrada_antes)),
+        ]
+        return [f for f in faixas if f[2] is not None]
+
+    def compilar(self, prefixo: str = "") -> Tuple[str, Tuple[Any, ...]]:
+        """Condição SQL (sem WHERE) e parâmetros; ("", ()) se o filtro é vazio.
+
+        `prefixo` qualifica as colunas (ex.: "v." em consultas com JOIN).
+        """
+        condicoes: List[str] = []
+        params: List[Any] = []
+        if self.status is not None:
+            if isinstance(self.status, str):
+                condicoes.append(f"{prefixo}status = ?")
+                params.append(self.status)
+            else:
+                valores = list(self.status)
+                condicoes.append(f"{prefixo}status IN ({','.join('?' * len(valores))})" if valores else "0")
+                params.extend(valores)
+        if self.disciplina is not None:
+            condicoes.append(f"{prefixo}disciplina_norm = ?")
+            params.append(normalizar_texto(self.disciplina))
+        if self.instituicao_id is not None:
+            condicoes.append(f"{prefixo}instituicao_id = ?")
+            params.append(self.instituicao_id)
+        for coluna, operador, valor in self._faixas():
+            condicoes.append(f"{prefixo}{coluna} {operador} ?")
+            params.append(valor)
+        return " AND ".join(condicoes), tuple(params)
+
+    def aceita(self, vaga: Vaga) -> bool:
+        """True se a vaga satisfaz o filtro (mesma regra de `compilar`)"""
+        if self.status is not None:
+            if isinstance(self.status, str):
+                if vaga.status != self.status:
+                    return False
+            elif vaga.status not in self.status:
+                return False
+        if self.disciplina is not None and normalizar_texto(vaga.disciplina) != normalizar_texto(self.disciplina):
+            return False
+        if self.instituicao_id is not None and vaga.instituicao_id != self.instituicao_id:
+            return False
+        for coluna, operador, limite in self._faixas():
+            valor = getattr(vaga, coluna)
+            if valor is None:
+                return False
+            if operador == ">=" and not valor >= limite:
+                return False
+            if operador == "<=" and not valor <= limite:
+                return False
+            if operador == "<" and not valor < limite:
+                return False
+        return True
 
-from typing import Optional
 
 class Database:
-    """Classe para gerenciar o banco de dados SQLite"""
-    
-    def __init__(self, db_name: Optional[str] = None):
+    """Classe para gerenciar o banco de dados SQLite
+
+    Mantém um pool de conexões de longa duração. Cada thread recebe uma
+    conexão do pool através de `conexao()` e a devolve ao sair do bloco,
+    evitando o custo de abrir/configurar/fechar uma conexão por chamada.
+    """
+
+    def __init__(self, db_name: Optional[str] = None, pool_size: int = 5,
+                 pool_timeout: float = 30.0,
+                 perfil: Union[str, Dict[str, Any], None] = None,
+                 cache_entidades: int = 1024,
+                 instrumentacao: Optional[Instrumentacao] = None):
         # Default DB under data/ directory
         if db_name is None:
             os.makedirs('data', exist_ok=True)
             db_name = os.path.join('data', 'sistema_professores.db')
+        if pool_size < 1:
+            raise ValueError("pool_size deve ser maior ou igual a 1")
         self.db_name = db_name
+        # Cada conexão com ':memory:' abriria um banco distinto: as conexões
+        # do pool abrem o mesmo banco em memória (cache compartilhado), com
+        # nome único para não misturar instâncias
+        self._destino = db_name
+        if db_name == ':memory:':
+            self._destino = f"file:memoria_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        # PRAGMAs de desempenho (ver PERFIS)
+        self.perfil = _resolver_perfil(perfil)
+        # Cache LRU de buscar_* por id (0 desativa)
+        self.cache: Optional[CacheLRU] = CacheLRU(cache_entidades) if cache_entidades > 0 else None
+
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._conexoes: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._fechado = False
+        # False quando o SQLite não foi compilado com FTS5 (busca cai em LIKE)
+        self.busca_texto_disponivel = True
+        # Métricas por método e SQL executado (None: nada é instrumentado)
+        self.instrumentacao = instrumentacao
+        if instrumentacao is not None:
+            instrumentacao.instrumentar(self, "Database", ignorar=(
+                "conexao", "transacao_leitura", "get_connection", "close"))
+
         self.create_tables()
-    
-    def get_connection(self):
-        """Cria uma conexão com o banco de dados"""
-        conn = sqlite3.connect(self.db_name)
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Cria uma nova conexão configurada com o banco de dados"""
+        # O pool entrega conexões a threads diferentes ao longo do tempo
+        conn = sqlite3.connect(self._destino, check_same_thread=False,
+                               uri=self._destino != self.db_name)
         # Garantir integridade referencial no SQLite (desabilitado por padrão)
         try:
             conn.execute('PRAGMA foreign_keys = ON')
         except Exception:
             pass
+        for nome, valor in self.perfil.items():
+            conn.execute(f'PRAGMA {nome} = {valor}')
+        if self.instrumentacao is not None:
+            conn.set_trace_callback(self.instrumentacao.registrar_sql)
         return conn
-    
+
+    def pragmas_ativos(self) -> Dict[str, Any]:
+        """Lê, na conexão da thread atual, os valores efetivos dos PRAGMAs de perfil"""
+        with self.conexao() as conn:
+            return {
+                nome: conn.execute(f'PRAGMA {nome}').fetchone()[0]
+                for nome in PRAGMAS_PERFIL
+            }
+
+    # ===== POOL DE CONEXÕES =====
+
+    def _adquirir_conexao(self) -> sqlite3.Connection:
+        """Retira uma conexão do pool, criando-a se ainda houver espaço"""
+        if self._fechado:
+            raise sqlite3.ProgrammingError("Banco de dados já foi fechado")
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if len(self._conexoes) < self.pool_size:
+                conn = self.get_connection()
+                self._conexoes.append(conn)
+                return conn
+
+        try:
+            return self._pool.get(timeout=self.pool_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                "Tempo esgotado aguardando conexão livre no pool"
+            ) from None
+
+    def _liberar_conexao(self, conn: sqlite3.Connection):
+        """Devolve a conexão ao pool (ou fecha, se o banco foi fechado)"""
+        with self._pool_lock:
+            if self._fechado:
+                conn.close()
+                if conn in self._conexoes:
+                    self._conexoes.remove(conn)
+                return
+        self._pool.put(conn)
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta a conexão do pool associada à thread atual.
+
+        Blocos aninhados na mesma thread reutilizam a mesma conexão; a
+        transação é confirmada (ou desfeita, em caso de erro) somente ao sair
+        do bloco mais externo. As invalidações do cache de entidades feitas
+        dentro do bloco só são aplicadas após esse commit (e descartadas no
+        rollback, quando o cache continua correto).
+        """
+        conn: Optional[sqlite3.Connection] = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._adquirir_conexao()
+        self._local.conn = conn
+        self._local.invalidacoes = []
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            if self._local.invalidacoes and self.cache is not None:
+                self.cache.invalidar(*self._local.invalidacoes)
+        finally:
+            self._local.invalidacoes = []
+            self._local.conn = None
+            self._liberar_conexao(conn)
+
+    @contextmanager
+    def transacao_leitura(self) -> Iterator[sqlite3.Connection]:
+        """Bloco em que todas as leituras da thread enxergam o mesmo retrato
+        do banco.
+
+        Abre uma transação na conexão da thread (se ainda não houver) e fixa
+        o retrato já na entrada. Com WAL as escritas de outras conexões
+        seguem e não são vistas; no journal padrão esperam o fim do bloco.
+        """
+        with self.conexao() as conn:
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+            conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+            yield conn
+
+    def close(self):
+        """Fecha todas as conexões do pool.
+
+        Conexões emprestadas no momento são fechadas quando devolvidas.
+        """
+        with self._pool_lock:
+            self._fechado = True
+            while True:
+                try:
+                    conn = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+                if conn in self._conexoes:
+                    self._conexoes.remove(conn)
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _iterar(self, sql: str, params: Sequence[Any] = ()) -> Iterator[Tuple[Any, ...]]:
+        """Itera sobre o resultado de uma consulta sem carregá-lo inteiro.
+
+        As linhas são lidas do cursor em blocos de TAMANHO_LOTE. Fora de um
+        bloco `conexao()` o iterador usa uma conexão própria do pool (sem
+        vinculá-la à thread), devolvida quando é esgotado ou fechado.
+
+        Não grave no banco enquanto percorre um `iterar_*`: a leitura em
+        aberto mantém um lock de leitura e, sem WAL, a escrita falha (em
+        arquivo, com "database is locked" depois de esperar pelo lock; em
+        ':memory:', na hora). Consultas de leitura dentro do laço funcionam.
+        Para alterar os itens, use `listar_*` ou guarde os ids e grave
+        depois do laço.
+        """
+        conn: Optional[sqlite3.Connection] = getattr(self._local, 'conn', None)
+        propria = conn is None
+        if conn is None:
+            conn = self._adquirir_conexao()
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(TAMANHO_LOTE)
+                if not rows:
+                    break
+                yield from rows
+            cursor.close()
+        finally:
+            if propria:
+                conn.rollback()
+                self._liberar_conexao(conn)
+
+    def _consulta_pagina(self, tabela: str, ordem: str, permitidas: Sequence[str],
+                         apos: Optional[Any], limite: int, condicao: str = "",
+                         condicao_params: Tuple[Any, ...] = ()) -> Tuple[str, Tuple[Any, ...]]:
+        """Monta a consulta keyset de uma página ordenada por (`ordem`, id).
+
+        `apos` é o último item da página anterior (ou None para a primeira).
+        Valores NULL na coluna de ordenação vêm primeiro, como no SQLite.
+        `condicao` é um filtro SQL adicional (ex.: `FiltroVagas.compilar()`).
+        """
+        if ordem not in permitidas:
+            raise ValueError(f"Ordenação inválida para {tabela}: {ordem!r}")
+        if limite < 1:
+            raise ValueError("limite deve ser maior ou igual a 1")
+
+        condicoes: List[str] = [condicao] if condicao else []
+        params: Tuple[Any, ...] = condicao_params
+        if ordem == "id":
+            if apos is not None:
+                condicoes.append('id > ?')
+                params += (apos.id,)
+            ordenacao = 'id'
+        else:
+            if apos is not None:
+                valor = getattr(apos, ordem)
+                if valor is None:
+                    condicoes.append(f'({ordem} IS NOT NULL OR id > ?)')
+                    params += (apos.id,)
+                else:
+                    condicoes.append(f'({ordem} > ? OR ({ordem} = ? AND id > ?))')
+                    params += (valor, valor, apos.id)
+            ordenacao = f'{ordem}, id'
+
+        sql = f'SELECT * FROM {tabela}'
+        if condicoes:
+            sql += ' WHERE ' + ' AND '.join(condicoes)
+        sql += f' ORDER BY {ordenacao} LIMIT ?'
+        return sql, params + (limite,)
+
+    def _contar(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Executa uma consulta COUNT(*) e retorna o valor"""
+        with self.conexao() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    # ===== CACHE DE ENTIDADES =====
+
+    def _buscar_por_id(self, tabela: str, entidade_id: int, from_row: Callable[[Any], Any]) -> Any:
+        """Busca uma entidade pelo id, passando pelo cache quando ativo.
+
+        Retorna uma cópia do objeto em cache, para que alterações feitas por
+        quem chamou não contaminem o cache.
+        """
+        if self.cache is None or self._em_transacao():
+            # Dentro de uma transação aberta a leitura pode ver escritas
+            # ainda não confirmadas: não passa pelo cache
+            return self._ler_por_id(tabela, entidade_id, from_row)
+
+        chave = (tabela, entidade_id)
+        entidade = self.cache.obter(chave)
+        if entidade is AUSENTE:
+            geracao = self.cache.geracao()
+            entidade = self._ler_por_id(tabela, entidade_id, from_row)
+            self.cache.colocar(chave, entidade, geracao)
+        return copy.copy(entidade)
+
+    def _ler_por_id(self, tabela: str, entidade_id: int, from_row: Callable[[Any], Any]) -> Any:
+        with self.conexao() as conn:
+            row = conn.execute(f'SELECT * FROM {tabela} WHERE id = ?', (entidade_id,)).fetchone()
+        return from_row(row) if row else None
+
+    def _em_transacao(self) -> bool:
+        """True se a conexão da thread atual tem uma transação aberta"""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, 'conn', None)
+        return conn is not None and conn.in_transaction
+
+    def _invalidar(self, tabela: str, *ids: Any):
+        """Remove entidades do cache após uma escrita.
+
+        Dentro de um bloco `conexao()` a remoção fica pendente até o commit
+        do bloco mais externo (ver `conexao`).
+        """
+        if self.cache is None:
+            return
+        chaves = [(tabela, i) for i in ids]
+        if getattr(self._local, 'conn', None) is not None:
+            self._local.invalidacoes.extend(chaves)
+        else:
+            self.cache.invalidar(*chaves)
+
+    def estatisticas_cache(self) -> Optional[Dict[str, int]]:
+        """Contadores do cache de entidades (None se desativado)"""
+        return self.cache.estatisticas() if self.cache is not None else None
+
     def create_tables(self):
         """Cria as tabelas do banco de dados"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Tabela de professores
+        with self.conexao() as conn:
+            cursor = conn.cursor()
+
+            # Tabela de professores
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS professores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL,
+                    cpf TEXT UNIQUE NOT NULL,
+                    email TEXT,
+                    telefone TEXT,
+                    especialidade TEXT,
+                    nome_norm TEXT,
+                    especialidade_norm TEXT
+                )
+            ''')
+
+            # Tabela de instituições
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS instituicoes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome TEXT NOT NULL,
+                    cnpj TEXT UNIQUE NOT NULL,
+                    endereco TEXT,
+                    cidade TEXT,
+                    estado TEXT,
+                    nome_norm TEXT
+                )
+            ''')
+
+            # Tabela de vagas
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS vagas (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    instituicao_id INTEGER,
+                    disciplina TEXT NOT NULL,
+                    carga_horaria INTEGER,
+                    salario REAL,
+                    descricao TEXT,
+                    status TEXT DEFAULT 'Aberta',
+                    professor_id INTEGER,
+                    data_cadastro TEXT,
+                    disciplina_norm TEXT,
+                    FOREIGN KEY (instituicao_id) REFERENCES instituicoes(id),
+                    FOREIGN KEY (professor_id) REFERENCES professores(id)
+                )
+            ''')
+
+            # Índices para melhorar desempenho em buscas comuns
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_professores_cpf ON professores(cpf)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_instituicoes_cnpj ON instituicoes(cnpj)")
+
+            # Chaves normalizadas (bancos antigos ganham as colunas aqui)
+            self._migrar_colunas_normalizadas(cursor)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_professores_nome_norm ON professores(nome_norm)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_professores_especialidade_norm ON professores(especialidade_norm)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_instituicoes_nome_norm ON instituicoes(nome_norm)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_disciplina_norm ON vagas(disciplina_norm)")
+
+            # Índices de vagas para FiltroVagas. Os compostos cobrem também as
+            # buscas só pela primeira coluna, substituindo os índices simples
+            # de status e instituicao_id; disciplina (sem normalizar) não é
+            # mais consultada.
+            for antigo in ("idx_vagas_status", "idx_vagas_disciplina", "idx_vagas_instituicao"):
+                cursor.execute(f"DROP INDEX IF EXISTS {antigo}")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_status_disciplina ON vagas(status, disciplina_norm)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_instituicao_status ON vagas(instituicao_id, status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_salario ON vagas(salario)")
+            # Aging: vagas de um status já na ordem de cadastro (top-N sem ordenar)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_status_data ON vagas(status, data_cadastro)")
+            # Cobre professores_alocados() e a checagem de FK ao excluir professor
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_professor_status ON vagas(professor_id, status)")
+
+            self._criar_indices_texto(cursor)
+            self._criar_estatisticas(cursor)
+
+    def _criar_estatisticas(self, cursor: sqlite3.Cursor):
+        """Cria a tabela de contadores e os triggers que a mantêm.
+
+        Os triggers rodam na mesma transação de cada INSERT/UPDATE/DELETE, então
+        os contadores nunca divergem dos dados confirmados. Na primeira criação
+        (inclusive em banco já populado) a tabela é preenchida do zero.
+        """
+        existia = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'estatisticas'"
+        ).fetchone() is not None
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS professores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                cpf TEXT UNIQUE NOT NULL,
-                email TEXT,
-                telefone TEXT,
-                especialidade TEXT
-            )
+            CREATE TABLE IF NOT EXISTS estatisticas (
+                grupo TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                qtd INTEGER NOT NULL DEFAULT 0,
+                soma REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (grupo, chave)
+            ) WITHOUT ROWID
+        ''')
+
+        for tabela in ("professores", "instituicoes"):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS estatisticas_{tabela}_ai AFTER INSERT ON {tabela} BEGIN
+                    {_incrementar("total", f"'{tabela}'")}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS estatisticas_{tabela}_ad AFTER DELETE ON {tabela} BEGIN
+                    {_decrementar("total", f"'{tabela}'")}
+                END
+            ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS estatisticas_vagas_ai AFTER INSERT ON vagas BEGIN
+                {_incrementar("total", "'vagas'")}
+                {_contadores_vaga(_incrementar, "new")}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS estatisticas_vagas_ad AFTER DELETE ON vagas BEGIN
+                {_decrementar("total", "'vagas'")}
+                {_contadores_vaga(_decrementar, "old")}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS estatisticas_vagas_au
+            AFTER UPDATE OF status, disciplina_norm, salario ON vagas BEGIN
+                {_contadores_vaga(_decrementar, "old")}
+                {_contadores_vaga(_incrementar, "new")}
+            END
+        ''')
+
+        if not existia:
+            self._recalcular_estatisticas(cursor)
+
+    @staticmethod
+    def _recalcular_estatisticas(cursor: sqlite3.Cursor):
+        """Refaz todos os contadores a partir das tabelas"""
+        cursor.execute("DELETE FROM estatisticas")
+        cursor.execute('''
+            INSERT INTO estatisticas (grupo, chave, qtd, soma)
+            SELECT 'total', 'professores', COUNT(*), 0 FROM professores
+            UNION ALL SELECT 'total', 'instituicoes', COUNT(*), 0 FROM instituicoes
+            UNION ALL SELECT 'total', 'vagas', COUNT(*), 0 FROM vagas
         ''')
-        
-        # Tabela de instituições
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS instituicoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                cnpj TEXT UNIQUE NOT NULL,
-                endereco TEXT,
-                cidade TEXT,
-                estado TEXT
-            )
+            INSERT INTO estatisticas (grupo, chave, qtd, soma)
+            SELECT 'vagas_status', COALESCE(status, ''), COUNT(*), 0
+            FROM vagas GROUP BY COALESCE(status, '')
         ''')
-        
-        # Tabela de vagas
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS vagas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                instituicao_id INTEGER,
-                disciplina TEXT NOT NULL,
-                carga_horaria INTEGER,
-                salario REAL,
-                descricao TEXT,
-                status TEXT DEFAULT 'Aberta',
-                professor_id INTEGER,
-                data_cadastro TEXT,
-                FOREIGN KEY (instituicao_id) REFERENCES instituicoes(id),
-                FOREIGN KEY (professor_id) REFERENCES professores(id)
-            )
+            INSERT INTO estatisticas (grupo, chave, qtd, soma)
+            SELECT 'abertas_disciplina', COALESCE(disciplina_norm, ''), COUNT(*), 0
+            FROM vagas WHERE status = 'Aberta' GROUP BY COALESCE(disciplina_norm, '')
         ''')
-        
-        # Índices para melhorar desempenho em buscas comuns
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_professores_cpf ON professores(cpf)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_instituicoes_cnpj ON instituicoes(cnpj)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_status ON vagas(status)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_disciplina ON vagas(disciplina)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_instituicao ON vagas(instituicao_id)")
-
-        conn.commit()
-        conn.close()
-    
+        cursor.execute('''
+            INSERT INTO estatisticas (grupo, chave, qtd, soma)
+            SELECT 'salario_disciplina', COALESCE(disciplina_norm, ''), COUNT(*), SUM(salario)
+            FROM vagas WHERE salario IS NOT NULL GROUP BY COALESCE(disciplina_norm, '')
+        ''')
+
+    def reconstruir_estatisticas(self):
+        """Recalcula a tabela de estatísticas do zero.
+
+        Os triggers a mantêm sozinhos; use após alterações feitas com os
+        triggers desativados ou para eliminar o arredondamento acumulado nas
+        somas de salário.
+        """
+        with self.conexao() as conn:
+            self._recalcular_estatisticas(conn.cursor())
+
+    def _estatisticas(self, grupo: str) -> List[Tuple[str, int, float]]:
+        """(chave, qtd, soma) dos contadores não zerados de um grupo"""
+        with self.conexao() as conn:
+            return conn.execute(
+                'SELECT chave, qtd, soma FROM estatisticas WHERE grupo = ? AND qtd > 0', (grupo,)
+            ).fetchall()
+
+    def _estatistica(self, grupo: str, chave: str) -> int:
+        """Valor de um contador (0 se não existir)"""
+        return self._contar(
+            'SELECT COALESCE(MAX(qtd), 0) FROM estatisticas WHERE grupo = ? AND chave = ?', (grupo, chave)
+        )
+
+    @staticmethod
+    def _migrar_colunas_normalizadas(cursor: sqlite3.Cursor):
+        """Adiciona e preenche as colunas de COLUNAS_NORMALIZADAS que faltarem"""
+        for tabela, pares in COLUNAS_NORMALIZADAS.items():
+            existentes = {row[1] for row in cursor.execute(f"PRAGMA table_info({tabela})")}
+            for origem, chave in pares:
+                if chave in existentes:
+                    continue
+                cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {chave} TEXT")
+                linhas = cursor.execute(f"SELECT id, {origem} FROM {tabela}").fetchall()
+                cursor.executemany(
+                    f"UPDATE {tabela} SET {chave} = ? WHERE id = ?",
+                    [(normalizar_texto(valor), id_) for id_, valor in linhas]
+                )
+
+    def _criar_indices_texto(self, cursor: sqlite3.Cursor):
+        """Cria os índices FTS5 e os triggers que os mantêm sincronizados.
+
+        As tabelas FTS são "external content": guardam só o índice e leem o
+        texto da tabela original. Um banco anterior ao índice é indexado
+        uma vez (comando 'rebuild') na criação.
+        """
+        for tabela, (fts, colunas, _) in INDICES_TEXTO.items():
+            existia = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            ).fetchone() is not None
+            try:
+                cursor.execute(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                        {", ".join(colunas)},
+                        content='{tabela}', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                ''')
+            except sqlite3.OperationalError:
+                self.busca_texto_disponivel = False
+                return
+
+            lista = ", ".join(colunas)
+            novos = ", ".join(f"new.{c}" for c in colunas)
+            antigos = ", ".join(f"old.{c}" for c in colunas)
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabela} BEGIN
+                    INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {novos});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabela} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+                END
+            ''')
+            # Só reindexa quando uma coluna indexada muda (não em troca de status)
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {lista} ON {tabela} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+                    INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {novos});
+                END
+            ''')
+            if not existia:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def _condicao_texto(self, tabela: str, texto: str, condicao: str = "",
+                        condicao_params: Tuple[Any, ...] = ()) -> Tuple[str, str, Tuple[Any, ...]]:
+        """(FROM, WHERE, parâmetros) das linhas de `tabela` (alias "t") que
+        casam com `texto`: MATCH no índice FTS5 ou, sem FTS5, LIKE nas mesmas
+        colunas. `condicao` é um filtro SQL adicional com colunas prefixadas
+        por "t.". FROM vazio quando o texto não tem nenhuma palavra."""
+        consulta = _consulta_fts(texto)
+        if not consulta:
+            return "", "", ()
+        fts, colunas, _ = INDICES_TEXTO[tabela]
+
+        if self.busca_texto_disponivel:
+            origem = f'{fts} f JOIN {tabela} t ON t.id = f.rowid'
+            condicoes = f'{fts} MATCH ?'
+            params: Tuple[Any, ...] = (consulta,)
+        else:
+            termos = re.findall(r"\w+", texto)
+            origem = f'{tabela} t'
+            condicoes = " AND ".join(
+                "(" + " OR ".join(f"t.{c} LIKE ?" for c in colunas) + ")" for _ in termos
+            )
+            params = tuple(f"%{t}%" for t in termos for _ in colunas)
+        if condicao:
+            condicoes += " AND " + condicao
+        return origem, condicoes, params + condicao_params
+
+    def _buscar_texto(self, tabela: str, texto: str, limite: int, condicao: str = "",
+                      condicao_params: Tuple[Any, ...] = (), apos_id: Optional[int] = None
+                      ) -> List[Tuple[Any, ...]]:
+        """Linhas de `tabela` que casam com `texto`, da mais relevante (bm25)
+        para a menos relevante. Sem FTS5, faz um LIKE nas mesmas colunas e
+        ordena por id.
+
+        Paginação keyset como em `_consulta_pagina`: `apos_id` é o id do
+        último resultado da página anterior, que ainda precisa casar com a
+        busca (se deixou de casar, a página vem vazia).
+        """
+        if limite < 1:
+            raise ValueError("limite deve ser maior ou igual a 1")
+        origem, condicoes, params = self._condicao_texto(tabela, texto, condicao, condicao_params)
+        if not origem:
+            return []
+
+        if not self.busca_texto_disponivel:
+            if apos_id is not None:
+                condicoes += " AND t.id > ?"
+                params += (apos_id,)
+            sql = f'SELECT t.* FROM {origem} WHERE {condicoes} ORDER BY t.id LIMIT ?'
+            return list(self._iterar(sql, params + (limite,)))
+
+        fts, _, pesos = INDICES_TEXTO[tabela]
+        sql = f'''
+            WITH resultado AS (
+                SELECT t.*, bm25({fts}, {", ".join(map(str, pesos))}) AS relevancia
+                FROM {origem}
+                WHERE {condicoes}
+            )
+            SELECT * FROM resultado
+        '''
+        if apos_id is not None:
+            sql += ' WHERE (relevancia, id) > (SELECT relevancia, id FROM resultado WHERE id = ?)'
+            params += (apos_id,)
+        sql += ' ORDER BY relevancia, id LIMIT ?'
+        return list(self._iterar(sql, params + (limite,)))
+
+    def _contar_texto(self, tabela: str, texto: str, condicao: str = "",
+                      condicao_params: Tuple[Any, ...] = ()) -> int:
+        """Quantidade de linhas que `_buscar_texto` percorreria sem limite"""
+        origem, condicoes, params = self._condicao_texto(tabela, texto, condicao, condicao_params)
+        if not origem:
+            return 0
+        return self._contar(f'SELECT COUNT(*) FROM {origem} WHERE {condicoes}', params)
+
+    # ===== INSERÇÃO EM LOTE =====
+
+    def _inserir_em_lote(self, sql: str, registros: Iterable[Tuple[Any, ...]],
+                         tabela: str, coluna_chave: Optional[str] = None,
+                         indice_chave: int = 0) -> List[int]:
+        """Executa `sql` com executemany em uma única transação.
+
+        Os registros são consumidos em lotes de TAMANHO_LOTE, sem materializar
+        o iterável inteiro. Retorna os ids na ordem de entrada: pela chave
+        única (`coluna_chave`) quando informada, ou pela faixa contígua
+        terminada em last_insert_rowid() nas inserções simples.
+        """
+        ids: List[int] = []
+        with self.conexao() as conn:
+            for lote in _em_lotes(registros, TAMANHO_LOTE):
+                conn.executemany(sql, lote)
+                if coluna_chave is None:
+                    ultimo: int = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    ids.extend(range(ultimo - len(lote) + 1, ultimo + 1))
+                    continue
+                chaves = [r[indice_chave] for r in lote]
+                unicas = list(set(chaves))
+                marcadores = ','.join('?' * len(unicas))
+                mapa = dict(conn.execute(
+                    f'SELECT {coluna_chave}, id FROM {tabela} WHERE {coluna_chave} IN ({marcadores})',
+                    unicas
+                ))
+                ids.extend(mapa[c] for c in chaves)
+        return ids
+
+    @staticmethod
+    def _clausula_conflito(conflito: Optional[str], coluna_chave: str,
+                           colunas: Sequence[str]) -> str:
+        """Monta o ON CONFLICT para o modo de conflito escolhido"""
+        if conflito not in MODOS_CONFLITO:
+            raise ValueError(f"Modo de conflito inválido: {conflito!r}")
+        if conflito == "ignorar":
+            return f" ON CONFLICT({coluna_chave}) DO NOTHING"
+        if conflito == "atualizar":
+            atribuicoes = ", ".join(f"{c}=excluded.{c}" for c in colunas if c != coluna_chave)
+            return f" ON CONFLICT({coluna_chave}) DO UPDATE SET {atribuicoes}"
+        return ""
+
+    def inserir_professores_em_lote(self, professores: Iterable[Professor],
+                                    conflito: Optional[str] = None) -> List[int]:
+        """Insere vários professores em uma única transação.
+
+        `conflito` define o tratamento de CPF já cadastrado: None (erro),
+        "ignorar" (mantém o registro existente) ou "atualizar" (sobrescreve).
+        Retorna os ids na ordem de entrada.
+        """
+        colunas = ("nome", "cpf", "email", "telefone", "especialidade",
+                   "nome_norm", "especialidade_norm")
+        sql = (
+            f"INSERT INTO professores ({', '.join(colunas)}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+            + self._clausula_conflito(conflito, "cpf", colunas)
+        )
+        registros = (
+            (p.nome, p.cpf, p.email, p.telefone, p.especialidade,
+             normalizar_texto(p.nome), normalizar_texto(p.especialidade))
+            for p in professores
+        )
+        chave = "cpf" if conflito else None
+        ids = self._inserir_em_lote(sql, registros, "professores", chave, indice_chave=1)
+        self._invalidar('professores', *ids)
+        return ids
+
+    def inserir_instituicoes_em_lote(self, instituicoes: Iterable[Instituicao],
+                                     conflito: Optional[str] = None) -> List[int]:
+        """Insere várias instituições em uma única transação.
+
+        `conflito` segue as mesmas regras de `inserir_professores_em_lote`,
+        usando o CNPJ como chave. Retorna os ids na ordem de entrada.
+        """
+        colunas = ("nome", "cnpj", "endereco", "cidade", "estado", "nome_norm")
+        sql = (
+            f"INSERT INTO instituicoes ({', '.join(colunas)}) VALUES (?, ?, ?, ?, ?, ?)"
+            + self._clausula_conflito(conflito, "cnpj", colunas)
+        )
+        registros = (
+            (i.nome, i.cnpj, i.endereco, i.cidade, i.estado, normalizar_texto(i.nome))
+            for i in instituicoes
+        )
+        chave = "cnpj" if conflito else None
+        ids = self._inserir_em_lote(sql, registros, "instituicoes", chave, indice_chave=1)
+        self._invalidar('instituicoes', *ids)
+        return ids
+
+    def inserir_vagas_em_lote(self, vagas: Iterable[Vaga]) -> List[int]:
+        """Insere várias vagas em uma única transação e retorna seus ids"""
+        sql = '''
+            INSERT INTO vagas (instituicao_id, disciplina, carga_horaria, salario,
+                              descricao, status, professor_id, data_cadastro,
+                              disciplina_norm)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        '''
+        registros = (
+            (v.instituicao_id, v.disciplina, v.carga_horaria, v.salario,
+             v.descricao, v.status, v.professor_id, v.data_cadastro,
+             normalizar_texto(v.disciplina))
+            for v in vagas
+        )
+        ids = self._inserir_em_lote(sql, registros, "vagas")
+        self._invalidar('vagas', *ids)
+        return ids
+
     # ===== PROFESSORES =====
-    
+
     def inserir_professor(self, professor: Professor) -> int:
         """Insere um novo professor no banco de dados"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO professores (nome, cpf, email, telefone, especialidade)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (professor.nome, professor.cpf, professor.email, 
-              professor.telefone, professor.especialidade))
-        
-        assert cursor.lastrowid is not None
-        professor_id: int = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        with self.conexao() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO professores (nome, cpf, email, telefone, especialidade,
+                                         nome_norm, especialidade_norm)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (professor.nome, professor.cpf, professor.email,
+                  professor.telefone, professor.especialidade,
+                  normalizar_texto(professor.nome), normalizar_texto(professor.especialidade)))
+
+            assert cursor.lastrowid is not None
+            professor_id: int = cursor.lastrowid
+
+        self._invalidar('professores', professor_id)
         return professor_id
-    
+
     def listar_professores(self) -> List[Professor]:
         """Lista todos os professores"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM professores')
-        rows = cursor.fetchall()
-        conn.close()
-        
-        professores: List[Professor] = []
-        for row in rows:
-            prof = Professor(
-                id=row[0], nome=row[1], cpf=row[2],
-                email=row[3], telefone=row[4], especialidade=row[5]
-            )
-            professores.append(prof)
-        
-        return professores
-    
+        return list(self.iterar_professores())
+
+    def iterar_professores(self) -> Iterator[Professor]:
+        """Itera sobre todos os professores sem carregar a tabela em memória"""
+        return map(Professor.from_row, self._iterar('SELECT * FROM professores ORDER BY id'))
+
+    def listar_professores_pagina(self, apos: Optional[Professor] = None,
+                                  limite: int = TAMANHO_PAGINA, ordem: str = "id") -> List[Professor]:
+        """Lista uma página de professores (paginação keyset).
+
+        `apos` é o último professor da página anterior; `ordem` deve estar em
+        ORDENACOES_PROFESSORES.
+        """
+        sql, params = self._consulta_pagina("professores", ordem, ORDENACOES_PROFESSORES, apos, limite)
+        return [Professor.from_row(row) for row in self._iterar(sql, params)]
+
+    def contar_professores(self) -> int:
+        """Retorna o total de professores (contador da tabela estatisticas)"""
+        return self._estatistica('total', 'professores')
+
+    def listar_professores_por_especialidade(self, especialidade: str) -> List[Professor]:
+        """Professores de uma especialidade, ignorando acentos e maiúsculas
+        (busca pelo índice de especialidade_norm)"""
+        return [Professor.from_row(row) for row in self._iterar(
+            'SELECT * FROM professores WHERE especialidade_norm = ? ORDER BY id',
+            (normalizar_texto(especialidade),)
+        )]
+
+    def buscar_professores_por_nome(self, prefixo: str, limite: int = LIMITE_BUSCA) -> List[Professor]:
+        """Professores cujo nome começa com `prefixo` (sem acentos/maiúsculas),
+        em ordem alfabética"""
+        inicio, fim = _faixa_prefixo(prefixo)
+        return [Professor.from_row(row) for row in self._iterar(
+            'SELECT * FROM professores WHERE nome_norm >= ? AND nome_norm < ? '
+            'ORDER BY nome_norm, id LIMIT ?', (inicio, fim, limite)
+        )]
+
+    def buscar_professores_texto(self, texto: str, limite: int = LIMITE_BUSCA,
+                                 apos: Optional[Professor] = None) -> List[Professor]:
+        """Busca textual (FTS5) em nome, email e especialidade.
+
+        Cada palavra é tratada como prefixo e todas precisam aparecer;
+        acentos e maiúsculas são ignorados. Resultados em ordem de relevância;
+        `apos` é o último professor da página anterior (paginação keyset).
+        """
+        return [Professor.from_row(row) for row in self._buscar_texto(
+            "professores", texto, limite, apos_id=apos.id if apos is not None else None)]
+
+    def contar_professores_texto(self, texto: str) -> int:
+        """Total de professores encontrados por `buscar_professores_texto`"""
+        return self._contar_texto("professores", texto)
+
     def buscar_professor(self, professor_id: int) -> Optional[Professor]:
         """Busca um professor pelo ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM professores WHERE id = ?', (professor_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return Professor(
-                id=row[0], nome=row[1], cpf=row[2],
-                email=row[3], telefone=row[4], especialidade=row[5]
-            )
-        return None
-    
+        return self._buscar_por_id('professores', professor_id, Professor.from_row)
+
     def atualizar_professor(self, professor: Professor):
         """Atualiza os dados de um professor"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE professores 
-            SET nome=?, cpf=?, email=?, telefone=?, especialidade=?
-            WHERE id=?
-        ''', (professor.nome, professor.cpf, professor.email,
-              professor.telefone, professor.especialidade, professor.id))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.conexao() as conn:
+            conn.execute('''
+                UPDATE professores
+                SET nome=?, cpf=?, email=?, telefone=?, especialidade=?,
+                    nome_norm=?, especialidade_norm=?
+                WHERE id=?
+            ''', (professor.nome, professor.cpf, professor.email,
+                  professor.telefone, professor.especialidade,
+                  normalizar_texto(professor.nome), normalizar_texto(professor.especialidade),
+                  professor.id))
+        self._invalidar('professores', professor.id)
+
     def deletar_professor(self, professor_id: int):
         """Deleta um professor"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM professores WHERE id = ?', (professor_id,))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.conexao() as conn:
+            conn.execute('DELETE FROM professores WHERE id = ?', (professor_id,))
+        self._invalidar('professores', professor_id)
+
     # ===== INSTITUIÇÕES =====
-    
+
     def inserir_instituicao(self, instituicao: Instituicao) -> int:
         """Insere uma nova instituição"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO instituicoes (nome, cnpj, endereco, cidade, estado)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (instituicao.nome, instituicao.cnpj, instituicao.endereco,
-              instituicao.cidade, instituicao.estado))
-        
-        assert cursor.lastrowid is not None
-        instituicao_id: int = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        with self.conexao() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO instituicoes (nome, cnpj, endereco, cidade, estado, nome_norm)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (instituicao.nome, instituicao.cnpj, instituicao.endereco,
+                  instituicao.cidade, instituicao.estado, normalizar_texto(instituicao.nome)))
+
+            assert cursor.lastrowid is not None
+            instituicao_id: int = cursor.lastrowid
+
+        self._invalidar('instituicoes', instituicao_id)
         return instituicao_id
-    
+
     def listar_instituicoes(self) -> List[Instituicao]:
         """Lista todas as instituições"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM instituicoes')
-        rows = cursor.fetchall()
-        conn.close()
-        
-        instituicoes: List[Instituicao] = []
-        for row in rows:
-            inst = Instituicao(
-                id=row[0], nome=row[1], cnpj=row[2],
-                endereco=row[3], cidade=row[4], estado=row[5]
-            )
-            instituicoes.append(inst)
-        
-        return instituicoes
-    
+        return list(self.iterar_instituicoes())
+
+    def iterar_instituicoes(self) -> Iterator[Instituicao]:
+        """Itera sobre todas as instituições sem carregar a tabela em memória"""
+        return map(Instituicao.from_row, self._iterar('SELECT * FROM instituicoes ORDER BY id'))
+
+    def listar_instituicoes_pagina(self, apos: Optional[Instituicao] = None,
+                                   limite: int = TAMANHO_PAGINA, ordem: str = "id") -> List[Instituicao]:
+        """Lista uma página de instituições (paginação keyset).
+
+        `apos` é a última instituição da página anterior; `ordem` deve estar
+        em ORDENACOES_INSTITUICOES.
+        """
+        sql, params = self._consulta_pagina("instituicoes", ordem, ORDENACOES_INSTITUICOES, apos, limite)
+        return [Instituicao.from_row(row) for row in self._iterar(sql, params)]
+
+    def contar_instituicoes(self) -> int:
+        """Retorna o total de instituições (contador da tabela estatisticas)"""
+        return self._estatistica('total', 'instituicoes')
+
+    def buscar_instituicoes_por_nome(self, prefixo: str, limite: int = LIMITE_BUSCA,
+                                     apos: Optional[Instituicao] = None) -> List[Instituicao]:
+        """Instituições cujo nome começa com `prefixo` (sem acentos/maiúsculas),
+        em ordem alfabética; `apos` é a última instituição da página anterior
+        (paginação keyset)"""
+        inicio, fim = _faixa_prefixo(prefixo)
+        sql = 'SELECT * FROM instituicoes WHERE nome_norm >= ? AND nome_norm < ?'
+        params: Tuple[Any, ...] = (inicio, fim)
+        if apos is not None:
+            chave = normalizar_texto(apos.nome)
+            sql += ' AND (nome_norm > ? OR (nome_norm = ? AND id > ?))'
+            params += (chave, chave, apos.id)
+        return [Instituicao.from_row(row) for row in self._iterar(
+            sql + ' ORDER BY nome_norm, id LIMIT ?', params + (limite,)
+        )]
+
+    def contar_instituicoes_por_nome(self, prefixo: str) -> int:
+        """Total de instituições encontradas por `buscar_instituicoes_por_nome`"""
+        inicio, fim = _faixa_prefixo(prefixo)
+        return self._contar('SELECT COUNT(*) FROM instituicoes WHERE nome_norm >= ? AND nome_norm < ?',
+                            (inicio, fim))
+
     def buscar_instituicao(self, instituicao_id: int) -> Optional[Instituicao]:
         """Busca uma instituição pelo ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM instituicoes WHERE id = ?', (instituicao_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return Instituicao(
-                id=row[0], nome=row[1], cnpj=row[2],
-                endereco=row[3], cidade=row[4], estado=row[5]
-            )
-        return None
-    
+        return self._buscar_por_id('instituicoes', instituicao_id, Instituicao.from_row)
+
     def atualizar_instituicao(self, instituicao: Instituicao):
         """Atualiza os dados de uma instituição"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE instituicoes 
-            SET nome=?, cnpj=?, endereco=?, cidade=?, estado=?
-            WHERE id=?
-        ''', (instituicao.nome, instituicao.cnpj, instituicao.endereco,
-              instituicao.cidade, instituicao.estado, instituicao.id))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.conexao() as conn:
+            conn.execute('''
+                UPDATE instituicoes
+                SET nome=?, cnpj=?, endereco=?, cidade=?, estado=?, nome_norm=?
+                WHERE id=?
+            ''', (instituicao.nome, instituicao.cnpj, instituicao.endereco,
+                  instituicao.cidade, instituicao.estado, normalizar_texto(instituicao.nome),
+                  instituicao.id))
+        self._invalidar('instituicoes', instituicao.id)
+
     def deletar_instituicao(self, instituicao_id: int):
         """Deleta uma instituição"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM instituicoes WHERE id = ?', (instituicao_id,))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.conexao() as conn:
+            conn.execute('DELETE FROM instituicoes WHERE id = ?', (instituicao_id,))
+        self._invalidar('instituicoes', instituicao_id)
+
     # ===== VAGAS =====
-    
+
     def inserir_vaga(self, vaga: Vaga) -> int:
         """Insere uma nova vaga"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO vagas (instituicao_id, disciplina, carga_horaria, salario, 
-                              descricao, status, professor_id, data_cadastro)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria, vaga.salario,
-              vaga.descricao, vaga.status, vaga.professor_id, vaga.data_cadastro))
-        
-        assert cursor.lastrowid is not None
-        vaga_id: int = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        with self.conexao() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO vagas (instituicao_id, disciplina, carga_horaria, salario,
+                                  descricao, status, professor_id, data_cadastro,
+                                  disciplina_norm)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria, vaga.salario,
+                  vaga.descricao, vaga.status, vaga.professor_id, vaga.data_cadastro,
+                  normalizar_texto(vaga.disciplina)))
+
+            assert cursor.lastrowid is not None
+            vaga_id: int = cursor.lastrowid
+
+        self._invalidar('vagas', vaga_id)
         return vaga_id
-    
+
     def listar_vagas(self) -> List[Vaga]:
         """Lista todas as vagas"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM vagas')
-        rows = cursor.fetchall()
-        conn.close()
-        
-        vagas: List[Vaga] = []
-        for row in rows:
-            vaga = Vaga(
-                id=row[0], instituicao_id=row[1], disciplina=row[2],
-                carga_horaria=row[3], salario=row[4], descricao=row[5],
-                status=row[6], professor_id=row[7]
-            )
-            vaga.data_cadastro = row[8]
-            vagas.append(vaga)
-        
-        return vagas
-    
+        return list(self.iterar_vagas())
+
+    @staticmethod
+    def _where(filtro: Optional[FiltroVagas], prefixo: str = "") -> Tuple[str, Tuple[Any, ...]]:
+        """Cláusula ' WHERE ...' de um filtro de vagas (vazia sem critérios)"""
+        if filtro is None:
+            return '', ()
+        condicao, params = filtro.compilar(prefixo)
+        return (' WHERE ' + condicao, params) if condicao else ('', ())
+
+    def consultar_vagas(self, filtro: Optional[FiltroVagas] = None, **criterios: Any) -> Iterator[Vaga]:
+        """Itera, em ordem de id, as vagas que satisfazem o filtro.
+
+        Os critérios podem vir em um `FiltroVagas` e/ou como argumentos
+        nomeados (os mesmos campos), que se sobrepõem ao filtro:
+        `db.consultar_vagas(status="Aberta", salario_min=2000)`.
+        """
+        where, params = self._where(FiltroVagas.combinar(filtro, **criterios))
+        return map(Vaga.from_row, self._iterar('SELECT * FROM vagas' + where + ' ORDER BY id', params))
+
+    def iterar_vagas(self, status: Optional[str] = None, disciplina: Optional[str] = None,
+                     filtro: Optional[FiltroVagas] = None) -> Iterator[Vaga]:
+        """Itera sobre as vagas (opcionalmente de um status e/ou disciplina)
+        sem carregá-las todas. `disciplina` ignora acentos e maiúsculas."""
+        return self.consultar_vagas(filtro, status=status, disciplina=disciplina)
+
+    def listar_vagas_pagina(self, apos: Optional[Vaga] = None,
+                            limite: int = TAMANHO_PAGINA, ordem: str = "id",
+                            filtro: Optional[FiltroVagas] = None) -> List[Vaga]:
+        """Lista uma página de vagas (paginação keyset).
+
+        `apos` é a última vaga da página anterior; `ordem` deve estar em
+        ORDENACOES_VAGAS; `filtro` restringe as vagas listadas.
+        """
+        condicao, condicao_params = filtro.compilar() if filtro is not None else ("", ())
+        sql, params = self._consulta_pagina("vagas", ordem, ORDENACOES_VAGAS, apos, limite,
+                                            condicao, condicao_params)
+        return [Vaga.from_row(row) for row in self._iterar(sql, params)]
+
+    def contar_vagas(self, status: Optional[str] = None, disciplina: Optional[str] = None,
+                     filtro: Optional[FiltroVagas] = None) -> int:
+        """Retorna o total de vagas (opcionalmente filtradas).
+
+        Sem filtro, ou filtrando só por um status, lê o contador da tabela
+        estatisticas; os demais filtros contam no índice correspondente.
+        """
+        criterios = FiltroVagas.combinar(filtro, status=status, disciplina=disciplina)
+        if not criterios:
+            return self._estatistica('total', 'vagas')
+        if criterios.criterios().keys() == {"status"} and isinstance(criterios.status, str):
+            return self._estatistica('vagas_status', criterios.status)
+        where, params = self._where(criterios)
+        return self._contar('SELECT COUNT(*) FROM vagas' + where, params)
+
+    def professores_alocados(self) -> Set[int]:
+        """Ids dos professores vinculados a alguma vaga não cancelada"""
+        with self.conexao() as conn:
+            return {row[0] for row in conn.execute(
+                "SELECT DISTINCT professor_id FROM vagas "
+                "WHERE professor_id IS NOT NULL AND status != 'Cancelada'"
+            )}
+
+    # ===== AGREGAÇÕES =====
+
+    def contar_vagas_por_status(self) -> Dict[str, int]:
+        """Conta as vagas por status (contadores da tabela estatisticas)"""
+        return {(chave or None): qtd for chave, qtd, _ in self._estatisticas('vagas_status')}
+
+    def contar_vagas_por_disciplina(self, status: Optional[str] = None,
+                                    filtro: Optional[FiltroVagas] = None) -> List[Tuple[str, int]]:
+        """Conta as vagas por disciplina, da maior para a menor demanda.
+
+        Agrupa pela chave normalizada ("Matemática" e "MATEMATICA" juntas),
+        exibindo a grafia da primeira vaga cadastrada. Empates seguem a
+        ordem dessa primeira vaga.
+        """
+        criterios = FiltroVagas.combinar(filtro, status=status)
+        if criterios.criterios() == {"status": "Aberta"}:
+            return self._abertas_por_disciplina()
+
+        # Com um único MIN() no SELECT, o SQLite tira `disciplina` da mesma
+        # linha do MIN(id)
+        where, params = self._where(criterios)
+        sql = ('SELECT disciplina, COUNT(*) AS qtd, MIN(id) AS primeira FROM vagas' + where
+               + ' GROUP BY disciplina_norm ORDER BY qtd DESC, primeira')
+
+        with self.conexao() as conn:
+            return [(disciplina, qtd) for disciplina, qtd, _ in conn.execute(sql, params)]
+
+    def _abertas_por_disciplina(self) -> List[Tuple[str, int]]:
+        """`contar_vagas_por_disciplina(status="Aberta")` pelos contadores.
+
+        A grafia exibida (e o desempate) vem da primeira vaga aberta de cada
+        disciplina: uma busca pontual no índice (status, disciplina_norm).
+        """
+        with self.conexao() as conn:
+            grupos = []
+            for chave, qtd, _ in self._estatisticas('abertas_disciplina'):
+                primeira = conn.execute(
+                    "SELECT id, disciplina FROM vagas WHERE status = 'Aberta' AND disciplina_norm = ? "
+                    "ORDER BY id LIMIT 1", (chave,)
+                ).fetchone()
+                if primeira is not None:
+                    grupos.append((qtd, primeira[0], primeira[1]))
+        grupos.sort(key=lambda g: (-g[0], g[1]))
+        return [(disciplina, qtd) for qtd, _, disciplina in grupos]
+
+    def medias_salario_por_disciplina(self) -> List[Tuple[str, int, float]]:
+        """(disciplina, qtd, salário médio) pelas somas da tabela estatisticas.
+
+        Mesmo agrupamento e grafia de `estatisticas_salario_por_disciplina`,
+        ordenado pela maior média (empate: primeira vaga do grupo).
+        """
+        with self.conexao() as conn:
+            grupos = []
+            for chave, qtd, soma in self._estatisticas('salario_disciplina'):
+                primeira = conn.execute(
+                    "SELECT id, disciplina FROM vagas WHERE disciplina_norm = ? AND salario IS NOT NULL "
+                    "ORDER BY id LIMIT 1", (chave,)
+                ).fetchone()
+                if primeira is not None:
+                    grupos.append((soma / qtd, primeira[0], primeira[1], qtd))
+        grupos.sort(key=lambda g: (-g[0], g[1]))
+        return [(disciplina, qtd, media) for media, _, disciplina, qtd in grupos]
+
+    def estatisticas_salario_por_disciplina(self) -> List[Tuple[str, int, float, float, float]]:
+        """Estatísticas de salário por disciplina: (disciplina, qtd, mín, média, máx).
+
+        Agrupa pela chave normalizada, com a grafia da primeira vaga do grupo.
+        Ordenado pelo maior salário máximo; vagas sem salário são ignoradas.
+        """
+        with self.conexao() as conn:
+            return conn.execute('''
+                WITH grupos AS (
+                    SELECT COUNT(*) AS qtd, MIN(salario) AS minimo, AVG(salario) AS media,
+                           MAX(salario) AS maximo, MIN(id) AS primeira
+                    FROM vagas
+                    WHERE salario IS NOT NULL
+                    GROUP BY disciplina_norm
+                )
+                SELECT v.disciplina, g.qtd, g.minimo, g.media, g.maximo
+                FROM grupos g
+                JOIN vagas v ON v.id = g.primeira
+                ORDER BY g.maximo DESC, g.primeira
+            ''').fetchall()
+
+    @staticmethod
+    def _referencia_aging(referencia: Optional[datetime]) -> str:
+        """Data de referência do aging no formato de data_cadastro (hora local)"""
+        return (referencia or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+
+    def aging_vagas_abertas(self, limite: Optional[int] = None, referencia: Optional[datetime] = None
+                            ) -> List[Tuple[int, str, int, int]]:
+        """(vaga_id, disciplina, instituicao_id, dias em aberto) das vagas
+        Abertas, da mais antiga para a mais recente.
+
+        Os dias são calculados no próprio SQL, relativos a `referencia`
+        (padrão: agora). A ordem vem do índice (status, data_cadastro), então
+        `limite` (top-N mais antigas) lê só as primeiras linhas do índice.
+        Vagas sem data de cadastro válida ficam de fora (ver FAIXA_SEM_DATA).
+        """
+        sql = (f"SELECT id, disciplina, instituicao_id, {_SQL_DIAS_ABERTA} FROM vagas "
+               f"WHERE status = 'Aberta' AND data_cadastro IS NOT NULL AND {_SQL_DATA_VALIDA} "
+               "ORDER BY data_cadastro, id")
+        params: Tuple[Any, ...] = (self._referencia_aging(referencia),)
+        if limite is not None:
+            sql += " LIMIT ?"
+            params += (limite,)
+        return list(self._iterar(sql, params))
+
+    def aging_por_faixa(self, referencia: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        """Quantidade de vagas Abertas em cada faixa de FAIXAS_AGING
+        (todas as faixas, na ordem da constante), em uma única varredura do
+        índice (status, data_cadastro). As vagas sem data de cadastro válida
+        vêm em uma última faixa FAIXA_SEM_DATA, presente só se houver alguma.
+        """
+        casos = ", ".join(
+            f"SUM(dias BETWEEN {minimo} AND {maximo})" if maximo is not None else f"SUM(dias >= {minimo})"
+            for _, minimo, maximo in FAIXAS_AGING
+        )
+        sql = (f"SELECT {casos}, SUM(dias IS NULL) FROM (SELECT {_SQL_DIAS_ABERTA} AS dias FROM vagas "
+               "WHERE status = 'Aberta')")
+        with self.conexao() as conn:
+            *contagens, sem_data = conn.execute(sql, (self._referencia_aging(referencia),)).fetchone()
+        faixas = [(rotulo, qtd or 0) for (rotulo, _, _), qtd in zip(FAIXAS_AGING, contagens)]
+        if sem_data:
+            faixas.append((FAIXA_SEM_DATA, sem_data))
+        return faixas
+
+    def carregar_colunas_vagas(self, status: Optional[str] = None,
+                               filtro: Optional[FiltroVagas] = None) -> ColunasVagas:
+        """Carrega disciplina, status, carga horária e salário das vagas em
+        formato colunar (buffers `array`), sem criar objetos Vaga"""
+        where, params = self._where(FiltroVagas.combinar(filtro, status=status))
+        sql = ('SELECT disciplina, status, carga_horaria, salario, disciplina_norm FROM vagas'
+               + where + ' ORDER BY id')
+
+        colunas = ColunasVagas()
+        adicionar = colunas.adicionar
+        for disciplina, st, carga, salario, chave in self._iterar(sql, params):
+            adicionar(disciplina, st, carga, salario, chave)
+        return colunas
+
+    def listar_vagas_detalhadas(self, status: Optional[str] = None, filtro: Optional[FiltroVagas] = None
+                                ) -> List[Tuple[Vaga, Optional[str], Optional[str]]]:
+        """Lista vagas com os nomes da instituição e do professor.
+
+        Resolve as duas referências em uma única consulta com LEFT JOIN,
+        retornando tuplas (vaga, nome_instituicao, nome_professor); os nomes
+        são None quando a referência não existe. `status` e `filtro`
+        restringem as vagas, como em `consultar_vagas`.
+        """
+        return list(self.iterar_vagas_detalhadas(status, filtro))
+
+    def iterar_vagas_detalhadas(self, status: Optional[str] = None, filtro: Optional[FiltroVagas] = None
+                                ) -> Iterator[Tuple[Vaga, Optional[str], Optional[str]]]:
+        """Versão iterável de `listar_vagas_detalhadas`"""
+        sql = '''
+            SELECT v.id, v.instituicao_id, v.disciplina, v.carga_horaria, v.salario,
+                   v.descricao, v.status, v.professor_id, v.data_cadastro,
+                   i.nome, p.nome
+            FROM vagas v
+            LEFT JOIN instituicoes i ON i.id = v.instituicao_id
+            LEFT JOIN professores p ON p.id = v.professor_id
+        '''
+        where, params = self._where(FiltroVagas.combinar(filtro, status=status), prefixo="v.")
+        sql += where + ' ORDER BY v.id'
+
+        for row in self._iterar(sql, params):
+            yield (Vaga.from_row(row), row[9], row[10])
+
+    def buscar_vagas_texto(self, texto: str, limite: int = LIMITE_BUSCA,
+                           filtro: Optional[FiltroVagas] = None, apos: Optional[Vaga] = None) -> List[Vaga]:
+        """Busca textual (FTS5) em disciplina e descrição, por relevância,
+        opcionalmente restrita às vagas de `filtro`; `apos` é a última vaga
+        da página anterior (paginação keyset)"""
+        condicao, params = filtro.compilar("t.") if filtro is not None else ("", ())
+        return [Vaga.from_row(row) for row in self._buscar_texto(
+            "vagas", texto, limite, condicao, params, apos_id=apos.id if apos is not None else None)]
+
+    def contar_vagas_texto(self, texto: str, filtro: Optional[FiltroVagas] = None) -> int:
+        """Total de vagas encontradas por `buscar_vagas_texto`"""
+        condicao, params = filtro.compilar("t.") if filtro is not None else ("", ())
+        return self._contar_texto("vagas", texto, condicao, params)
+
     def buscar_vaga(self, vaga_id: int) -> Optional[Vaga]:
         """Busca uma vaga pelo ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM vagas WHERE id = ?', (vaga_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            vaga = Vaga(
-                id=row[0], instituicao_id=row[1], disciplina=row[2],
-                carga_horaria=row[3], salario=row[4], descricao=row[5],
-                status=row[6], professor_id=row[7]
-            )
-            vaga.data_cadastro = row[8]
-            return vaga
-        return None
-    
+        return self._buscar_por_id('vagas', vaga_id, Vaga.from_row)
+
     def atualizar_vaga(self, vaga: Vaga):
         """Atualiza os dados de uma vaga"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE vagas 
-            SET instituicao_id=?, disciplina=?, carga_horaria=?, salario=?, 
-                descricao=?, status=?, professor_id=?
-            WHERE id=?
-        ''', (vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria, vaga.salario,
-              vaga.descricao, vaga.status, vaga.professor_id, vaga.id))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.conexao() as conn:
+            conn.execute('''
+                UPDATE vagas
+                SET instituicao_id=?, disciplina=?, carga_horaria=?, salario=?,
+                    descricao=?, status=?, professor_id=?, disciplina_norm=?
+                WHERE id=?
+            ''', (vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria, vaga.salario,
+                  vaga.descricao, vaga.status, vaga.professor_id,
+                  normalizar_texto(vaga.disciplina), vaga.id))
+        self._invalidar('vagas', vaga.id)
+
     def deletar_vaga(self, vaga_id: int):
         """Deleta uma vaga"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM vagas WHERE id = ?', (vaga_id,))
-        
-        conn.commit()
-        conn.close()
+        with self.conexao() as conn:
+            conn.execute('DELETE FROM vagas WHERE id = ?', (vaga_id,))
+        self._invalidar('vagas', vaga_id)
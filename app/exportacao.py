@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em lote de todos os relatórios
+
+Lê cada tabela uma única vez, dentro de uma mesma transação de leitura (um
+retrato consistente do banco), e renderiza todos os relatórios em todos os
+formatos a partir dessas linhas, sem novas consultas. A renderização é
+Python puro (presa ao GIL), então é feita em sequência, já fora da
+transação. Os arquivos são gravados primeiro como temporários em `output/`
+e só são renomeados para o nome final quando todos foram gerados.
+"""
+
+import calendar
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from .database import FAIXA_SEM_DATA, FAIXAS_AGING, Database, FiltroVagas, faixa_aging
+from .analytics import ColunasVagas
+from .models import Professor, Instituicao, Vaga
+from .reports import ReportGenerator
+
+# Relatórios exportados: nome -> (formatos suportados, função que produz as linhas)
+RELATORIOS: "OrderedDict[str, Tuple[Tuple[str, ...], Callable[[ReportGenerator, str], Iterator[str]]]]" = OrderedDict([
+    ("professores", (("txt", "csv"), lambda rg, fmt: rg.iterar_relatorio_professores(fmt))),
+    ("instituicoes", (("txt", "csv"), lambda rg, fmt: rg.iterar_relatorio_instituicoes(fmt))),
+    ("vagas", (("txt", "csv"), lambda rg, fmt: rg.iterar_relatorio_vagas(fmt))),
+    ("completo", (("txt",), lambda rg, fmt: rg.iterar_relatorio_completo())),
+    ("demanda", (("txt", "csv"), lambda rg, fmt: rg.iterar_resumo_demanda_por_disciplina(fmt))),
+    ("aging", (("txt", "csv"), lambda rg, fmt: rg.iterar_aging_vagas_abertas(fmt))),
+    ("salarios", (("txt", "csv"), lambda rg, fmt: rg.iterar_salarios_por_disciplina(fmt))),
+    ("distribuicao_salarios", (("txt", "csv"), lambda rg, fmt: rg.iterar_distribuicao_salarios(fmt))),
+    ("sugestoes", (("txt", "csv"), lambda rg, fmt: rg.iterar_sugestoes_professores(fmt))),
+])
+
+# Leitura única de vagas: as colunas de `Vaga.from_row`, a chave normalizada
+# da disciplina e data_cadastro em segundos (NULL se ausente ou inválida),
+# de onde saem os dias em aberto para qualquer data de referência
+_SQL_VAGAS = ("SELECT id, instituicao_id, disciplina, carga_horaria, salario, descricao, status, "
+              "professor_id, data_cadastro, disciplina_norm, "
+              "CAST(strftime('%s', data_cadastro) AS INTEGER) FROM vagas ORDER BY id")
+
+
+def _ordem_sqlite(valor: Any) -> Tuple[bool, Any]:
+    """Chave de ordenação com a ordem do SQLite entre tipos (números antes de textos)"""
+    return (isinstance(valor, str), valor)
+
+
+class TabelasLidas:
+    """Professores, instituições e vagas lidos uma única vez cada, com a
+    parte da interface de leitura de `Database` usada pelo `ReportGenerator`.
+
+    Contagens, agrupamentos e aging saem das linhas carregadas e seguem as
+    regras das consultas do banco: agrupamento pela chave normalizada,
+    grafia e desempate pela primeira vaga do grupo, vagas sem data válida
+    fora do aging. Depois de carregado é somente leitura.
+    """
+
+    __slots__ = ("professores", "instituicoes", "vagas", "chaves_disciplina", "segundos_cadastro",
+                 "instrumentacao", "_nomes_professores", "_nomes_instituicoes")
+
+    def __init__(self, professores: List[Professor], instituicoes: List[Instituicao], vagas: List[Vaga],
+                 chaves_disciplina: List[Optional[str]], segundos_cadastro: List[Optional[int]],
+                 instrumentacao: Any = None):
+        self.professores = professores
+        self.instituicoes = instituicoes
+        self.vagas = vagas
+        # Paralelas a `vagas`: disciplina_norm e data_cadastro em segundos
+        self.chaves_disciplina = chaves_disciplina
+        self.segundos_cadastro = segundos_cadastro
+        # Relatórios continuam nas métricas do banco, se instrumentado
+        self.instrumentacao = instrumentacao
+        self._nomes_professores = {p.id: p.nome for p in professores}
+        self._nomes_instituicoes = {i.id: i.nome for i in instituicoes}
+
+    @classmethod
+    def carregar(cls, database: Database) -> "TabelasLidas":
+        """Lê as três tabelas (uma consulta por tabela) na mesma transação"""
+        vagas: List[Vaga] = []
+        chaves: List[Optional[str]] = []
+        segundos: List[Optional[int]] = []
+        with database.transacao_leitura() as conn:
+            professores = [Professor.from_row(row) for row in conn.execute('SELECT * FROM professores ORDER BY id')]
+            instituicoes = [Instituicao.from_row(row) for row in conn.execute('SELECT * FROM instituicoes ORDER BY id')]
+            for row in conn.execute(_SQL_VAGAS):
+                vagas.append(Vaga.from_row(row))
+                chaves.append(row[9])
+                segundos.append(row[10])
+        return cls(professores, instituicoes, vagas, chaves, segundos,
+                   getattr(database, "instrumentacao", None))
+
+    def _selecionar(self, filtro: Optional[FiltroVagas] = None, **criterios: Any) -> Iterator[int]:
+        """Posições (em ordem de id) das vagas aceitas pelo filtro"""
+        filtro = FiltroVagas.combinar(filtro, **criterios)
+        if not filtro:
+            return iter(range(len(self.vagas)))
+        return (i for i, vaga in enumerate(self.vagas) if filtro.aceita(vaga))
+
+    # Professores e instituições
+
+    def contar_professores(self) -> int:
+        return len(self.professores)
+
+    def iterar_professores(self) -> Iterator[Professor]:
+        return iter(self.professores)
+
+    def contar_instituicoes(self) -> int:
+        return len(self.instituicoes)
+
+    def iterar_instituicoes(self) -> Iterator[Instituicao]:
+        return iter(self.instituicoes)
+
+    # Vagas
+
+    def contar_vagas(self, status: Optional[str] = None, disciplina: Optional[str] = None,
+                     filtro: Optional[FiltroVagas] = None) -> int:
+        return sum(1 for _ in self._selecionar(filtro, status=status, disciplina=disciplina))
+
+    def iterar_vagas(self, status: Optional[str] = None, disciplina: Optional[str] = None,
+                     filtro: Optional[FiltroVagas] = None) -> Iterator[Vaga]:
+        return (self.vagas[i] for i in self._selecionar(filtro, status=status, disciplina=disciplina))
+
+    def iterar_vagas_detalhadas(self, status: Optional[str] = None, filtro: Optional[FiltroVagas] = None
+                                ) -> Iterator[Tuple[Vaga, Optional[str], Optional[str]]]:
+        for i in self._selecionar(filtro, status=status):
+            vaga = self.vagas[i]
+            yield (vaga, self._nomes_instituicoes.get(vaga.instituicao_id),
+                   self._nomes_professores.get(vaga.professor_id))
+
+    def professores_alocados(self) -> Set[int]:
+        # Como no SQL, status NULL não passa em "status != 'Cancelada'"
+        return {v.professor_id for v in self.vagas
+                if v.professor_id is not None and v.status is not None and v.status != 'Cancelada'}
+
+    # Agregações
+
+    def contar_vagas_por_status(self) -> Dict[Optional[str], int]:
+        contagem: Dict[Optional[str], int] = {}
+        for vaga in self.vagas:
+            status = vaga.status or None
+            contagem[status] = contagem.get(status, 0) + 1
+        return contagem
+
+    def _grupos_disciplina(self, posicoes: Iterator[int]) -> Dict[Optional[str], List[Any]]:
+        """chave -> [grafia, id da primeira vaga, posições], na ordem da primeira vaga"""
+        grupos: Dict[Optional[str], List[Any]] = {}
+        for i in posicoes:
+            grupo = grupos.get(self.chaves_disciplina[i])
+            if grupo is None:
+                vaga = self.vagas[i]
+                grupos[self.chaves_disciplina[i]] = [vaga.disciplina, vaga.id, [i]]
+            else:
+                grupo[2].append(i)
+        return grupos
+
+    def contar_vagas_por_disciplina(self, status: Optional[str] = None,
+                                    filtro: Optional[FiltroVagas] = None) -> List[Tuple[str, int]]:
+        grupos = self._grupos_disciplina(self._selecionar(filtro, status=status))
+        ordenado = sorted(grupos.values(), key=lambda g: (-len(g[2]), g[1]))
+        return [(disciplina, len(posicoes)) for disciplina, _, posicoes in ordenado]
+
+    def _grupos_salario(self) -> List[Tuple[str, int, List[float]]]:
+        """(grafia, id da primeira vaga, salários) das vagas com salário"""
+        com_salario = (i for i, vaga in enumerate(self.vagas) if vaga.salario is not None)
+        return [(disciplina, primeira, [self.vagas[i].salario for i in posicoes])
+                for disciplina, primeira, posicoes in self._grupos_disciplina(com_salario).values()]
+
+    def medias_salario_por_disciplina(self) -> List[Tuple[str, int, float]]:
+        grupos = [(sum(s) / len(s), primeira, disciplina, len(s)) for disciplina, primeira, s in self._grupos_salario()]
+        grupos.sort(key=lambda g: (-g[0], g[1]))
+        return [(disciplina, qtd, media) for media, _, disciplina, qtd in grupos]
+
+    def estatisticas_salario_por_disciplina(self) -> List[Tuple[str, int, float, float, float]]:
+        grupos = [(disciplina, len(s), min(s), sum(s) / len(s), max(s), primeira)
+                  for disciplina, primeira, s in self._grupos_salario()]
+        grupos.sort(key=lambda g: (-g[4], g[5]))
+        return [g[:5] for g in grupos]
+
+    def _abertas_com_dias(self, referencia: Optional[datetime]) -> Iterator[Tuple[int, Optional[int]]]:
+        """(posição, dias em aberto) das vagas Abertas; dias None sem data válida.
+
+        Mesma conta de `_SQL_DIAS_ABERTA`: a referência é formatada como no
+        banco e os dois instantes são lidos como UTC pelo strftime('%s').
+        """
+        texto = Database._referencia_aging(referencia)
+        agora = calendar.timegm(datetime.strptime(texto, "%Y-%m-%d %H:%M:%S").timetuple())
+        for i in self._selecionar(status="Aberta"):
+            cadastro = self.segundos_cadastro[i]
+            yield i, (None if cadastro is None else max(0, (agora - cadastro) // 86400))
+
+    def aging_vagas_abertas(self, limite: Optional[int] = None, referencia: Optional[datetime] = None
+                            ) -> List[Tuple[int, str, int, int]]:
+        datadas = [(i, dias) for i, dias in self._abertas_com_dias(referencia) if dias is not None]
+        datadas.sort(key=lambda x: (_ordem_sqlite(self.vagas[x[0]].data_cadastro), self.vagas[x[0]].id))
+        if limite is not None:
+            datadas = datadas[:max(limite, 0)]
+        return [(self.vagas[i].id, self.vagas[i].disciplina, self.vagas[i].instituicao_id, dias)
+                for i, dias in datadas]
+
+    def aging_por_faixa(self, referencia: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        contagem = {rotulo: 0 for rotulo, _, _ in FAIXAS_AGING}
+        sem_data = 0
+        for _, dias in self._abertas_com_dias(referencia):
+            if dias is None:
+                sem_data += 1
+            else:
+                contagem[faixa_aging(dias)] += 1
+        faixas = list(contagem.items())
+        if sem_data:
+            faixas.append((FAIXA_SEM_DATA, sem_data))
+        return faixas
+
+    def carregar_colunas_vagas(self, status: Optional[str] = None,
+                               filtro: Optional[FiltroVagas] = None) -> ColunasVagas:
+        colunas = ColunasVagas()
+        adicionar = colunas.adicionar
+        for i in self._selecionar(filtro, status=status):
+            vaga = self.vagas[i]
+            adicionar(vaga.disciplina, vaga.status, vaga.carga_horaria, vaga.salario, self.chaves_disciplina[i])
+        return colunas
+
+
+def _renderizar(gerador: ReportGenerator, produzir: Callable[[ReportGenerator, str], Iterator[str]],
+                formato: str, caminho_temp: str) -> Tuple[int, float]:
+    """Grava um relatório no arquivo temporário; retorna (linhas, segundos)"""
+    inicio = time.perf_counter()
+    with open(caminho_temp, 'w', encoding='utf-8') as f:
+        linhas = gerador.escrever_relatorio(produzir(gerador, formato), f)
+    return linhas, time.perf_counter() - inicio
+
+
+def exportar_relatorios(database: Database, formatos: Sequence[str] = ("txt", "csv"),
+                        diretorio: Optional[str] = None) -> List[Tuple[str, int, float]]:
+    """Exporta todos os relatórios de RELATORIOS nos formatos pedidos.
+
+    Retorna (nome_arquivo, linhas, segundos) de cada relatório. Se algum
+    relatório falhar, nenhum arquivo final é gravado e o erro é propagado.
+    A transação de leitura dura só a
+    leitura das tabelas: escritas de outras conexões esperam no máximo
+    esse trecho (no journal padrão) e nunca são vistas pela exportação.
+    """
+    out_dir = diretorio or os.path.join(os.getcwd(), 'output')
+    os.makedirs(out_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    tabelas = TabelasLidas.carregar(database)
+    tempos: List[Tuple[str, int, float]] = []
+    gerador = ReportGenerator(tabelas)
+
+    # (nome final, temporário)
+    gerados: List[Tuple[str, str]] = []
+    try:
+        for nome, (suportados, produzir) in RELATORIOS.items():
+            for formato in formatos:
+                if formato not in suportados:
+                    continue
+                nome_arquivo = f"relatorio_{nome}_{timestamp}.{formato}"
+                fd, caminho_temp = tempfile.mkstemp(prefix=f".{nome_arquivo}.", suffix=".tmp", dir=out_dir)
+                os.close(fd)
+                gerados.append((nome_arquivo, caminho_temp))
+                linhas, segundos = _renderizar(gerador, produzir, formato, caminho_temp)
+                tempos.append((nome_arquivo, linhas, segundos))
+    except BaseException:
+        for _, caminho_temp in gerados:
+            try:
+                os.remove(caminho_temp)
+            except FileNotFoundError:
+                pass
+        raise
+
+    for nome_arquivo, caminho_temp in gerados:
+        os.replace(caminho_temp, os.path.join(out_dir, nome_arquivo))
+    return tempos
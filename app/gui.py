@@ -5,19 +5,120 @@ Interface Gráfica com Raylib para o Sistema de Professores Substitutos
 """
 
 import os
+import time
 import pyray as rl
-from typing import List, Optional
-from .database import Database
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from .cache import AUSENTE, CacheLRU
+from .database import Database, FiltroVagas, Paginador
+from .exportacao import exportar_relatorios
+from .medidor_frames import FASES, MedidorFrames
 from .models import Professor, Instituicao, Vaga
+from .ritmo_frames import DORMINDO, RitmoFrames
 from .reports import ReportGenerator
 
+# Layout das telas de lista: o card de índice i fica em
+# y = LISTA_Y0 + i * passo - scroll_offset e só é desenhado entre
+# LISTA_TOPO e (altura da janela - LISTA_MARGEM_INFERIOR)
+LISTA_Y0 = 100
+LISTA_TOPO = 80
+LISTA_MARGEM_INFERIOR = 100
+PASSO_CARD_PROFESSOR = 110
+PASSO_CARD_INSTITUICAO = 110
+PASSO_CARD_VAGA = 130
+
+# Opções do filtro de status da lista de vagas (None = todas)
+FILTROS_STATUS_VAGA = (None, "Aberta", "Preenchida", "Cancelada")
+
+# Cards das listas: x da borda esquerda, altura e a posição (x, y relativos
+# ao card, tamanho da fonte) de cada linha de texto, na ordem de
+# _textos_professor/_instituicao/_vaga
+CARD_X = 20
+ALTURA_CARD_PROFESSOR = 100
+ALTURA_CARD_INSTITUICAO = 100
+ALTURA_CARD_VAGA = 120
+LINHAS_CARD_PROFESSOR = ((10, 10, 20), (10, 35, 18), (10, 58, 18), (380, 35, 18))
+LINHAS_CARD_INSTITUICAO = ((10, 10, 20), (10, 35, 18), (10, 58, 18), (10, 78, 18))
+LINHAS_CARD_VAGA = ((10, 10, 20), (10, 35, 18), (180, 35, 18), (380, 35, 18), (10, 58, 16))
+
+# Cards mantidos em RenderTexture (os visíveis mais os últimos vistos) e a
+# folga ao redor do card na textura, para as bordas antialiased
+CARDS_EM_TEXTURA = 24
+MARGEM_TEXTURA_CARD = 2
+
+# Larguras de texto medidas guardadas por (texto, tamanho)
+TAMANHO_CACHE_TEXTO = 512
+
+# Teclas de depuração: overlay de tempo de frame e gravação do trace
+TECLA_OVERLAY_FRAMES = rl.KeyboardKey.KEY_F3
+TECLA_TRACE_FRAMES = rl.KeyboardKey.KEY_F4
+
+def _textos_professor(prof: Professor) -> Tuple[str, ...]:
+    """Linhas do card de professor (formatadas uma vez ao carregar a página)"""
+    return (f"Nome: {prof.nome}", f"CPF: {prof.cpf}", f"Email: {prof.email}",
+            f"Especialidade: {prof.especialidade}")
+
+
+def _textos_instituicao(inst: Instituicao) -> Tuple[str, ...]:
+    """Linhas do card de instituição"""
+    return (f"Nome: {inst.nome}", f"CNPJ: {inst.cnpj}", f"Endereco: {inst.endereco}",
+            f"Cidade/UF: {inst.cidade}/{inst.estado}")
+
+
+def _textos_vaga(vaga: Vaga) -> Tuple[str, ...]:
+    """Linhas do card de vaga"""
+    return (f"Disciplina: {vaga.disciplina}", f"Carga: {vaga.carga_horaria}h",
+            f"Salario: R$ {vaga.salario:.2f}", f"Status: {vaga.status}",
+            f"Desc: {vaga.descricao[:50]}...")
+
+
 class GUI:
     """Classe principal da interface gráfica"""
     
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, workers_relatorio: int = 2,
+                 trace_frames: Optional[str] = None, cache_texturas: bool = True,
+                 ritmo: Union[str, Dict[str, Any], None] = None):
         self.db = database
         self.report_gen = ReportGenerator(database)
         
+        # Tempo de frame por fase/tela (overlay com F3, trace com F4 ou
+        # `trace_frames` = caminho do arquivo gravado desde o início)
+        self.medidor = MedidorFrames()
+        self.overlay_frames = False
+        if trace_frames:
+            self.medidor.iniciar_trace(trace_frames)
+        # Chamadas de texto no frame atual e instante do fim do desenho
+        # (antes de end_drawing, que espera o limite de FPS)
+        self.chamadas_texto = 0
+        self.chamadas_medida = 0
+        self._contagem_frame = (0, 0)
+        self._fim_desenho = 0.0
+        # Larguras medidas (botões, mensagens e cursor repetem os mesmos textos
+        # a cada frame); limpo ao trocar a fonte
+        self.cache_texto = CacheLRU(TAMANHO_CACHE_TEXTO)
+        
+        # Render-to-texture: menus estáticos viram uma camada (só o botão sob
+        # o mouse é redesenhado por cima) e cada card visível é desenhado uma
+        # vez em sua textura, refeita quando os textos mudam
+        self.cache_texturas = cache_texturas
+        self._camadas: dict[str, rl.RenderTexture] = {}
+        self._camada: Optional[str] = None  # None | "gravando" | "sobreposta"
+        self._cards: "OrderedDict[Tuple[str, int], Tuple[rl.RenderTexture, Tuple[str, ...]]]" = OrderedDict()
+        
+        # Ritmo do loop (ver POLITICAS_FRAMES): FPS cheio ao interagir, FPS
+        # baixo ou sono à espera de eventos quando a janela está parada
+        self.ritmo = RitmoFrames(ritmo)
+        self._fps_aplicado = 0
+        self._esperando_eventos = False
+        
+        # Relatórios rodam fora do loop de frames; cada worker usa sua
+        # própria conexão de leitura do pool do Database
+        self.executor_relatorios = ThreadPoolExecutor(
+            max_workers=workers_relatorio, thread_name_prefix="relatorio"
+        )
+        self.relatorios_pendentes: List[Tuple[str, Future]] = []
+        
         # Configurações da janela
         self.width = 1000
         self.height = 700
@@ -35,11 +136,16 @@ class GUI:
         # Campos de formulário
         self.campos: dict[str, str] = {}
         self.campo_ativo: Optional[str] = None
+        # Tela do último frame desenhado (trocar de tela solta o campo ativo)
+        self._tela_desenhada = self.tela_atual
+        # Último texto de busca aplicado em cada campo de busca das listas
+        self.busca_aplicada: dict[str, str] = {}
         
-        # Listas para exibição
-        self.professores_lista: List[Professor] = []
-        self.instituicoes_lista: List[Instituicao] = []
-        self.vagas_lista: List[Vaga] = []
+        # Listas para exibição (paginadas sob demanda conforme o scroll)
+        self.professores_lista: Optional[Paginador] = None
+        self.instituicoes_lista: Optional[Paginador] = None
+        self.vagas_lista: Optional[Paginador] = None
+        self.filtro_vagas = FiltroVagas()
         self.scroll_offset = 0
         
         # Paleta de cores fornecida
@@ -60,11 +166,15 @@ class GUI:
         self.cor_texto = rl.WHITE               # texto geral
         self.cor_botao = self.cor_verde         # botão principal
         self.cor_botao_hover = rl.color_alpha(self.cor_verde, 0.85)
+        # Cores dos cards das listas (calculadas uma vez, não por card)
+        self.cor_card_fundo = rl.color_alpha(self.cor_secundaria, 0.06)
+        self.cor_card_borda = rl.color_alpha(self.cor_texto, 0.15)
     
     def inicializar(self):
         """Inicializa a janela do Raylib"""
         rl.init_window(self.width, self.height, "Sistema de Professores Substitutos")
-        rl.set_target_fps(60)
+        self._fps_aplicado = self.ritmo.politica["fps_ativo"]
+        rl.set_target_fps(self._fps_aplicado)
         # Carregar fonte Helvetica se disponível
         # Busca por Helvetica.ttf em múltiplos locais comuns
         font_candidates = [
@@ -80,16 +190,63 @@ class GUI:
                     break
             except Exception:
                 self.font = None
+        self.cache_texto.limpar()
+        self.liberar_texturas()
     
     def executar(self):
         """Loop principal da aplicação"""
         while not rl.window_should_close():
+            inicio = time.perf_counter()
             self.processar_input()
+            fim_entrada = time.perf_counter()
             self.atualizar()
+            fim_atualizar = time.perf_counter()
             self.desenhar()
+            fim_frame = time.perf_counter()
+            
+            textos, medidas = self._contagem_frame
+            self.medidor.registrar(self.tela_atual,
+                                   (inicio, fim_entrada, fim_atualizar, self._fim_desenho, fim_frame),
+                                   textos, medidas)
+            self.chamadas_texto = self.chamadas_medida = 0
+            self.ajustar_ritmo()
         
+        self.medidor.parar_trace()
+        # Conclui relatórios em andamento antes de sair
+        self.executor_relatorios.shutdown(wait=True, cancel_futures=True)
+        self.liberar_texturas()
         rl.close_window()
     
+    def ajustar_ritmo(self):
+        """Aplica o FPS alvo do ritmo e liga/desliga a espera por eventos
+        (o raylib passa a dormir em end_drawing até chegar entrada)"""
+        estado = self.ritmo.decidir(
+            time.perf_counter(),
+            entrada=self._houve_entrada(),
+            animando=bool(self.relatorios_pendentes) or self.overlay_frames or self.medidor.gravando,
+            temporizador=bool(self.mensagem) or bool(self.campo_ativo),
+        )
+        if self.ritmo.fps_alvo != self._fps_aplicado:
+            self._fps_aplicado = self.ritmo.fps_alvo
+            rl.set_target_fps(self._fps_aplicado)
+        esperar = estado == DORMINDO
+        if esperar != self._esperando_eventos:
+            self._esperando_eventos = esperar
+            if esperar:
+                rl.enable_event_waiting()
+            else:
+                rl.disable_event_waiting()
+    
+    def _houve_entrada(self) -> bool:
+        """Teclado, roda, botão ou movimento do mouse neste frame"""
+        if rl.get_key_pressed() or rl.get_mouse_wheel_move():
+            return True
+        delta = rl.get_mouse_delta()
+        if delta.x or delta.y:
+            return True
+        return (rl.is_mouse_button_down(rl.MouseButton.MOUSE_BUTTON_LEFT)
+                or rl.is_mouse_button_down(rl.MouseButton.MOUSE_BUTTON_RIGHT))
+    
     def processar_input(self):
         """Processa input do teclado e mouse"""
         # Processar digitação nos campos de texto
@@ -104,12 +261,49 @@ class GUI:
             if rl.is_key_pressed(rl.KeyboardKey.KEY_BACKSPACE) and len(self.campos.get(self.campo_ativo, "")) > 0:
                 self.campos[self.campo_ativo] = self.campos[self.campo_ativo][:-1]
         
+        # Depuração: overlay de frames e gravação do trace
+        if rl.is_key_pressed(TECLA_OVERLAY_FRAMES):
+            self.overlay_frames = not self.overlay_frames
+        if rl.is_key_pressed(TECLA_TRACE_FRAMES):
+            self.alternar_trace_frames()
+        
         # Scroll com mouse wheel
         wheel = rl.get_mouse_wheel_move()
         if wheel != 0:
             self.scroll_offset -= int(wheel * 30)
             if self.scroll_offset < 0:
                 self.scroll_offset = 0
+            self.scroll_offset = min(self.scroll_offset, self._scroll_maximo())
+    
+    def _lista_atual(self) -> tuple[Optional[Paginador], int]:
+        """Lista e passo (altura + espaçamento do card) da tela de lista atual"""
+        if self.tela_atual == "lista_professores":
+            return self.professores_lista, PASSO_CARD_PROFESSOR
+        if self.tela_atual == "lista_instituicoes":
+            return self.instituicoes_lista, PASSO_CARD_INSTITUICAO
+        if self.tela_atual == "lista_vagas":
+            return self.vagas_lista, PASSO_CARD_VAGA
+        return None, 0
+    
+    def _scroll_maximo(self) -> int:
+        """Maior scroll útil: o último card encostado na base da área visível"""
+        lista, passo = self._lista_atual()
+        if lista is None:
+            return self.scroll_offset
+        area = self.height - LISTA_MARGEM_INFERIOR - LISTA_Y0
+        return max(0, len(lista) * passo - area)
+    
+    def _faixa_visivel(self, passo: int) -> tuple[int, int]:
+        """Índices [primeiro, ultimo) dos cards visíveis no scroll atual.
+
+        Calculado direto do scroll_offset, sem percorrer a lista: o custo por
+        frame não depende da quantidade de itens.
+        """
+        topo = self.scroll_offset + LISTA_TOPO - LISTA_Y0
+        base = self.scroll_offset + self.height - LISTA_MARGEM_INFERIOR - LISTA_Y0
+        primeiro = topo // passo + 1
+        ultimo = -(-base // passo)
+        return max(0, primeiro), max(0, ultimo)
     
     def atualizar(self):
         """Atualiza o estado da aplicação"""
@@ -118,6 +312,24 @@ class GUI:
             self.mensagem_tempo -= rl.get_frame_time()
             if self.mensagem_tempo <= 0:
                 self.mensagem = ""
+        
+        self.verificar_relatorios()
+    
+    def verificar_relatorios(self):
+        """Consulta (sem bloquear) os relatórios em segundo plano concluídos"""
+        if not self.relatorios_pendentes:
+            return
+        pendentes: List[Tuple[str, Future]] = []
+        for nome_arquivo, futuro in self.relatorios_pendentes:
+            if not futuro.done():
+                pendentes.append((nome_arquivo, futuro))
+                continue
+            erro = futuro.exception()
+            if erro is None:
+                self.mostrar_mensagem(f"Relatorio salvo: {nome_arquivo}")
+            else:
+                self.mostrar_mensagem(f"Erro ao gerar relatorio: {str(erro)}")
+        self.relatorios_pendentes = pendentes
     
     def desenhar(self):
         """Desenha a interface"""
@@ -126,7 +338,7 @@ class GUI:
         
         # Desenhar tela atual
         if self.tela_atual == "menu_principal":
-            self.desenhar_menu_principal()
+            self._desenhar_em_camada("menu_principal", self.desenhar_menu_principal)
         elif self.tela_atual == "cadastro_professor":
             self.desenhar_cadastro_professor()
         elif self.tela_atual == "lista_professores":
@@ -140,16 +352,34 @@ class GUI:
         elif self.tela_atual == "lista_vagas":
             self.desenhar_lista_vagas()
         elif self.tela_atual == "relatorios":
-            self.desenhar_menu_relatorios()
+            self._desenhar_em_camada("relatorios", self.desenhar_menu_relatorios)
+        
+        # O campo ativo pertence à tela em que foi clicado: ao trocar de tela
+        # ele é solto, senão a digitação iria para um campo invisível e o
+        # cursor piscando manteria o ritmo fora do sono
+        if self.tela_atual != self._tela_desenhada:
+            self._tela_desenhada = self.tela_atual
+            self.campo_ativo = None
         
         # Desenhar mensagem (se houver)
         if self.mensagem:
             self.desenhar_mensagem()
         
+        if self.relatorios_pendentes:
+            self.desenhar_progresso_relatorios()
+        
+        # Contagem de textos do frame sem o próprio overlay
+        self._contagem_frame = (self.chamadas_texto, self.chamadas_medida)
+        if self.overlay_frames:
+            self.desenhar_overlay_frames()
+        
+        self._fim_desenho = time.perf_counter()
         rl.end_drawing()
     
     def desenhar_titulo(self, texto: str):
         """Desenha o título da página (minimalista, sem barra sólida)"""
+        if self._camada == "sobreposta":
+            return
         # Título escuro
         self.draw_text_ui(texto, 20, 22, 30, self.cor_primaria)
         # Linha sutil abaixo do título
@@ -157,28 +387,141 @@ class GUI:
     
     def desenhar_botao(self, texto: str, x: int, y: int, largura: int, altura: int) -> bool:
         """Desenha um botão e retorna True se foi clicado"""
-        mouse_pos = rl.get_mouse_position()
         rect = rl.Rectangle(x, y, largura, altura)
+        if self._camada == "gravando":
+            # Estado de repouso, gravado na camada do menu
+            self._pintar_botao(texto, rect, self.cor_botao)
+            return False
         
+        mouse_pos = rl.get_mouse_position()
         hover = rl.check_collision_point_rec(mouse_pos, rect)
-        fill = self.cor_botao_hover if hover else self.cor_botao
+        if self._camada != "sobreposta":
+            self._pintar_botao(texto, rect, self.cor_botao_hover if hover else self.cor_botao)
+        elif hover:
+            # Sobre a camada só o botão sob o mouse muda: apaga a versão de
+            # repouso (fundo liso) e desenha a de hover
+            rl.draw_rectangle(x - 1, y - 1, largura + 2, altura + 2, self.cor_fundo)
+            self._pintar_botao(texto, rect, self.cor_botao_hover)
         
-        # Botão arredondado com borda sutil
+        return hover and rl.is_mouse_button_pressed(rl.MouseButton.MOUSE_BUTTON_LEFT)
+    
+    def _pintar_botao(self, texto: str, rect: rl.Rectangle, fill: rl.Color):
+        """Botão arredondado com borda sutil e texto centralizado"""
         rl.draw_rectangle_rounded(rect, 0.2, 8, fill)
         rl.draw_rectangle_rounded_lines(rect, 0.2, 8, rl.color_alpha(self.cor_texto, 0.18))
         
         texto_largura = self.measure_text_ui(texto, 20)
-        self.draw_text_ui(texto, x + (largura - texto_largura) // 2, y + (altura - 20) // 2, 20, rl.WHITE)
+        self.draw_text_ui(texto, int(rect.x) + (int(rect.width) - texto_largura) // 2,
+                          int(rect.y) + (int(rect.height) - 20) // 2, 20, rl.WHITE)
+    
+    # ===== CACHE DE TEXTURAS =====
+    
+    def _desenhar_em_camada(self, chave: str, desenhar: Callable[[], None]):
+        """Desenha uma tela estática a partir da sua camada em textura.
         
-        return hover and rl.is_mouse_button_pressed(rl.MouseButton.MOUSE_BUTTON_LEFT)
+        Na primeira vez a tela é desenhada (botões em repouso) em uma
+        RenderTexture; nos frames seguintes a textura é copiada e `desenhar`
+        roda só pela lógica dos botões, redesenhando apenas o que está sob
+        o mouse.
+        """
+        if not self.cache_texturas:
+            desenhar()
+            return
+        camada = self._camadas.get(chave)
+        if camada is None:
+            camada = rl.load_render_texture(self.width, self.height)
+            rl.begin_texture_mode(camada)
+            rl.clear_background(self.cor_fundo)
+            self._camada = "gravando"
+            try:
+                desenhar()
+            finally:
+                self._camada = None
+                rl.end_texture_mode()
+            self._camadas[chave] = camada
+        
+        self._copiar_textura(camada, 0, 0, self.width, self.height)
+        self._camada = "sobreposta"
+        try:
+            desenhar()
+        finally:
+            self._camada = None
+    
+    def _copiar_textura(self, textura: rl.RenderTexture, x: int, y: int, largura: int, altura: int):
+        """Copia uma RenderTexture para a tela (altura negativa: o OpenGL
+        guarda a textura de cabeça para baixo)"""
+        rl.draw_texture_rec(textura.texture, rl.Rectangle(0, 0, largura, -altura), rl.Vector2(x, y), rl.WHITE)
+    
+    def _desenhar_lista_cards(self, lista: Paginador, passo: int, altura: int,
+                              linhas: Tuple[Tuple[int, int, int], ...]):
+        """Cards visíveis de uma lista (cada item de `lista` são os textos do card)"""
+        # Somente os cards visíveis (e as páginas que os contêm) são tocados
+        primeiro, ultimo = self._faixa_visivel(passo)
+        for indice, textos in lista.janela(primeiro, ultimo):
+            y = LISTA_Y0 + indice * passo - self.scroll_offset
+            if self.cache_texturas:
+                self._desenhar_card_em_textura((self.tela_atual, indice), y, altura, linhas, textos)
+            else:
+                self._desenhar_card(CARD_X, y, altura, linhas, textos)
+    
+    def _desenhar_card_em_textura(self, chave: Tuple[str, int], y: int, altura: int,
+                                  linhas: Tuple[Tuple[int, int, int], ...], textos: Tuple[str, ...]):
+        """Copia o card da sua textura, desenhando-o antes se os textos
+        mudaram (lista recarregada) ou se ainda não há textura"""
+        margem = MARGEM_TEXTURA_CARD
+        largura_textura = self.width - 2 * CARD_X + 2 * margem
+        altura_textura = altura + 2 * margem
+        
+        entrada = self._cards.get(chave)
+        if entrada is not None and entrada[1] is textos:
+            self._cards.move_to_end(chave)
+            textura = entrada[0]
+        else:
+            if entrada is not None:
+                textura = entrada[0]
+            elif len(self._cards) >= CARDS_EM_TEXTURA:
+                # Reaproveita a textura do card visto há mais tempo
+                textura = self._cards.popitem(last=False)[1][0]
+            else:
+                textura = None
+            if textura is not None and textura.texture.height != altura_textura:
+                rl.unload_render_texture(textura)
+                textura = None
+            if textura is None:
+                textura = rl.load_render_texture(largura_textura, altura_textura)
+            
+            rl.begin_texture_mode(textura)
+            rl.clear_background(self.cor_fundo)
+            self._desenhar_card(margem, margem, altura, linhas, textos)
+            rl.end_texture_mode()
+            self._cards[chave] = (textura, textos)
+            self._cards.move_to_end(chave)
+        
+        self._copiar_textura(textura, CARD_X - margem, y - margem, largura_textura, altura_textura)
+    
+    def liberar_texturas(self):
+        """Descarta as camadas e texturas de cards (serão refeitas sob demanda)"""
+        for camada in self._camadas.values():
+            rl.unload_render_texture(camada)
+        for textura, _ in self._cards.values():
+            rl.unload_render_texture(textura)
+        self._camadas.clear()
+        self._cards.clear()
     
     def desenhar_campo_texto(self, label: str, campo_id: str, x: int, y: int, largura: int) -> str:
         """Desenha um campo de texto e retorna o valor"""
         # Label
         self.draw_text_ui(label, x, y, 20, self.cor_texto)
         
-        # Campo
-        campo_y = y + 25
+        return self._desenhar_caixa_texto(campo_id, x, y + 25, largura)
+    
+    def desenhar_campo_busca(self, campo_id: str, x: int, y: int, largura: int) -> str:
+        """Campo de busca compacto (sem label) para o cabeçalho das listas"""
+        return self._desenhar_caixa_texto(campo_id, x, y, largura, placeholder="Buscar...")
+    
+    def _desenhar_caixa_texto(self, campo_id: str, x: int, campo_y: int, largura: int,
+                              placeholder: str = "") -> str:
+        """Caixa editável de um campo de texto; retorna o valor"""
         rect = rl.Rectangle(x, campo_y, largura, 35)
         
         # Verificar clique no campo
@@ -198,7 +541,10 @@ class GUI:
             self.campos[campo_id] = ""
         
         texto = self.campos[campo_id]
-        self.draw_text_ui(texto, x + 10, campo_y + 8, 20, self.cor_texto)
+        if texto or not placeholder:
+            self.draw_text_ui(texto, x + 10, campo_y + 8, 20, self.cor_texto)
+        else:
+            self.draw_text_ui(placeholder, x + 10, campo_y + 8, 20, rl.color_alpha(self.cor_texto, 0.4))
         
         # Cursor piscante
         if self.campo_ativo == campo_id and int(rl.get_time() * 2) % 2 == 0:
@@ -221,23 +567,89 @@ class GUI:
         rl.draw_rectangle_rounded(rect, 0.5, 12, bg)
         self.draw_text_ui(self.mensagem, x + pad_x, y + (pill_h - 20) // 2, 20, rl.WHITE)
 
+    def desenhar_progresso_relatorios(self):
+        """Spinner com a quantidade de relatórios em geração"""
+        centro = rl.Vector2(self.width - 30, self.height - 29)
+        inicio = (rl.get_time() * 360) % 360
+        rl.draw_ring(centro, 8, 12, inicio, inicio + 270, 16, self.cor_secundaria)
+        texto = f"Gerando {len(self.relatorios_pendentes)} relatorio(s)..."
+        largura = self.measure_text_ui(texto, 18)
+        self.draw_text_ui(texto, self.width - 50 - largura, self.height - 38, 18, self.cor_texto)
+
+    def desenhar_overlay_frames(self):
+        """Overlay de depuração: FPS, percentis do tempo de frame, média por
+        fase, chamadas de texto e custo de desenho por tela"""
+        percentis = self.medidor.percentis()
+        if not percentis:
+            return
+        medias = self.medidor.medias_fases()
+        textos, medidas = self._contagem_frame
+        linhas = [
+            f"FPS {rl.get_fps()} ({self.ritmo.estado})  |  frame p50 {percentis['p50'] * 1000:.2f} ms",
+            f"p95 {percentis['p95'] * 1000:.2f}  p99 {percentis['p99'] * 1000:.2f}  "
+            f"max {percentis['max'] * 1000:.2f} ms",
+            "  ".join(f"{fase} {medias[fase] * 1000:.2f}" for fase in FASES),
+            f"draw_text {textos}  |  measure_text {medidas} "
+            f"(cache {self.cache_texto.acertos}/{self.cache_texto.acertos + self.cache_texto.falhas})",
+            "desenho por tela (media / max ms):",
+        ]
+        for tela, frames, media, maximo in self.medidor.custo_telas()[:5]:
+            linhas.append(f"  {tela}: {media * 1000:.2f} / {maximo * 1000:.2f} ({frames})")
+        if self.medidor.gravando:
+            linhas.append(f"trace: {os.path.basename(self.medidor.caminho_trace or '')} (F4 para)")
+        
+        largura, altura_linha = 380, 18
+        x = self.width - largura - 10
+        y = 70
+        rl.draw_rectangle(x, y, largura, altura_linha * len(linhas) + 12, rl.color_alpha(rl.BLACK, 0.8))
+        for i, linha in enumerate(linhas):
+            self.draw_text_ui(linha, x + 8, y + 6 + i * altura_linha, 14, self.cor_verde_claro)
+    
+    def alternar_trace_frames(self):
+        """Inicia/para a gravação do trace de frames em output/"""
+        if self.medidor.gravando:
+            self.medidor.parar_trace()
+            self.mostrar_mensagem(f"Trace salvo: {os.path.basename(self.medidor.caminho_trace or '')}")
+            return
+        from datetime import datetime
+        nome_arquivo = f"trace_frames_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.medidor.iniciar_trace(os.path.join(os.getcwd(), 'output', nome_arquivo))
+        self.mostrar_mensagem(f"Gravando trace: {nome_arquivo}")
+
     # ===== Helpers de texto com fonte personalizada =====
     def _to_bytes(self, s: str) -> bytes:
         # Mantido para compatibilidade futura; não é usado com draw_text_ex nas stubs atuais
         return s.encode('utf-8', errors='ignore')
 
     def draw_text_ui(self, texto: str, x: int, y: int, tamanho: int, cor: rl.Color):
+        self.chamadas_texto += 1
         if self.font:
             rl.draw_text_ex(self.font, texto, rl.Vector2(x, y), float(tamanho), float(self.font_spacing), cor)
         else:
             rl.draw_text(texto, x, y, tamanho, cor)
 
     def measure_text_ui(self, texto: str, tamanho: int) -> int:
-        if self.font:
-            size = rl.measure_text_ex(self.font, texto, float(tamanho), float(self.font_spacing))
-            return int(size.x)
-        else:
-            return rl.measure_text(texto, tamanho)
+        self.chamadas_medida += 1
+        chave = (texto, tamanho)
+        largura = self.cache_texto.obter(chave)
+        if largura is AUSENTE:
+            geracao = self.cache_texto.geracao()
+            if self.font:
+                size = rl.measure_text_ex(self.font, texto, float(tamanho), float(self.font_spacing))
+                largura = int(size.x)
+            else:
+                largura = rl.measure_text(texto, tamanho)
+            self.cache_texto.colocar(chave, largura, geracao)
+        return largura
+    
+    def _desenhar_card(self, x: int, y: int, altura: int, linhas: Tuple[Tuple[int, int, int], ...],
+                       textos: Tuple[str, ...]):
+        """Card de lista com os textos já formatados"""
+        card = rl.Rectangle(x, y, self.width - 2 * CARD_X, altura)
+        rl.draw_rectangle_rounded(card, 0.06, 8, self.cor_card_fundo)
+        rl.draw_rectangle_rounded_lines(card, 0.06, 8, self.cor_card_borda)
+        for (dx, dy, tamanho), texto in zip(linhas, textos):
+            self.draw_text_ui(texto, x + dx, y + dy, tamanho, self.cor_texto)
     
     def mostrar_mensagem(self, texto: str, tempo: float = 3.0):
         """Mostra uma mensagem temporária"""
@@ -258,27 +670,28 @@ class GUI:
             self.limpar_campos()
         
         if self.desenhar_botao("Listar Professores", 350, y_inicial + espacamento, 300, 50):
-            self.professores_lista = self.db.listar_professores()
-            self.scroll_offset = 0
             self.tela_atual = "lista_professores"
+            self.limpar_campos()
+            self._recarregar_professores()
         
         if self.desenhar_botao("Cadastrar Instituicao", 350, y_inicial + espacamento * 2, 300, 50):
             self.tela_atual = "cadastro_instituicao"
             self.limpar_campos()
         
         if self.desenhar_botao("Listar Instituicoes", 350, y_inicial + espacamento * 3, 300, 50):
-            self.instituicoes_lista = self.db.listar_instituicoes()
-            self.scroll_offset = 0
             self.tela_atual = "lista_instituicoes"
+            self.limpar_campos()
+            self._recarregar_instituicoes()
         
         if self.desenhar_botao("Cadastrar Vaga", 350, y_inicial + espacamento * 4, 300, 50):
             self.tela_atual = "cadastro_vaga"
             self.limpar_campos()
         
         if self.desenhar_botao("Listar Vagas", 350, y_inicial + espacamento * 5, 300, 50):
-            self.vagas_lista = self.db.listar_vagas()
-            self.scroll_offset = 0
             self.tela_atual = "lista_vagas"
+            self.limpar_campos()
+            self.filtro_vagas = FiltroVagas()
+            self._recarregar_vagas()
         
         if self.desenhar_botao("Relatorios", 350, y_inicial + espacamento * 6, 300, 50):
             self.tela_atual = "relatorios"
@@ -338,20 +751,30 @@ class GUI:
             self.tela_atual = "menu_principal"
             return
         
-        y = 100 - self.scroll_offset
-        
-        for prof in self.professores_lista:
-            if y > 80 and y < self.height - 100:
-                card = rl.Rectangle(20, y, self.width - 40, 100)
-                rl.draw_rectangle_rounded(card, 0.06, 8, rl.color_alpha(self.cor_secundaria, 0.06))
-                rl.draw_rectangle_rounded_lines(card, 0.06, 8, rl.color_alpha(self.cor_texto, 0.15))
-                
-                self.draw_text_ui(f"Nome: {prof.nome}", 30, y + 10, 20, self.cor_texto)
-                self.draw_text_ui(f"CPF: {prof.cpf}", 30, y + 35, 18, self.cor_texto)
-                self.draw_text_ui(f"Email: {prof.email}", 30, y + 58, 18, self.cor_texto)
-                self.draw_text_ui(f"Especialidade: {prof.especialidade}", 400, y + 35, 18, self.cor_texto)
-            
-            y += 110
+        # Busca incremental: refaz a consulta quando o texto muda
+        self.desenhar_campo_busca("busca_professores", 480, 20, 350)
+        if self._busca_alterada("busca_professores"):
+            self._recarregar_professores()
+        
+        if self.professores_lista is None:
+            return
+        
+        self._desenhar_lista_cards(self.professores_lista, PASSO_CARD_PROFESSOR, ALTURA_CARD_PROFESSOR, LINHAS_CARD_PROFESSOR)
+    
+    def _recarregar_professores(self):
+        """Refaz a lista de professores com a busca atual; os textos dos
+        cards são formatados uma vez por página carregada"""
+        texto = self.busca_aplicada.get("busca_professores", "")
+        if texto:
+            self.professores_lista = Paginador(
+                lambda apos, limite: self.db.buscar_professores_texto(texto, limite, apos=apos),
+                self.db.contar_professores_texto(texto),
+                preparar=_textos_professor
+            )
+        else:
+            self.professores_lista = Paginador(self.db.listar_professores_pagina, self.db.contar_professores(),
+                                               preparar=_textos_professor)
+        self.scroll_offset = 0
     
     # ===== CADASTRO DE INSTITUIÇÃO =====
     
@@ -407,20 +830,29 @@ class GUI:
             self.tela_atual = "menu_principal"
             return
         
-        y = 100 - self.scroll_offset
-        
-        for inst in self.instituicoes_lista:
-            if y > 80 and y < self.height - 100:
-                card = rl.Rectangle(20, y, self.width - 40, 100)
-                rl.draw_rectangle_rounded(card, 0.06, 8, rl.color_alpha(self.cor_secundaria, 0.06))
-                rl.draw_rectangle_rounded_lines(card, 0.06, 8, rl.color_alpha(self.cor_texto, 0.15))
-                
-                self.draw_text_ui(f"Nome: {inst.nome}", 30, y + 10, 20, self.cor_texto)
-                self.draw_text_ui(f"CNPJ: {inst.cnpj}", 30, y + 35, 18, self.cor_texto)
-                self.draw_text_ui(f"Endereco: {inst.endereco}", 30, y + 58, 18, self.cor_texto)
-                self.draw_text_ui(f"Cidade/UF: {inst.cidade}/{inst.estado}", 30, y + 78, 18, self.cor_texto)
-            
-            y += 110
+        # Busca incremental por início do nome (sem acentos/maiúsculas)
+        self.desenhar_campo_busca("busca_instituicoes", 480, 20, 350)
+        if self._busca_alterada("busca_instituicoes"):
+            self._recarregar_instituicoes()
+        
+        if self.instituicoes_lista is None:
+            return
+        
+        self._desenhar_lista_cards(self.instituicoes_lista, PASSO_CARD_INSTITUICAO, ALTURA_CARD_INSTITUICAO, LINHAS_CARD_INSTITUICAO)
+    
+    def _recarregar_instituicoes(self):
+        """Refaz a lista de instituições com a busca atual"""
+        texto = self.busca_aplicada.get("busca_instituicoes", "")
+        if texto:
+            self.instituicoes_lista = Paginador(
+                lambda apos, limite: self.db.buscar_instituicoes_por_nome(texto, limite, apos=apos),
+                self.db.contar_instituicoes_por_nome(texto),
+                preparar=_textos_instituicao
+            )
+        else:
+            self.instituicoes_lista = Paginador(self.db.listar_instituicoes_pagina, self.db.contar_instituicoes(),
+                                                preparar=_textos_instituicao)
+        self.scroll_offset = 0
     
     # ===== CADASTRO DE VAGA =====
     
@@ -479,21 +911,40 @@ class GUI:
             self.tela_atual = "menu_principal"
             return
         
-        y = 100 - self.scroll_offset
-        
-        for vaga in self.vagas_lista:
-            if y > 80 and y < self.height - 100:
-                card = rl.Rectangle(20, y, self.width - 40, 120)
-                rl.draw_rectangle_rounded(card, 0.06, 8, rl.color_alpha(self.cor_secundaria, 0.06))
-                rl.draw_rectangle_rounded_lines(card, 0.06, 8, rl.color_alpha(self.cor_texto, 0.15))
-                
-                self.draw_text_ui(f"Disciplina: {vaga.disciplina}", 30, y + 10, 20, self.cor_texto)
-                self.draw_text_ui(f"Carga: {vaga.carga_horaria}h", 30, y + 35, 18, self.cor_texto)
-                self.draw_text_ui(f"Salario: R$ {vaga.salario:.2f}", 200, y + 35, 18, self.cor_texto)
-                self.draw_text_ui(f"Status: {vaga.status}", 400, y + 35, 18, self.cor_texto)
-                self.draw_text_ui(f"Desc: {vaga.descricao[:50]}...", 30, y + 58, 16, self.cor_texto)
-            
-            y += 130
+        # Filtro de status: cada clique passa para a próxima opção
+        status = self.filtro_vagas.status
+        if self.desenhar_botao(f"Status: {status or 'Todas'}", 250, 20, 210, 40):
+            proximo = FILTROS_STATUS_VAGA[(FILTROS_STATUS_VAGA.index(status) + 1) % len(FILTROS_STATUS_VAGA)]
+            self.filtro_vagas = self.filtro_vagas.com(status=proximo)
+            self._recarregar_vagas()
+        
+        # Busca incremental: refaz a consulta quando o texto muda
+        self.desenhar_campo_busca("busca_vagas", 480, 20, 350)
+        if self._busca_alterada("busca_vagas"):
+            self._recarregar_vagas()
+        
+        if self.vagas_lista is None:
+            return
+        
+        self._desenhar_lista_cards(self.vagas_lista, PASSO_CARD_VAGA, ALTURA_CARD_VAGA, LINHAS_CARD_VAGA)
+    
+    def _recarregar_vagas(self):
+        """Refaz a lista de vagas com a busca e o filtro atuais (no banco)"""
+        texto = self.busca_aplicada.get("busca_vagas", "")
+        filtro = self.filtro_vagas
+        if texto:
+            self.vagas_lista = Paginador(
+                lambda apos, limite: self.db.buscar_vagas_texto(texto, limite, filtro=filtro, apos=apos),
+                self.db.contar_vagas_texto(texto, filtro=filtro),
+                preparar=_textos_vaga
+            )
+        else:
+            self.vagas_lista = Paginador(
+                lambda apos, limite: self.db.listar_vagas_pagina(apos, limite, filtro=filtro),
+                self.db.contar_vagas(filtro=filtro),
+                preparar=_textos_vaga
+            )
+        self.scroll_offset = 0
     
     # ===== RELATÓRIOS =====
     
@@ -516,36 +967,63 @@ class GUI:
         if self.desenhar_botao("Relatorio Completo", 300, y_inicial + espacamento * 3, 400, 50):
             self.gerar_relatorio("completo")
         
+        if self.desenhar_botao("Exportar Todos", 300, y_inicial + espacamento * 4, 400, 50):
+            self.exportar_todos()
+        
         if self.desenhar_botao("Voltar", 300, y_inicial + espacamento * 5, 400, 50):
             self.tela_atual = "menu_principal"
     
     def gerar_relatorio(self, tipo: str):
-        """Gera e salva um relatório"""
+        """Agenda a geração de um relatório em segundo plano.
+
+        O resultado é verificado a cada frame em `atualizar()`.
+        """
         try:
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             if tipo == "professores":
-                conteudo = self.report_gen.gerar_relatorio_professores("txt")
+                conteudo = self.report_gen.iterar_relatorio_professores("txt")
                 nome_arquivo = f"relatorio_professores_{timestamp}.txt"
             elif tipo == "instituicoes":
-                conteudo = self.report_gen.gerar_relatorio_instituicoes("txt")
+                conteudo = self.report_gen.iterar_relatorio_instituicoes("txt")
                 nome_arquivo = f"relatorio_instituicoes_{timestamp}.txt"
             elif tipo == "vagas":
-                conteudo = self.report_gen.gerar_relatorio_vagas("txt")
+                conteudo = self.report_gen.iterar_relatorio_vagas("txt")
                 nome_arquivo = f"relatorio_vagas_{timestamp}.txt"
             elif tipo == "completo":
-                conteudo = self.report_gen.gerar_relatorio_completo()
+                conteudo = self.report_gen.iterar_relatorio_completo()
                 nome_arquivo = f"relatorio_completo_{timestamp}.txt"
             else:
                 return
             
-            self.report_gen.salvar_relatorio(conteudo, nome_arquivo)
-            self.mostrar_mensagem(f"Relatorio salvo: {nome_arquivo}")
+            futuro = self.executor_relatorios.submit(self._salvar_relatorio, conteudo, nome_arquivo)
+            self.relatorios_pendentes.append((nome_arquivo, futuro))
         except Exception as e:
             self.mostrar_mensagem(f"Erro ao gerar relatorio: {str(e)}")
     
+    def exportar_todos(self):
+        """Agenda a exportação de todos os relatórios (TXT e CSV)"""
+        futuro = self.executor_relatorios.submit(exportar_relatorios, self.db)
+        self.relatorios_pendentes.append(("todos os relatorios", futuro))
+    
+    def _salvar_relatorio(self, conteudo: Iterable[str], nome_arquivo: str):
+        """Executado no worker: consome o relatório e grava o arquivo"""
+        if not self.report_gen.salvar_relatorio(conteudo, nome_arquivo):
+            raise RuntimeError(f"falha ao salvar {nome_arquivo}")
+    
+    def _busca_alterada(self, campo_id: str) -> bool:
+        """True (e volta o scroll ao topo) se o texto do campo de busca mudou
+        desde a última consulta"""
+        texto = self.campos.get(campo_id, "").strip()
+        if texto == self.busca_aplicada.get(campo_id, ""):
+            return False
+        self.busca_aplicada[campo_id] = texto
+        self.scroll_offset = 0
+        return True
+    
     def limpar_campos(self):
         """Limpa todos os campos do formulário"""
         self.campos = {}
         self.campo_ativo = None
+        self.busca_aplicada = {}
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação opcional de Database e ReportGenerator
+
+Quando ativada (`Database(instrumentacao=Instrumentacao())`), os métodos
+públicos das instâncias são envolvidos por um medidor que registra
+chamadas, latência (histograma), linhas retornadas e os comandos SQL
+executados, capturados pelo trace callback do sqlite3. Sem instrumentação
+nada é envolvido e nenhum callback é instalado: o custo é zero.
+"""
+
+import functools
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (ms) das faixas do histograma de latência; a última
+# faixa recebe o que passar do maior limite
+LIMITES_HISTOGRAMA_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# Comandos SQL distintos guardados por método (os demais são somados em "...")
+MAX_SQL_POR_METODO = 50
+
+# Literais do SQL expandido pelo trace callback (textos, números e NULL de
+# parâmetros None), trocados por "?" para agrupar execuções do mesmo comando
+# e não guardar dados. "IS NULL"/"NOT NULL" são sintaxe e ficam como estão
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?"
+                       r"|(?<!IS )(?<!NOT )\bNULL\b", re.IGNORECASE)
+
+
+def normalizar_sql(sql: str) -> str:
+    """SQL sem literais e com espaços colapsados"""
+    return _LITERAIS.sub("?", " ".join(sql.split()))
+
+
+class EstatisticaMetodo:
+    """Acumulado das chamadas de um método"""
+
+    __slots__ = ("chamadas", "erros", "total", "maximo", "linhas", "histograma", "sql")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erros = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.linhas = 0
+        self.histograma = [0] * (len(LIMITES_HISTOGRAMA_MS) + 1)
+        self.sql: Dict[str, int] = {}
+
+    def para_dict(self) -> Dict[str, Any]:
+        rotulos = [f"<={limite}" for limite in LIMITES_HISTOGRAMA_MS] + [f">{LIMITES_HISTOGRAMA_MS[-1]}"]
+        return {
+            "chamadas": self.chamadas,
+            "erros": self.erros,
+            "total_s": self.total,
+            "media_s": self.total / self.chamadas if self.chamadas else 0.0,
+            "max_s": self.maximo,
+            "linhas": self.linhas,
+            "histograma_ms": dict(zip(rotulos, self.histograma)),
+            "sql": dict(sorted(self.sql.items(), key=lambda x: -x[1])),
+        }
+
+
+class _Chamada:
+    """Uma chamada em andamento: tempo acumulado, linhas e SQL executado
+    (comando normalizado -> execuções)"""
+
+    __slots__ = ("nome", "segundos", "linhas", "sql", "ultimo_sql", "erro")
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.segundos = 0.0
+        self.linhas = 0
+        self.sql: Dict[str, int] = {}
+        self.ultimo_sql = ""
+        self.erro = False
+
+
+class Instrumentacao:
+    """Coletor de métricas por método, thread-safe.
+
+    - `limite_lento`: chamadas com duração >= limite (segundos) são
+      registradas no logger `app.instrumentacao` (WARNING) e guardadas em
+      `lentas` (as `max_lentas` mais recentes), com o SQL executado.
+    - O tempo de métodos que retornam iteradores é o gasto dentro do
+      próprio iterador (soma dos `next`), sem o processamento de quem consome;
+      as linhas são os itens produzidos.
+    - O SQL é atribuído à chamada instrumentada mais interna da thread.
+    """
+
+    def __init__(self, limite_lento: float = 0.1, max_lentas: int = 100):
+        self.limite_lento = limite_lento
+        self.metodos: Dict[str, EstatisticaMetodo] = {}
+        self.lentas: Deque[Dict[str, Any]] = deque(maxlen=max_lentas)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _pilha(self) -> List[_Chamada]:
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    # ===== CAPTURA =====
+
+    def instrumentar(self, objeto: Any, prefixo: str, ignorar: Iterable[str] = ()):
+        """Envolve os métodos públicos de `objeto` (na instância, sem alterar a classe)"""
+        ignorar = set(ignorar)
+        for nome in dir(type(objeto)):
+            if nome.startswith("_") or nome in ignorar:
+                continue
+            metodo = getattr(objeto, nome)
+            if callable(metodo) and not isinstance(metodo, type):
+                setattr(objeto, nome, self._envolver(f"{prefixo}.{nome}", metodo))
+
+    def registrar_sql(self, sql: str):
+        """Trace callback das conexões (`conn.set_trace_callback`).
+
+        Comandos internos de tabelas virtuais (que o SQLite reporta como
+        comentários "-- ...") são ignorados, assim como a repetição do
+        comando no início de cada trigger disparado por ele.
+        """
+        pilha = getattr(self._local, "pilha", None)
+        if not pilha or sql.startswith("--"):
+            return
+        chamada = pilha[-1]
+        if sql == chamada.ultimo_sql:
+            return
+        chamada.ultimo_sql = sql
+        texto = normalizar_sql(sql)
+        chamada.sql[texto] = chamada.sql.get(texto, 0) + 1
+
+    def _envolver(self, nome: str, metodo: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(metodo)
+        def medido(*args, **kwargs):
+            chamada = _Chamada(nome)
+            pilha = self._pilha()
+            pilha.append(chamada)
+            inicio = time.perf_counter()
+            try:
+                resultado = metodo(*args, **kwargs)
+            except BaseException:
+                chamada.erro = True
+                raise
+            finally:
+                chamada.segundos += time.perf_counter() - inicio
+                pilha.pop()
+                if chamada.erro:
+                    self._concluir(chamada)
+
+            if isinstance(resultado, Iterator):
+                return self._medir_iterador(chamada, resultado)
+            if isinstance(resultado, (list, tuple, set, dict)):
+                chamada.linhas = len(resultado)
+            elif resultado is not None:
+                chamada.linhas = 1
+            self._concluir(chamada)
+            return resultado
+
+        return medido
+
+    def _medir_iterador(self, chamada: _Chamada, iterador: Iterator[Any]) -> Iterator[Any]:
+        try:
+            while True:
+                pilha = self._pilha()
+                pilha.append(chamada)
+                inicio = time.perf_counter()
+                try:
+                    item = next(iterador)
+                except StopIteration:
+                    return
+                except BaseException:
+                    chamada.erro = True
+                    raise
+                finally:
+                    chamada.segundos += time.perf_counter() - inicio
+                    pilha.pop()
+                chamada.linhas += 1
+                yield item
+        finally:
+            fechar = getattr(iterador, "close", None)
+            if fechar is not None:
+                fechar()
+            self._concluir(chamada)
+
+    def _concluir(self, chamada: _Chamada):
+        with self._lock:
+            estatistica = self.metodos.get(chamada.nome)
+            if estatistica is None:
+                estatistica = self.metodos[chamada.nome] = EstatisticaMetodo()
+            estatistica.chamadas += 1
+            estatistica.erros += chamada.erro
+            estatistica.total += chamada.segundos
+            estatistica.maximo = max(estatistica.maximo, chamada.segundos)
+            estatistica.linhas += chamada.linhas
+            estatistica.histograma[bisect_left(LIMITES_HISTOGRAMA_MS, chamada.segundos * 1000)] += 1
+            for texto, vezes in chamada.sql.items():
+                if texto not in estatistica.sql and len(estatistica.sql) >= MAX_SQL_POR_METODO:
+                    texto = "..."
+                estatistica.sql[texto] = estatistica.sql.get(texto, 0) + vezes
+
+        if chamada.segundos >= self.limite_lento:
+            lenta = {
+                "metodo": chamada.nome,
+                "segundos": chamada.segundos,
+                "linhas": chamada.linhas,
+                "sql": dict(chamada.sql),
+                "data": datetime.now().isoformat(timespec="seconds"),
+            }
+            with self._lock:
+                self.lentas.append(lenta)
+            logger.warning("%s levou %.1f ms (%d linha(s)): %s", chamada.nome,
+                           chamada.segundos * 1000, chamada.linhas,
+                           " | ".join(f"{texto} (x{vezes})" if vezes > 1 else texto
+                                      for texto, vezes in chamada.sql.items()) or "(sem SQL)")
+
+    # ===== RESULTADOS =====
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Retrato das métricas, ordenado pelo tempo total de cada método"""
+        with self._lock:
+            metodos = sorted(self.metodos.items(), key=lambda x: -x[1].total)
+            return {
+                "limite_lento_s": self.limite_lento,
+                "metodos": {nome: estatistica.para_dict() for nome, estatistica in metodos},
+                "lentas": list(self.lentas),
+            }
+
+    def salvar_json(self, caminho: str):
+        """Grava `para_dict()` em um arquivo JSON"""
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.para_dict(), f, ensure_ascii=False, indent=2)
+
+    def zerar(self):
+        """Descarta as métricas coletadas"""
+        with self._lock:
+            self.metodos.clear()
+            self.lentas.clear()
+
+    def resumo(self, limite: Optional[int] = 10) -> Iterator[str]:
+        """Linhas de texto com os métodos de maior tempo total"""
+        dados = self.para_dict()["metodos"]
+        for nome, m in list(dados.items())[:limite]:
+            yield (f"{nome}: {m['chamadas']} chamada(s), total {m['total_s'] * 1000:.1f} ms, "
+                   f"média {m['media_s'] * 1000:.2f} ms, máx {m['max_s'] * 1000:.2f} ms, {m['linhas']} linha(s)")
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Compatibilidade entre professores e vagas
+
+Os professores disponíveis são indexados uma vez pela especialidade
+normalizada (chave exata e palavras). Cada vaga consulta o índice pela
+disciplina, sem comparar com todos os professores, e o resultado é
+reaproveitado entre vagas da mesma disciplina: sugerir para todas as vagas
+abertas custa O(vagas + professores).
+"""
+
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from .database import Database
+from .models import Professor, Vaga, normalizar_texto
+
+# Quantidade padrão de candidatos por vaga
+CANDIDATOS_POR_VAGA = 5
+
+# Palavras que não indicam área (ignoradas na comparação por palavras)
+PALAVRAS_IGNORADAS = frozenset({"de", "da", "do", "das", "dos", "e", "em", "a", "o", "para"})
+
+# Pontuação da especialidade idêntica à disciplina; a comparação por
+# palavras vale de 0 a 1 (proporção de palavras em comum)
+PONTUACAO_EXATA = 2.0
+
+
+def _palavras(chave: str) -> Set[str]:
+    """Palavras significativas de uma chave normalizada"""
+    return {p for p in chave.split() if p not in PALAVRAS_IGNORADAS}
+
+
+class IndiceEspecialidades:
+    """Professores disponíveis indexados pela especialidade normalizada.
+
+    - exatos: chave -> professores com essa especialidade
+    - por_palavra: palavra -> professores cuja especialidade a contém
+    """
+
+    __slots__ = ("exatos", "por_palavra", "_palavras_chave", "total")
+
+    def __init__(self, professores: Iterator[Professor], excluir: Set[int] = frozenset()):
+        self.exatos: Dict[str, List[Professor]] = {}
+        self.por_palavra: Dict[str, List[Professor]] = {}
+        self._palavras_chave: Dict[int, Set[str]] = {}
+        self.total = 0
+        for prof in professores:
+            if prof.id in excluir:
+                continue
+            chave = normalizar_texto(prof.especialidade)
+            if not chave:
+                continue
+            self.total += 1
+            self.exatos.setdefault(chave, []).append(prof)
+            palavras = _palavras(chave)
+            self._palavras_chave[prof.id] = palavras
+            for palavra in palavras:
+                self.por_palavra.setdefault(palavra, []).append(prof)
+
+    def candidatos(self, disciplina: str, limite: int = CANDIDATOS_POR_VAGA) -> List[Tuple[Professor, float]]:
+        """(professor, pontuação) para a disciplina, do mais ao menos compatível.
+
+        Especialidade idêntica vale PONTUACAO_EXATA; as demais valem a
+        proporção de palavras em comum (Jaccard). Empates ficam com o
+        professor cadastrado primeiro.
+        """
+        chave = normalizar_texto(disciplina)
+        pontuacao: Dict[int, float] = {}
+        professores: Dict[int, Professor] = {}
+
+        for prof in self.exatos.get(chave, ()):
+            pontuacao[prof.id] = PONTUACAO_EXATA
+            professores[prof.id] = prof
+
+        palavras = _palavras(chave)
+        em_comum: Dict[int, int] = {}
+        for palavra in palavras:
+            for prof in self.por_palavra.get(palavra, ()):
+                if prof.id in pontuacao:
+                    continue
+                em_comum[prof.id] = em_comum.get(prof.id, 0) + 1
+                professores[prof.id] = prof
+        for prof_id, qtd in em_comum.items():
+            uniao = len(palavras | self._palavras_chave[prof_id])
+            pontuacao[prof_id] = qtd / uniao
+
+        ordenado = sorted(pontuacao.items(), key=lambda x: (-x[1], x[0]))[:limite]
+        return [(professores[prof_id], valor) for prof_id, valor in ordenado]
+
+
+class MotorCompatibilidade:
+    """Sugere professores disponíveis para vagas.
+
+    Professores já alocados em alguma vaga (vagas.professor_id de vaga não
+    cancelada) ficam fora do índice. O índice é montado na primeira
+    consulta; `recarregar()` o refaz após cadastros/alocações.
+    """
+
+    def __init__(self, database: Database):
+        self.db = database
+        self._indice: Optional[IndiceEspecialidades] = None
+
+    @property
+    def indice(self) -> IndiceEspecialidades:
+        if self._indice is None:
+            self.recarregar()
+        assert self._indice is not None
+        return self._indice
+
+    def recarregar(self):
+        """Refaz o índice a partir do banco (uma leitura de professores)"""
+        alocados = self.db.professores_alocados()
+        self._indice = IndiceEspecialidades(self.db.iterar_professores(), alocados)
+
+    def candidatos(self, vaga: Vaga, limite: int = CANDIDATOS_POR_VAGA) -> List[Tuple[Professor, float]]:
+        """Professores compatíveis com a vaga, em ordem de pontuação"""
+        return self.indice.candidatos(vaga.disciplina, limite)
+
+    def sugerir_vagas_abertas(self, limite: int = CANDIDATOS_POR_VAGA,
+                              recarregar: bool = True) -> Iterator[Tuple[Vaga, List[Tuple[Professor, float]]]]:
+        """Candidatos de cada vaga Aberta, em ordem de id.
+
+        Vagas da mesma disciplina (chave normalizada) compartilham o
+        resultado, calculado uma única vez.
+        """
+        if recarregar:
+            self.recarregar()
+        indice = self.indice
+        por_disciplina: Dict[str, List[Tuple[Professor, float]]] = {}
+        for vaga in self.db.iterar_vagas(status="Aberta"):
+            chave = normalizar_texto(vaga.disciplina)
+            lista = por_disciplina.get(chave)
+            if lista is None:
+                lista = indice.candidatos(chave, limite)
+                por_disciplina[chave] = lista
+            yield vaga, lista
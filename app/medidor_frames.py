@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Medição do tempo de frame da GUI
+
+Guarda as fases (entrada, atualização, desenho e espera do vsync/limite
+de FPS) dos últimos frames para o overlay de depuração, o custo de desenho
+acumulado por tela e, opcionalmente, grava cada frame em um arquivo de
+trace no formato do Chrome (abre em chrome://tracing ou no Perfetto).
+Não depende do raylib.
+"""
+
+import json
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, TextIO, Tuple
+
+# Frames considerados nos percentis do overlay
+JANELA_FRAMES = 240
+
+# Fases de um frame, na ordem em que acontecem
+FASES = ("entrada", "atualizar", "desenhar", "espera")
+
+
+class Frame:
+    """Medições de um frame (segundos por fase e chamadas de texto)"""
+
+    __slots__ = ("inicio", "tela", "fases", "textos", "medidas")
+
+    def __init__(self, inicio: float, tela: str, fases: Tuple[float, ...], textos: int, medidas: int):
+        self.inicio = inicio
+        self.tela = tela
+        self.fases = fases
+        self.textos = textos
+        self.medidas = medidas
+
+    @property
+    def trabalho(self) -> float:
+        """Tempo do frame sem a espera do limite de FPS"""
+        return sum(self.fases[:-1])
+
+
+def _percentil(ordenados: List[float], fracao: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+class MedidorFrames:
+    """Janela dos últimos frames + custo por tela + trace opcional"""
+
+    def __init__(self, janela: int = JANELA_FRAMES):
+        self.frames: Deque[Frame] = deque(maxlen=janela)
+        # tela -> [frames, tempo total de desenho, maior tempo de desenho]
+        self.por_tela: Dict[str, List[float]] = {}
+        self.caminho_trace: Optional[str] = None
+        self._trace: Optional[TextIO] = None
+        self._origem_trace = 0.0
+
+    def registrar(self, tela: str, marcas: Tuple[float, ...], textos: int, medidas: int):
+        """Registra um frame a partir das marcas de tempo entre as fases
+        (len(FASES) + 1 instantes de `time.perf_counter()`)"""
+        fases = tuple(b - a for a, b in zip(marcas, marcas[1:]))
+        frame = Frame(marcas[0], tela, fases, textos, medidas)
+        self.frames.append(frame)
+
+        desenho = fases[FASES.index("desenhar")]
+        acumulado = self.por_tela.get(tela)
+        if acumulado is None:
+            self.por_tela[tela] = [1, desenho, desenho]
+        else:
+            acumulado[0] += 1
+            acumulado[1] += desenho
+            acumulado[2] = max(acumulado[2], desenho)
+
+        if self._trace is not None:
+            self._gravar(frame)
+
+    def percentis(self) -> Dict[str, float]:
+        """p50/p95/p99/máx (segundos) do trabalho por frame na janela"""
+        if not self.frames:
+            return {}
+        ordenados = sorted(f.trabalho for f in self.frames)
+        return {
+            "p50": _percentil(ordenados, 0.50),
+            "p95": _percentil(ordenados, 0.95),
+            "p99": _percentil(ordenados, 0.99),
+            "max": ordenados[-1],
+        }
+
+    def medias_fases(self) -> Dict[str, float]:
+        """Tempo médio (segundos) de cada fase na janela"""
+        if not self.frames:
+            return {}
+        n = len(self.frames)
+        return {fase: sum(f.fases[i] for f in self.frames) / n for i, fase in enumerate(FASES)}
+
+    def custo_telas(self) -> List[Tuple[str, int, float, float]]:
+        """(tela, frames, desenho médio, desenho máximo), da mais cara para a mais barata"""
+        telas = [(tela, int(n), total / n, maximo) for tela, (n, total, maximo) in self.por_tela.items()]
+        telas.sort(key=lambda t: t[2], reverse=True)
+        return telas
+
+    def zerar(self):
+        self.frames.clear()
+        self.por_tela.clear()
+
+    # ===== TRACE =====
+
+    @property
+    def gravando(self) -> bool:
+        return self._trace is not None
+
+    def iniciar_trace(self, caminho: str):
+        """Passa a gravar cada frame em `caminho` (JSON do Chrome trace)"""
+        self.parar_trace()
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        self._trace = open(caminho, "w", encoding="utf-8")
+        self._trace.write("[\n")
+        self.caminho_trace = caminho
+        self._origem_trace = 0.0
+
+    def parar_trace(self):
+        """Fecha o arquivo de trace (o JSON fica completo)"""
+        if self._trace is None:
+            return
+        self._trace.write('{"name": "fim", "ph": "i", "s": "g", "ts": 0, "pid": 1, "tid": 1}\n]\n')
+        self._trace.close()
+        self._trace = None
+
+    def _gravar(self, frame: Frame):
+        """Um evento "frame" com as fases aninhadas, em microssegundos"""
+        if not self._origem_trace:
+            self._origem_trace = frame.inicio
+        inicio = (frame.inicio - self._origem_trace) * 1e6
+        eventos = [{
+            "name": frame.tela, "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+            "ts": round(inicio, 1), "dur": round(sum(frame.fases) * 1e6, 1),
+            "args": {"draw_text": frame.textos, "measure_text": frame.medidas},
+        }]
+        for fase, duracao in zip(FASES, frame.fases):
+            eventos.append({"name": fase, "cat": "fase", "ph": "X", "pid": 1, "tid": 1,
+                            "ts": round(inicio, 1), "dur": round(duracao * 1e6, 1)})
+            inicio += duracao * 1e6
+        for evento in eventos:
+            self._trace.write(json.dumps(evento) + ",\n")
@@ -1,14 +1,34 @@
 # -*- coding: utf-8 -*-
 """
 Models para o sistema de cadastro de professores substitutos
+
+As classes usam __slots__ (sem __dict__ por instância) e oferecem
+`from_row`, que reidrata um objeto a partir de uma linha `SELECT *` sem
+passar pelo __init__.
 """
 
+import unicodedata
 from datetime import datetime
-from typing import Optional, Any, Dict
+from functools import lru_cache
+from typing import Optional, Any, Dict, Sequence
+
+
+@lru_cache(maxsize=4096)
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Chave de comparação: sem acentos, sem diferença de maiúsculas e com
+    espaços colapsados ("  Matemática " -> "matematica")"""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
 
 class Professor:
     """Classe para representar um professor substituto"""
     
+    __slots__ = ("id", "nome", "cpf", "email", "telefone", "especialidade")
+    
     def __init__(self, id: Optional[int] = None, nome: str = "", cpf: str = "", 
                  email: str = "", telefone: str = "", especialidade: str = ""):
         self.id = id
@@ -18,6 +38,14 @@ class Professor:
         self.telefone = telefone
         self.especialidade = especialidade
     
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Professor":
+        """Cria um professor a partir de uma linha da tabela professores"""
+        prof = cls.__new__(cls)
+        (prof.id, prof.nome, prof.cpf, prof.email,
+         prof.telefone, prof.especialidade) = row[:6]
+        return prof
+    
     def __repr__(self):
         return f"Professor({self.id}, {self.nome}, {self.especialidade})"
     
@@ -35,6 +63,8 @@ class Professor:
 class Instituicao:
     """Classe para representar uma instituição de ensino"""
     
+    __slots__ = ("id", "nome", "cnpj", "endereco", "cidade", "estado")
+    
     def __init__(self, id: Optional[int] = None, nome: str = "", cnpj: str = "",
                  endereco: str = "", cidade: str = "", estado: str = ""):
         self.id = id
@@ -44,6 +74,14 @@ class Instituicao:
         self.cidade = cidade
         self.estado = estado
     
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Instituicao":
+        """Cria uma instituição a partir de uma linha da tabela instituicoes"""
+        inst = cls.__new__(cls)
+        (inst.id, inst.nome, inst.cnpj, inst.endereco,
+         inst.cidade, inst.estado) = row[:6]
+        return inst
+    
     def __repr__(self):
         return f"Instituicao({self.id}, {self.nome}, {self.cidade})"
     
@@ -61,9 +99,13 @@ class Instituicao:
 class Vaga:
     """Classe para representar uma vaga de professor substituto"""
     
+    __slots__ = ("id", "instituicao_id", "disciplina", "carga_horaria", "salario",
+                 "descricao", "status", "professor_id", "data_cadastro")
+    
     def __init__(self, id: Optional[int] = None, instituicao_id: Optional[int] = None,
                  disciplina: str = "", carga_horaria: int = 0, salario: float = 0.0,
-                 descricao: str = "", status: str = "Aberta", professor_id: Optional[int] = None):
+                 descricao: str = "", status: str = "Aberta", professor_id: Optional[int] = None,
+                 data_cadastro: Optional[str] = None):
         self.id = id
         self.instituicao_id = instituicao_id
         self.disciplina = disciplina
@@ -72,7 +114,19 @@ class Vaga:
         self.descricao = descricao
         self.status = status  # Aberta, Preenchida, Cancelada
         self.professor_id = professor_id
-        self.data_cadastro = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if data_cadastro is None:
+            data_cadastro = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.data_cadastro = data_cadastro
+    
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Vaga":
+        """Cria uma vaga a partir de uma linha da tabela vagas, mantendo a
+        data_cadastro gravada (sem gerar um novo timestamp)"""
+        vaga = cls.__new__(cls)
+        (vaga.id, vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria,
+         vaga.salario, vaga.descricao, vaga.status, vaga.professor_id,
+         vaga.data_cadastro) = row[:9]
+        return vaga
     
     def __repr__(self):
         return f"Vaga({self.id}, {self.disciplina}, {self.status})"
@@ -1,316 +1,390 @@
 # -*- coding: utf-8 -*-
 """
 Módulo de geração de relatórios
+
+Cada relatório existe em duas formas: `iterar_*`, que produz as linhas sob
+demanda a partir de cursores do banco (memória constante), e `gerar_*`, que
+junta essas linhas em uma única string.
 """
 
 from datetime import datetime
 from io import StringIO
+from itertools import chain
 import csv
 import os
-from typing import List, Optional
-from .database import Database
+from typing import Any, Iterable, Iterator, Optional, Sequence, TextIO, Tuple, Union
+from .database import FAIXA_SEM_DATA, Database, FiltroVagas, faixa_aging
+from .analytics import distribuicao_salarios_por_disciplina
+from .matching import CANDIDATOS_POR_VAGA, MotorCompatibilidade
 from .models import Professor, Instituicao, Vaga
 
+
+def _linhas_cabecalho(titulo: str) -> Iterator[str]:
+    """Cabeçalho padrão dos relatórios TXT"""
+    yield "=" * 80
+    yield titulo
+    yield f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
+    yield "=" * 80
+
+
+def _linhas_csv(cabecalho: Sequence[str], registros: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """Formata registros como linhas CSV (com aspas corretas), uma por vez.
+
+    Mantém o terminador padrão do csv ("\r\n"): cada linha sai sem o "\n"
+    final, que é recolocado ao juntar/gravar as linhas, então o arquivo é
+    o mesmo que o `csv.writer` produziria.
+    """
+    buf = StringIO()
+    writer = csv.writer(buf)
+    for registro in chain([cabecalho], registros):
+        writer.writerow(registro)
+        yield buf.getvalue()[:-1]
+        buf.seek(0)
+        buf.truncate()
+
+
 class ReportGenerator:
     """Classe para gerar relatórios do sistema"""
-    
+
     def __init__(self, database: Database):
         self.db = database
-    
+        # Relatórios entram nas métricas do banco, se instrumentado
+        instrumentacao = getattr(database, "instrumentacao", None)
+        if instrumentacao is not None:
+            instrumentacao.instrumentar(self, "ReportGenerator")
+
     def gerar_relatorio_professores(self, formato: str = "txt") -> str:
         """Gera relatório de todos os professores cadastrados"""
-        professores = self.db.listar_professores()
-        
+        return "\n".join(self.iterar_relatorio_professores(formato))
+
+    def iterar_relatorio_professores(self, formato: str = "txt") -> Iterator[str]:
+        """Produz o relatório de professores linha a linha"""
         if formato == "txt":
-            return self._relatorio_professores_txt(professores)
+            total = self.db.contar_professores()
+            yield from self._relatorio_professores_txt(total, self.db.iterar_professores())
         elif formato == "csv":
-            return self._relatorio_professores_csv(professores)
-        return ""
-    
-    def _relatorio_professores_txt(self, professores: List[Professor]) -> str:
+            yield from self._relatorio_professores_csv(self.db.iterar_professores())
+
+    def _relatorio_professores_txt(self, total: int, professores: Iterable[Professor]) -> Iterator[str]:
         """Gera relatório de professores em formato TXT"""
-        linhas: List[str] = []
-        linhas.append("=" * 80)
-        linhas.append("RELATÓRIO DE PROFESSORES SUBSTITUTOS")
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
-        linhas.append("")
-        linhas.append(f"Total de professores cadastrados: {len(professores)}")
-        linhas.append("")
-        
+        yield from _linhas_cabecalho("RELATÓRIO DE PROFESSORES SUBSTITUTOS")
+        yield ""
+        yield f"Total de professores cadastrados: {total}"
+        yield ""
+
         for i, prof in enumerate(professores, 1):
-            linhas.append(f"{i}. Professor: {prof.nome}")
-            linhas.append(f"   CPF: {prof.cpf}")
-            linhas.append(f"   Email: {prof.email}")
-            linhas.append(f"   Telefone: {prof.telefone}")
-            linhas.append(f"   Especialidade: {prof.especialidade}")
-            linhas.append("")
-        
-        linhas.append("=" * 80)
-        
-        return "\n".join(linhas)
-    
-    def _relatorio_professores_csv(self, professores: List[Professor]) -> str:
+            yield f"{i}. Professor: {prof.nome}"
+            yield f"   CPF: {prof.cpf}"
+            yield f"   Email: {prof.email}"
+            yield f"   Telefone: {prof.telefone}"
+            yield f"   Especialidade: {prof.especialidade}"
+            yield ""
+
+        yield "=" * 80
+
+    def _relatorio_professores_csv(self, professores: Iterable[Professor]) -> Iterator[str]:
         """Gera relatório de professores em formato CSV (com aspas corretas)"""
-        buf = StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(["ID", "Nome", "CPF", "Email", "Telefone", "Especialidade"])
-        for prof in professores:
-            writer.writerow([prof.id, prof.nome, prof.cpf, prof.email, prof.telefone, prof.especialidade])
-        return buf.getvalue().rstrip("\n")
-    
+        return _linhas_csv(
+            ["ID", "Nome", "CPF", "Email", "Telefone", "Especialidade"],
+            ([prof.id, prof.nome, prof.cpf, prof.email, prof.telefone, prof.especialidade]
+             for prof in professores)
+        )
+
     def gerar_relatorio_instituicoes(self, formato: str = "txt") -> str:
         """Gera relatório de todas as instituições cadastradas"""
-        instituicoes = self.db.listar_instituicoes()
-        
+        return "\n".join(self.iterar_relatorio_instituicoes(formato))
+
+    def iterar_relatorio_instituicoes(self, formato: str = "txt") -> Iterator[str]:
+        """Produz o relatório de instituições linha a linha"""
         if formato == "txt":
-            return self._relatorio_instituicoes_txt(instituicoes)
+            total = self.db.contar_instituicoes()
+            yield from self._relatorio_instituicoes_txt(total, self.db.iterar_instituicoes())
         elif formato == "csv":
-            return self._relatorio_instituicoes_csv(instituicoes)
-        return ""
-    
-    def _relatorio_instituicoes_txt(self, instituicoes: List[Instituicao]) -> str:
+            yield from self._relatorio_instituicoes_csv(self.db.iterar_instituicoes())
+
+    def _relatorio_instituicoes_txt(self, total: int, instituicoes: Iterable[Instituicao]) -> Iterator[str]:
         """Gera relatório de instituições em formato TXT"""
-        linhas: List[str] = []
-        linhas.append("=" * 80)
-        linhas.append("RELATÓRIO DE INSTITUIÇÕES DE ENSINO")
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
-        linhas.append("")
-        linhas.append(f"Total de instituições cadastradas: {len(instituicoes)}")
-        linhas.append("")
-        
+        yield from _linhas_cabecalho("RELATÓRIO DE INSTITUIÇÕES DE ENSINO")
+        yield ""
+        yield f"Total de instituições cadastradas: {total}"
+        yield ""
+
         for i, inst in enumerate(instituicoes, 1):
-            linhas.append(f"{i}. Instituição: {inst.nome}")
-            linhas.append(f"   CNPJ: {inst.cnpj}")
-            linhas.append(f"   Endereço: {inst.endereco}")
-            linhas.append(f"   Cidade/Estado: {inst.cidade}/{inst.estado}")
-            linhas.append("")
-        
-        linhas.append("=" * 80)
-        
-        return "\n".join(linhas)
-    
-    def _relatorio_instituicoes_csv(self, instituicoes: List[Instituicao]) -> str:
+            yield f"{i}. Instituição: {inst.nome}"
+            yield f"   CNPJ: {inst.cnpj}"
+            yield f"   Endereço: {inst.endereco}"
+            yield f"   Cidade/Estado: {inst.cidade}/{inst.estado}"
+            yield ""
+
+        yield "=" * 80
+
+    def _relatorio_instituicoes_csv(self, instituicoes: Iterable[Instituicao]) -> Iterator[str]:
         """Gera relatório de instituições em formato CSV (com aspas corretas)"""
-        buf = StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(["ID", "Nome", "CNPJ", "Endereco", "Cidade", "Estado"])
-        for inst in instituicoes:
-            writer.writerow([inst.id, inst.nome, inst.cnpj, inst.endereco, inst.cidade, inst.estado])
-        return buf.getvalue().rstrip("\n")
-    
-    def gerar_relatorio_vagas(self, formato: str = "txt", filtro_status: Optional[str] = None) -> str:
+        return _linhas_csv(
+            ["ID", "Nome", "CNPJ", "Endereco", "Cidade", "Estado"],
+            ([inst.id, inst.nome, inst.cnpj, inst.endereco, inst.cidade, inst.estado]
+             for inst in instituicoes)
+        )
+
+    def gerar_relatorio_vagas(self, formato: str = "txt", filtro_status: Optional[str] = None,
+                              filtro: Optional[FiltroVagas] = None) -> str:
         """Gera relatório de vagas"""
-        vagas = self.db.listar_vagas()
+        return "\n".join(self.iterar_relatorio_vagas(formato, filtro_status, filtro))
 
-        if filtro_status:
-            vagas = [v for v in vagas if v.status == filtro_status]
+    def iterar_relatorio_vagas(self, formato: str = "txt", filtro_status: Optional[str] = None,
+                               filtro: Optional[FiltroVagas] = None) -> Iterator[str]:
+        """Produz o relatório de vagas linha a linha.
 
+        `filtro_status` e `filtro` viram um único `FiltroVagas`, resolvido
+        em SQL pelo banco.
+        """
+        criterios = FiltroVagas.combinar(filtro, status=filtro_status or None)
         if formato == "txt":
-            return self._relatorio_vagas_txt(vagas, filtro_status)
+            total = self.db.contar_vagas(filtro=criterios)
+            detalhadas = self.db.iterar_vagas_detalhadas(filtro=criterios)
+            yield from self._relatorio_vagas_txt(total, detalhadas, filtro_status, filtro)
         elif formato == "csv":
-            return self._relatorio_vagas_csv(vagas)
-        return ""
-    
-    def _relatorio_vagas_txt(self, vagas: List[Vaga], filtro_status: Optional[str] = None) -> str:
-        """Gera relatório de vagas em formato TXT"""
-        linhas: List[str] = []
-        linhas.append("=" * 80)
+            yield from self._relatorio_vagas_csv(self.db.iterar_vagas(filtro=criterios))
+
+    def _relatorio_vagas_txt(self, total: int, vagas: Iterable[Tuple[Vaga, Optional[str], Optional[str]]],
+                             filtro_status: Optional[str] = None,
+                             filtro: Optional[FiltroVagas] = None) -> Iterator[str]:
+        """Gera relatório de vagas em formato TXT
+
+        Recebe as tuplas (vaga, nome_instituicao, nome_professor) de
+        `Database.iterar_vagas_detalhadas`, sem consultas por vaga.
+        """
         titulo = "RELATÓRIO DE VAGAS"
         if filtro_status:
             titulo += f" - {filtro_status.upper()}"
-        linhas.append(titulo)
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
-        linhas.append("")
-        linhas.append(f"Total de vagas: {len(vagas)}")
-        linhas.append("")
-        
-        for i, vaga in enumerate(vagas, 1):
-            inst_nome = "N/A"
-            if vaga.instituicao_id is not None:
-                instituicao = self.db.buscar_instituicao(vaga.instituicao_id)
-                inst_nome = instituicao.nome if instituicao else "N/A"
-            
-            linhas.append(f"{i}. Vaga: {vaga.disciplina}")
-            linhas.append(f"   Instituição: {inst_nome}")
-            linhas.append(f"   Carga Horária: {vaga.carga_horaria}h")
-            linhas.append(f"   Salário: R$ {vaga.salario:.2f}")
-            linhas.append(f"   Status: {vaga.status}")
-            
+        yield from _linhas_cabecalho(titulo)
+        if filtro:
+            yield "Filtro: " + ", ".join(f"{campo}={valor}" for campo, valor in filtro.criterios().items())
+        yield ""
+        yield f"Total de vagas: {total}"
+        yield ""
+
+        for i, (vaga, inst_nome, prof_nome) in enumerate(vagas, 1):
+            yield f"{i}. Vaga: {vaga.disciplina}"
+            yield f"   Instituição: {inst_nome if inst_nome is not None else 'N/A'}"
+            yield f"   Carga Horária: {vaga.carga_horaria}h"
+            yield f"   Salário: R$ {vaga.salario:.2f}"
+            yield f"   Status: {vaga.status}"
+
             if vaga.professor_id:
-                professor = self.db.buscar_professor(vaga.professor_id)
-                prof_nome = professor.nome if professor else "N/A"
-                linhas.append(f"   Professor: {prof_nome}")
-            
-            linhas.append(f"   Descrição: {vaga.descricao}")
-            linhas.append(f"   Data de Cadastro: {vaga.data_cadastro}")
-            linhas.append("")
-        
-        linhas.append("=" * 80)
-        
-        return "\n".join(linhas)
-    
-    def _relatorio_vagas_csv(self, vagas: List[Vaga]) -> str:
+                yield f"   Professor: {prof_nome if prof_nome is not None else 'N/A'}"
+
+            yield f"   Descrição: {vaga.descricao}"
+            yield f"   Data de Cadastro: {vaga.data_cadastro}"
+            yield ""
+
+        yield "=" * 80
+
+    def _relatorio_vagas_csv(self, vagas: Iterable[Vaga]) -> Iterator[str]:
         """Gera relatório de vagas em formato CSV (com aspas corretas)"""
-        buf = StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(["ID", "Instituicao_ID", "Disciplina", "Carga_Horaria", "Salario", "Status", "Professor_ID", "Data_Cadastro"])
-        for vaga in vagas:
-            writer.writerow([vaga.id, vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria, vaga.salario, vaga.status, vaga.professor_id, vaga.data_cadastro])
-        return buf.getvalue().rstrip("\n")
-    
+        return _linhas_csv(
+            ["ID", "Instituicao_ID", "Disciplina", "Carga_Horaria", "Salario", "Status", "Professor_ID", "Data_Cadastro"],
+            ([vaga.id, vaga.instituicao_id, vaga.disciplina, vaga.carga_horaria, vaga.salario,
+              vaga.status, vaga.professor_id, vaga.data_cadastro]
+             for vaga in vagas)
+        )
+
     def gerar_relatorio_completo(self) -> str:
         """Gera um relatório completo do sistema"""
-        linhas: List[str] = []
-        linhas.append("=" * 80)
-        linhas.append("RELATÓRIO COMPLETO DO SISTEMA")
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
-        linhas.append("")
-        
-        # Estatísticas gerais
-        professores = self.db.listar_professores()
-        instituicoes = self.db.listar_instituicoes()
-        vagas = self.db.listar_vagas()
-        
-        linhas.append("ESTATÍSTICAS GERAIS:")
-        linhas.append(f"  - Total de Professores: {len(professores)}")
-        linhas.append(f"  - Total de Instituições: {len(instituicoes)}")
-        linhas.append(f"  - Total de Vagas: {len(vagas)}")
-        
-        vagas_abertas = len([v for v in vagas if v.status == "Aberta"])
-        vagas_preenchidas = len([v for v in vagas if v.status == "Preenchida"])
-        vagas_canceladas = len([v for v in vagas if v.status == "Cancelada"])
-        
-        linhas.append(f"  - Vagas Abertas: {vagas_abertas}")
-        linhas.append(f"  - Vagas Preenchidas: {vagas_preenchidas}")
-        linhas.append(f"  - Vagas Canceladas: {vagas_canceladas}")
-        linhas.append("")
-        
+        return "\n".join(self.iterar_relatorio_completo())
+
+    def iterar_relatorio_completo(self) -> Iterator[str]:
+        """Produz o relatório completo linha a linha"""
+        yield from _linhas_cabecalho("RELATÓRIO COMPLETO DO SISTEMA")
+        yield ""
+
+        # Estatísticas gerais (contadores mantidos pelo banco: leitura O(1))
+        por_status = self.db.contar_vagas_por_status()
+        yield "ESTATÍSTICAS GERAIS:"
+        yield f"  - Total de Professores: {self.db.contar_professores()}"
+        yield f"  - Total de Instituições: {self.db.contar_instituicoes()}"
+        yield f"  - Total de Vagas: {sum(por_status.values())}"
+
+        yield f"  - Vagas Abertas: {por_status.get('Aberta', 0)}"
+        yield f"  - Vagas Preenchidas: {por_status.get('Preenchida', 0)}"
+        yield f"  - Vagas Canceladas: {por_status.get('Cancelada', 0)}"
+        yield ""
+
         # Especialidades mais demandadas
-        especialidades: dict[str, int] = {}
-        for vaga in vagas:
-            if vaga.status == "Aberta":
-                disc = vaga.disciplina
-                especialidades[disc] = especialidades.get(disc, 0) + 1
-        
+        especialidades = self.db.contar_vagas_por_disciplina(status="Aberta")
+
         if especialidades:
-            linhas.append("DISCIPLINAS COM VAGAS ABERTAS:")
-            for disc, count in sorted(especialidades.items(), key=lambda x: x[1], reverse=True):
-                linhas.append(f"  - {disc}: {count} vaga(s)")
-            linhas.append("")
-        
-        linhas.append("=" * 80)
-        
-        return "\n".join(linhas)
+            yield "DISCIPLINAS COM VAGAS ABERTAS:"
+            for disc, count in especialidades:
+                yield f"  - {disc}: {count} vaga(s)"
+            yield ""
+
+        medias = self.db.medias_salario_por_disciplina()
+        if medias:
+            yield "SALÁRIO MÉDIO POR DISCIPLINA:"
+            for disc, qtd, media in medias:
+                yield f"  - {disc}: R$ {media:.2f} ({qtd} vaga(s))"
+            yield ""
+
+        yield "=" * 80
 
     # === Novos relatórios especializados ===
     def gerar_resumo_demanda_por_disciplina(self, formato: str = "txt", somente_abertas: bool = False) -> str:
         """Resumo de demanda por disciplina (contagem de vagas por disciplina, opcionalmente apenas Abertas)."""
-        vagas = self.db.listar_vagas()
-        if somente_abertas:
-            vagas = [v for v in vagas if v.status == "Aberta"]
+        return "\n".join(self.iterar_resumo_demanda_por_disciplina(formato, somente_abertas))
 
-        contagem: dict[str, int] = {}
-        for v in vagas:
-            contagem[v.disciplina] = contagem.get(v.disciplina, 0) + 1
+    def iterar_resumo_demanda_por_disciplina(self, formato: str = "txt", somente_abertas: bool = False) -> Iterator[str]:
+        """Produz o resumo de demanda por disciplina linha a linha"""
+        ordenado = self.db.contar_vagas_por_disciplina(status="Aberta" if somente_abertas else None)
 
         if formato == "csv":
-            buf = StringIO()
-            writer = csv.writer(buf)
-            writer.writerow(["Disciplina", "Quantidade"])
-            for disc, qtd in sorted(contagem.items(), key=lambda x: x[1], reverse=True):
-                writer.writerow([disc, qtd])
-            return buf.getvalue().rstrip("\n")
-
-        linhas: List[str] = []
-        linhas.append("=" * 80)
+            yield from _linhas_csv(["Disciplina", "Quantidade"], ordenado)
+            return
+
         titulo = "RESUMO DE DEMANDA POR DISCIPLINA"
         if somente_abertas:
             titulo += " - APENAS VAGAS ABERTAS"
-        linhas.append(titulo)
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
-        for disc, qtd in sorted(contagem.items(), key=lambda x: x[1], reverse=True):
-            linhas.append(f"- {disc}: {qtd} vaga(s)")
-        return "\n".join(linhas)
-
-    def gerar_aging_vagas_abertas(self, formato: str = "txt") -> str:
-        """Relatório de aging das vagas Abertas (há quantos dias estão abertas)."""
-        vagas = [v for v in self.db.listar_vagas() if v.status == "Aberta"]
-
-        def _dias_aberta(data_str: str) -> int:
-            try:
-                dt = datetime.strptime(data_str, "%Y-%m-%d %H:%M:%S")
-                return max(0, (datetime.now() - dt).days)
-            except Exception:
-                return 0
-
-        linhas_dados = [
-            (v.id, v.disciplina, v.instituicao_id, _dias_aberta(v.data_cadastro))
-            for v in vagas
-        ]
-        linhas_dados.sort(key=lambda x: x[3], reverse=True)
+        yield from _linhas_cabecalho(titulo)
+        for disc, qtd in ordenado:
+            yield f"- {disc}: {qtd} vaga(s)"
+
+    def gerar_aging_vagas_abertas(self, formato: str = "txt", limite: Optional[int] = None) -> str:
+        """Relatório de aging das vagas Abertas (há quantos dias estão abertas).
+
+        `limite` restringe a listagem às N vagas abertas há mais tempo.
+        """
+        return "\n".join(self.iterar_aging_vagas_abertas(formato, limite))
+
+    def iterar_aging_vagas_abertas(self, formato: str = "txt", limite: Optional[int] = None) -> Iterator[str]:
+        """Produz o relatório de aging linha a linha"""
+        # Dias calculados pelo banco, já da vaga mais antiga para a mais recente
+        referencia = datetime.now()
+        linhas_dados = self.db.aging_vagas_abertas(limite, referencia)
 
         if formato == "csv":
-            buf = StringIO()
-            writer = csv.writer(buf)
-            writer.writerow(["Vaga_ID", "Disciplina", "Instituicao_ID", "Dias_Aberta"])
-            writer.writerows(linhas_dados)
-            return buf.getvalue().rstrip("\n")
-
-        linhas: List[str] = []
-        linhas.append("=" * 80)
-        linhas.append("AGING DE VAGAS ABERTAS (dias abertas)")
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
+            yield from _linhas_csv(
+                ["Vaga_ID", "Disciplina", "Instituicao_ID", "Dias_Aberta", "Faixa"],
+                ([vaga_id, disc, inst_id, dias, faixa_aging(dias)]
+                 for vaga_id, disc, inst_id, dias in linhas_dados)
+            )
+            return
+
+        titulo = "AGING DE VAGAS ABERTAS (dias abertas)"
+        if limite is not None:
+            titulo += f" - {limite} MAIS ANTIGAS"
+        yield from _linhas_cabecalho(titulo)
+        yield "FAIXAS:"
+        for rotulo, qtd in self.db.aging_por_faixa(referencia):
+            if rotulo == FAIXA_SEM_DATA:
+                yield f"  - sem data de cadastro: {qtd} vaga(s)"
+            else:
+                yield f"  - {rotulo} dias: {qtd} vaga(s)"
+        yield ""
         for (vaga_id, disc, inst_id, dias) in linhas_dados:
-            linhas.append(f"Vaga {vaga_id} | {disc} | Inst {inst_id} | {dias} dia(s)")
-        return "\n".join(linhas)
+            yield f"Vaga {vaga_id} | {disc} | Inst {inst_id} | {dias} dia(s)"
 
     def gerar_salarios_por_disciplina(self, formato: str = "txt") -> str:
         """Estatísticas de salários por disciplina (min/média/máx)."""
-        vagas = self.db.listar_vagas()
-        grupos: dict[str, list[float]] = {}
-        for v in vagas:
-            grupos.setdefault(v.disciplina, []).append(float(v.salario))
-
-        stats: list[tuple[str, int, float, float, float]] = []  # (disc, count, min, avg, max)
-        for disc, valores in grupos.items():
-            if valores:
-                mmin = min(valores)
-                mmax = max(valores)
-                media = sum(valores) / len(valores)
-                stats.append((disc, len(valores), mmin, media, mmax))
-        stats.sort(key=lambda x: x[4], reverse=True)
+        return "\n".join(self.iterar_salarios_por_disciplina(formato))
+
+    def iterar_salarios_por_disciplina(self, formato: str = "txt") -> Iterator[str]:
+        """Produz as estatísticas de salários por disciplina linha a linha"""
+        # (disc, count, min, avg, max), já ordenado pelo máximo
+        stats = self.db.estatisticas_salario_por_disciplina()
 
         if formato == "csv":
-            buf = StringIO()
-            writer = csv.writer(buf)
-            writer.writerow(["Disciplina", "Qtd", "Salario_Min", "Salario_Medio", "Salario_Max"])
-            for disc, qtd, mmin, media, mmax in stats:
-                writer.writerow([disc, qtd, f"{mmin:.2f}", f"{media:.2f}", f"{mmax:.2f}"])
-            return buf.getvalue().rstrip("\n")
-
-        linhas: List[str] = []
-        linhas.append("=" * 80)
-        linhas.append("SALÁRIOS POR DISCIPLINA (min/médio/máx)")
-        linhas.append(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        linhas.append("=" * 80)
+            yield from _linhas_csv(
+                ["Disciplina", "Qtd", "Salario_Min", "Salario_Medio", "Salario_Max"],
+                ([disc, qtd, f"{mmin:.2f}", f"{media:.2f}", f"{mmax:.2f}"]
+                 for disc, qtd, mmin, media, mmax in stats)
+            )
+            return
+
+        yield from _linhas_cabecalho("SALÁRIOS POR DISCIPLINA (min/médio/máx)")
         for disc, qtd, mmin, media, mmax in stats:
-            linhas.append(f"- {disc}: qtd={qtd}, min=R$ {mmin:.2f}, médio=R$ {media:.2f}, máx=R$ {mmax:.2f}")
-        return "\n".join(linhas)
-    
-    def salvar_relatorio(self, conteudo: str, nome_arquivo: str):
-        """Salva o relatório em arquivo dentro da pasta 'output/'"""
+            yield f"- {disc}: qtd={qtd}, min=R$ {mmin:.2f}, médio=R$ {media:.2f}, máx=R$ {mmax:.2f}"
+
+    def gerar_distribuicao_salarios(self, formato: str = "txt", somente_abertas: bool = False) -> str:
+        """Distribuição de salários por disciplina (quartis e carga média)."""
+        return "\n".join(self.iterar_distribuicao_salarios(formato, somente_abertas))
+
+    def iterar_distribuicao_salarios(self, formato: str = "txt", somente_abertas: bool = False) -> Iterator[str]:
+        """Produz a distribuição de salários linha a linha.
+
+        Os quartis precisam de todos os valores de cada disciplina, então o
+        cálculo é feito sobre as colunas compactas de `carregar_colunas_vagas`.
+        """
+        colunas = self.db.carregar_colunas_vagas(status="Aberta" if somente_abertas else None)
+        stats = distribuicao_salarios_por_disciplina(colunas)
+
+        if formato == "csv":
+            yield from _linhas_csv(
+                ["Disciplina", "Qtd", "Salario_Min", "Salario_Q1", "Salario_Mediana",
+                 "Salario_Q3", "Salario_Max", "Carga_Media"],
+                ([disc, qtd, f"{mmin:.2f}", f"{q1:.2f}", f"{mediana:.2f}", f"{q3:.2f}", f"{mmax:.2f}", f"{carga:.1f}"]
+                 for disc, qtd, mmin, q1, mediana, q3, mmax, carga in stats)
+            )
+            return
+
+        titulo = "DISTRIBUIÇÃO DE SALÁRIOS POR DISCIPLINA (quartis)"
+        if somente_abertas:
+            titulo += " - APENAS VAGAS ABERTAS"
+        yield from _linhas_cabecalho(titulo)
+        for disc, qtd, mmin, q1, mediana, q3, mmax, carga in stats:
+            yield (f"- {disc}: qtd={qtd}, min=R$ {mmin:.2f}, Q1=R$ {q1:.2f}, mediana=R$ {mediana:.2f}, "
+                   f"Q3=R$ {q3:.2f}, máx=R$ {mmax:.2f}, carga média={carga:.1f}h")
+
+    def gerar_sugestoes_professores(self, formato: str = "txt", limite: int = CANDIDATOS_POR_VAGA) -> str:
+        """Sugestões de professores disponíveis para cada vaga aberta."""
+        return "\n".join(self.iterar_sugestoes_professores(formato, limite))
+
+    def iterar_sugestoes_professores(self, formato: str = "txt", limite: int = CANDIDATOS_POR_VAGA) -> Iterator[str]:
+        """Produz as sugestões de professores linha a linha"""
+        sugestoes = MotorCompatibilidade(self.db).sugerir_vagas_abertas(limite)
+
+        if formato == "csv":
+            yield from _linhas_csv(
+                ["Vaga_ID", "Disciplina", "Posicao", "Professor_ID", "Professor", "Especialidade", "Pontuacao"],
+                ([vaga.id, vaga.disciplina, pos, prof.id, prof.nome, prof.especialidade, f"{pontos:.2f}"]
+                 for vaga, candidatos in sugestoes
+                 for pos, (prof, pontos) in enumerate(candidatos, 1))
+            )
+            return
+
+        yield from _linhas_cabecalho("SUGESTÕES DE PROFESSORES PARA VAGAS ABERTAS")
+        for vaga, candidatos in sugestoes:
+            yield f"Vaga {vaga.id} | {vaga.disciplina}"
+            if not candidatos:
+                yield "   (nenhum professor disponível compatível)"
+            for pos, (prof, pontos) in enumerate(candidatos, 1):
+                yield f"   {pos}. {prof.nome} ({prof.especialidade}) - pontuação {pontos:.2f}"
+
+    def escrever_relatorio(self, linhas: Iterable[str], destino: TextIO) -> int:
+        """Escreve as linhas de um relatório em um arquivo/stream à medida
+        que são produzidas. Retorna a quantidade de linhas escritas."""
+        total = 0
+        for linha in linhas:
+            if total:
+                destino.write("\n")
+            destino.write(linha)
+            total += 1
+        return total
+
+    def salvar_relatorio(self, conteudo: Union[str, Iterable[str]], nome_arquivo: str):
+        """Salva o relatório em arquivo dentro da pasta 'output/'
+
+        `conteudo` pode ser a string completa ou o iterador de linhas de um
+        método `iterar_*`, que é gravado sem montar o relatório em memória.
+        """
         try:
             out_dir = os.path.join(os.getcwd(), 'output')
             os.makedirs(out_dir, exist_ok=True)
             destino = os.path.join(out_dir, nome_arquivo)
             with open(destino, 'w', encoding='utf-8') as f:
-                f.write(conteudo)
+                if isinstance(conteudo, str):
+                    f.write(conteudo)
+                else:
+                    self.escrever_relatorio(conteudo, f)
             return True
         except Exception as e:
             print(f"Erro ao salvar relatório: {e}")
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Ritmo adaptativo do loop da GUI
+
+Decide, a cada frame, o FPS alvo e se o loop pode dormir até o próximo
+evento de entrada. Com entrada recente ou animação em curso roda no FPS
+cheio. Parado, mas com algo que depende do relógio na tela (mensagem com
+prazo, cursor piscando), cai para um FPS baixo. Parado e sem nada pendente,
+bloqueia esperando eventos, se a política permitir. Não depende do raylib.
+"""
+
+from typing import Any, Dict, Optional, Union
+
+# Políticas de ritmo (ver resolver_politica):
+# - fps_ativo: FPS com entrada recente ou animação
+# - fps_ocioso: FPS parado (temporizadores ainda avançam)
+# - ocioso_apos: segundos sem entrada até sair do FPS cheio
+# - bloquear: parado e sem temporizador, dorme até o próximo evento
+POLITICAS_FRAMES: Dict[str, Dict[str, Any]] = {
+    # Redesenha sempre no FPS cheio (comportamento original)
+    "continua": {"fps_ativo": 60, "fps_ocioso": 60, "ocioso_apos": 0.0, "bloquear": False},
+    # FPS cheio ao interagir, 10 FPS parado e sono quando nada está pendente
+    "adaptativa": {"fps_ativo": 60, "fps_ocioso": 10, "ocioso_apos": 1.0, "bloquear": True},
+    # Para máquinas compartilhadas: teto menor e ociosidade mais cedo
+    "economia": {"fps_ativo": 30, "fps_ocioso": 5, "ocioso_apos": 0.5, "bloquear": True},
+}
+
+# Estados do ritmo
+ATIVO = "ativo"
+OCIOSO = "ocioso"
+DORMINDO = "dormindo"
+
+
+def resolver_politica(politica: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """Valida uma política (nome em POLITICAS_FRAMES ou dicionário).
+
+    None equivale a "continua". Um dicionário pode trazer só parte das
+    chaves; as demais vêm de "continua".
+    """
+    if politica is None:
+        return dict(POLITICAS_FRAMES["continua"])
+    if isinstance(politica, str):
+        if politica not in POLITICAS_FRAMES:
+            raise ValueError(f"Política de frames desconhecida: {politica!r} "
+                             f"(use uma de {sorted(POLITICAS_FRAMES)})")
+        return dict(POLITICAS_FRAMES[politica])
+    resolvida = dict(POLITICAS_FRAMES["continua"])
+    for nome, valor in politica.items():
+        if nome not in resolvida:
+            raise ValueError(f"Chave não suportada na política de frames: {nome!r}")
+        if nome == "bloquear":
+            valor = bool(valor)
+        elif nome.startswith("fps_"):
+            if not isinstance(valor, int) or valor <= 0:
+                raise ValueError(f"Valor inválido para {nome}: {valor!r}")
+        elif not isinstance(valor, (int, float)) or valor < 0:
+            raise ValueError(f"Valor inválido para {nome}: {valor!r}")
+        resolvida[nome] = valor
+    if resolvida["fps_ocioso"] > resolvida["fps_ativo"]:
+        raise ValueError("fps_ocioso não pode ser maior que fps_ativo")
+    return resolvida
+
+
+class RitmoFrames:
+    """Estado do ritmo do loop: ATIVO, OCIOSO ou DORMINDO"""
+
+    def __init__(self, politica: Union[str, Dict[str, Any], None] = None):
+        self.politica = resolver_politica(politica)
+        self.estado = ATIVO
+        self._ultima_atividade: Optional[float] = None
+
+    @property
+    def fps_alvo(self) -> int:
+        """FPS a aplicar no estado atual (dormindo, vale o baixo ao acordar)"""
+        return self.politica["fps_ativo"] if self.estado == ATIVO else self.politica["fps_ocioso"]
+
+    def decidir(self, agora: float, entrada: bool, animando: bool, temporizador: bool) -> str:
+        """Atualiza e retorna o estado para o próximo frame.
+
+        - `entrada`: houve entrada do usuário neste frame
+        - `animando`: algo na tela muda a cada frame (spinner, overlay)
+        - `temporizador`: algo na tela muda com o tempo, sem pressa
+          (prazo da mensagem, cursor piscando)
+        """
+        if entrada or animando or self._ultima_atividade is None:
+            self._ultima_atividade = agora
+        if agora - self._ultima_atividade < self.politica["ocioso_apos"]:
+            self.estado = ATIVO
+        elif temporizador or not self.politica["bloquear"]:
+            self.estado = OCIOSO
+        else:
+            self.estado = DORMINDO
+        return self.estado
@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do sistema com dados sintéticos
+
+Gera bancos com N professores e N vagas (nomes, disciplinas e cidades em
+português, com variações de acento/maiúsculas) e mede:
+- cada método de leitura/escrita do `Database`
+- cada relatório do `ReportGenerator` em cada formato
+- o custo de um frame das listas da GUI, sem janela (desenho descartado)
+
+O resultado é um JSON, para comparar execuções ao longo do tempo:
+
+    python benchmark.py --tamanhos 1000 100000 --saida bench.json
+    python benchmark.py --tamanhos 1000 --comparar bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.database import Database, FiltroVagas
+from app.exportacao import RELATORIOS
+from app.models import Professor, Instituicao, Vaga
+from app.reports import ReportGenerator
+
+# Versão do formato do JSON (mudar ao alterar a estrutura)
+VERSAO_FORMATO = 1
+
+# Tamanhos pré-definidos (professores = vagas; instituições = N / 20)
+TAMANHOS_PADRAO = (1000,)
+
+# Repetições de cada medição: consultas que varrem a tabela x operações pontuais
+REPETICOES_VARREDURA = 3
+REPETICOES_PONTUAIS = 50
+
+# Quadros simulados por cenário de lista da GUI
+QUADROS_GUI = 300
+
+PRIMEIROS_NOMES = (
+    "Ana", "João", "Maria", "José", "Antônio", "Francisca", "Carlos", "Paulo", "Lúcia", "Pedro",
+    "Luís", "Marcos", "Gabriela", "Rafael", "Juliana", "Fernanda", "Letícia", "Mateus", "Beatriz",
+    "Thiago", "Camila", "Rodrigo", "Patrícia", "Sérgio", "Débora", "Vinícius", "Mônica", "Caio",
+)
+SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima",
+    "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo", "Melo", "Barbosa", "Rocha",
+    "Dias", "Nascimento", "Conceição", "Gonçalves", "Magalhães", "Assunção", "Brandão",
+)
+DISCIPLINAS = (
+    "Matemática", "Língua Portuguesa", "História", "Geografia", "Física", "Química", "Biologia",
+    "Educação Física", "Artes", "Inglês", "Espanhol", "Filosofia", "Sociologia", "Informática",
+    "Programação", "Redes de Computadores", "Administração", "Contabilidade", "Enfermagem",
+    "Gastronomia", "Logística", "Design Gráfico", "Estatística", "Eletrotécnica", "Mecânica",
+)
+CIDADES = (
+    ("São Paulo", "SP"), ("Campinas", "SP"), ("Santos", "SP"), ("Rio de Janeiro", "RJ"),
+    ("Niterói", "RJ"), ("Belo Horizonte", "MG"), ("Uberlândia", "MG"), ("Curitiba", "PR"),
+    ("Londrina", "PR"), ("Porto Alegre", "RS"), ("Florianópolis", "SC"), ("Salvador", "BA"),
+    ("Recife", "PE"), ("Fortaleza", "CE"), ("Belém", "PA"), ("Manaus", "AM"), ("Goiânia", "GO"),
+    ("Brasília", "DF"), ("Vitória", "ES"), ("São Luís", "MA"),
+)
+TIPOS_INSTITUICAO = ("Escola Estadual", "Colégio", "Centro Universitário", "Faculdade", "Instituto", "SENAC")
+STATUS_VAGA = (("Aberta", 0.5), ("Preenchida", 0.35), ("Cancelada", 0.15))
+
+
+# ===== DADOS SINTÉTICOS =====
+
+def _variar_grafia(rng: random.Random, texto: str) -> str:
+    """Grafia alternativa ocasional (sem acentos/maiúsculas), como em
+    cadastros digitados à mão"""
+    sorteio = rng.random()
+    if sorteio < 0.05:
+        return texto.upper()
+    if sorteio < 0.10:
+        return texto.lower()
+    return texto
+
+
+def gerar_professores(rng: random.Random, quantidade: int, inicio: int = 0) -> Iterator[Professor]:
+    """Professores com CPF único (sequencial a partir de `inicio`)"""
+    for i in range(inicio, inicio + quantidade):
+        nome = f"{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+        usuario = nome.split()[0].lower() + str(i)
+        yield Professor(
+            nome=nome,
+            cpf=f"{i:011d}",
+            email=f"{usuario}@exemplo.com.br",
+            telefone=f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            especialidade=_variar_grafia(rng, rng.choice(DISCIPLINAS)),
+        )
+
+
+def gerar_instituicoes(rng: random.Random, quantidade: int, inicio: int = 0) -> Iterator[Instituicao]:
+    """Instituições com CNPJ único (sequencial a partir de `inicio`)"""
+    for i in range(inicio, inicio + quantidade):
+        cidade, estado = rng.choice(CIDADES)
+        yield Instituicao(
+            nome=f"{rng.choice(TIPOS_INSTITUICAO)} {rng.choice(SOBRENOMES)} {i}",
+            cnpj=f"{i:08d}/0001-{i % 100:02d}",
+            endereco=f"Rua {rng.choice(SOBRENOMES)}, {rng.randint(1, 3000)}",
+            cidade=cidade,
+            estado=estado,
+        )
+
+
+def gerar_vagas(rng: random.Random, quantidade: int, instituicoes: List[int],
+                professores: List[int], agora: datetime) -> Iterator[Vaga]:
+    """Vagas espalhadas pelos últimos 400 dias; as Preenchidas têm professor"""
+    status_opcoes = [s for s, _ in STATUS_VAGA]
+    pesos = [p for _, p in STATUS_VAGA]
+    for _ in range(quantidade):
+        disciplina = rng.choice(DISCIPLINAS)
+        status = rng.choices(status_opcoes, pesos)[0]
+        cadastro = agora - timedelta(seconds=rng.randint(0, 400 * 86400))
+        yield Vaga(
+            instituicao_id=rng.choice(instituicoes),
+            disciplina=_variar_grafia(rng, disciplina),
+            carga_horaria=rng.choice((10, 20, 30, 40)),
+            salario=round(rng.uniform(1500, 9000), 2),
+            descricao=f"Substituição de {rng.randint(1, 12)} mes(es) em {disciplina}",
+            status=status,
+            professor_id=rng.choice(professores) if status == "Preenchida" else None,
+            data_cadastro=cadastro.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+
+def popular(db: Database, tamanho: int, semente: int) -> Tuple[Dict[str, float], Dict[str, List[int]]]:
+    """Carrega `tamanho` professores e vagas (e tamanho/20 instituições).
+
+    Retorna os tempos das inserções em lote e os ids gerados.
+    """
+    rng = random.Random(semente)
+    tempos: Dict[str, float] = {}
+
+    inicio = time.perf_counter()
+    professores = db.inserir_professores_em_lote(gerar_professores(rng, tamanho))
+    tempos["inserir_professores_em_lote"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    instituicoes = db.inserir_instituicoes_em_lote(gerar_instituicoes(rng, max(10, tamanho // 20)))
+    tempos["inserir_instituicoes_em_lote"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    vagas = db.inserir_vagas_em_lote(gerar_vagas(rng, tamanho, instituicoes, professores, datetime.now()))
+    tempos["inserir_vagas_em_lote"] = time.perf_counter() - inicio
+
+    return tempos, {"professores": professores, "instituicoes": instituicoes, "vagas": vagas}
+
+
+# ===== MEDIÇÃO =====
+
+def _contar_itens(resultado: Any) -> Optional[int]:
+    """Quantidade de itens do resultado, consumindo iteradores"""
+    if resultado is None or isinstance(resultado, (int, float, str)):
+        return None
+    if hasattr(resultado, "__len__"):
+        return len(resultado)
+    if hasattr(resultado, "__next__"):
+        return sum(1 for _ in resultado)
+    return None
+
+
+def _medir(grupo: str, nome: str, funcao: Callable[[], Any], repeticoes: int) -> Dict[str, Any]:
+    """Executa `funcao` `repeticoes` vezes (consumindo o resultado) e resume os tempos"""
+    tempos = []
+    itens = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        itens = _contar_itens(funcao())
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        "grupo": grupo,
+        "nome": nome,
+        "repeticoes": repeticoes,
+        "itens": itens,
+        "min_s": min(tempos),
+        "mediana_s": statistics.median(tempos),
+        "max_s": max(tempos),
+    }
+
+
+def _resultado_unico(grupo: str, nome: str, segundos: float, itens: Optional[int]) -> Dict[str, Any]:
+    return {"grupo": grupo, "nome": nome, "repeticoes": 1, "itens": itens,
+            "min_s": segundos, "mediana_s": segundos, "max_s": segundos}
+
+
+def medir_database(db: Database, ids: Dict[str, List[int]], semente: int) -> List[Dict[str, Any]]:
+    """Mede os métodos públicos do Database sobre o banco populado"""
+    rng = random.Random(semente + 1)
+    total = len(ids["professores"])
+    novos = {"professores": [], "instituicoes": [], "vagas": []}
+    sequencia = iter(range(10 ** 9))
+
+    def professor_aleatorio() -> Professor:
+        return db.buscar_professor(rng.choice(ids["professores"]))
+
+    def instituicao_aleatoria() -> Instituicao:
+        return db.buscar_instituicao(rng.choice(ids["instituicoes"]))
+
+    def vaga_aleatoria() -> Vaga:
+        return db.buscar_vaga(rng.choice(ids["vagas"]))
+
+    def inserir_professor():
+        prof = next(gerar_professores(rng, 1, inicio=total * 10 + next(sequencia)))
+        novos["professores"].append(db.inserir_professor(prof))
+
+    def inserir_instituicao():
+        inst = next(gerar_instituicoes(rng, 1, inicio=total * 10 + next(sequencia)))
+        novos["instituicoes"].append(db.inserir_instituicao(inst))
+
+    def inserir_vaga():
+        vaga = next(gerar_vagas(rng, 1, ids["instituicoes"], ids["professores"], datetime.now()))
+        novos["vagas"].append(db.inserir_vaga(vaga))
+
+    def atualizar_professor():
+        prof = professor_aleatorio()
+        prof.telefone = f"(11) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+        db.atualizar_professor(prof)
+
+    def atualizar_instituicao():
+        inst = instituicao_aleatoria()
+        inst.endereco = f"Rua {rng.choice(SOBRENOMES)}, {rng.randint(1, 3000)}"
+        db.atualizar_instituicao(inst)
+
+    def atualizar_vaga():
+        vaga = vaga_aleatoria()
+        vaga.salario = round(rng.uniform(1500, 9000), 2)
+        db.atualizar_vaga(vaga)
+
+    def pagina_do_meio(listar: Callable[..., List[Any]]) -> Callable[[], List[Any]]:
+        # Chave de uma página no meio da listagem (keyset)
+        meio = listar(None, max(1, total // 2))
+        apos = meio[-1] if meio else None
+        return lambda: listar(apos)
+
+    filtro = FiltroVagas(status="Aberta", salario_min=3000, salario_max=6000)
+    disciplina = DISCIPLINAS[0]
+
+    varreduras: List[Tuple[str, Callable[[], Any]]] = [
+        ("listar_professores", db.listar_professores),
+        ("iterar_professores", db.iterar_professores),
+        ("contar_professores", db.contar_professores),
+        ("listar_professores_pagina(inicio)", lambda: db.listar_professores_pagina()),
+        ("listar_professores_pagina(meio)", pagina_do_meio(db.listar_professores_pagina)),
+        ("listar_professores_por_especialidade", lambda: db.listar_professores_por_especialidade(disciplina)),
+        ("listar_instituicoes", db.listar_instituicoes),
+        ("iterar_instituicoes", db.iterar_instituicoes),
+        ("contar_instituicoes", db.contar_instituicoes),
+        ("listar_instituicoes_pagina(inicio)", lambda: db.listar_instituicoes_pagina()),
+        ("listar_vagas", db.listar_vagas),
+        ("iterar_vagas", db.iterar_vagas),
+        ("iterar_vagas(Aberta)", lambda: db.iterar_vagas(status="Aberta")),
+        ("consultar_vagas(filtro)", lambda: db.consultar_vagas(filtro)),
+        ("contar_vagas", db.contar_vagas),
+        ("contar_vagas(Aberta)", lambda: db.contar_vagas(status="Aberta")),
+        ("contar_vagas(filtro)", lambda: db.contar_vagas(filtro=filtro)),
+        ("listar_vagas_pagina(inicio)", lambda: db.listar_vagas_pagina()),
+        ("listar_vagas_pagina(meio)", pagina_do_meio(db.listar_vagas_pagina)),
+        ("listar_vagas_pagina(filtro)", lambda: db.listar_vagas_pagina(filtro=filtro)),
+        ("professores_alocados", db.professores_alocados),
+        ("contar_vagas_por_status", db.contar_vagas_por_status),
+        ("contar_vagas_por_disciplina", db.contar_vagas_por_disciplina),
+        ("contar_vagas_por_disciplina(Aberta)", lambda: db.contar_vagas_por_disciplina(status="Aberta")),
+        ("medias_salario_por_disciplina", db.medias_salario_por_disciplina),
+        ("estatisticas_salario_por_disciplina", db.estatisticas_salario_por_disciplina),
+        ("aging_vagas_abertas", db.aging_vagas_abertas),
+        ("aging_vagas_abertas(10)", lambda: db.aging_vagas_abertas(10)),
+        ("aging_por_faixa", db.aging_por_faixa),
+        ("carregar_colunas_vagas", db.carregar_colunas_vagas),
+        ("iterar_vagas_detalhadas", db.iterar_vagas_detalhadas),
+        ("reconstruir_estatisticas", db.reconstruir_estatisticas),
+    ]
+    pontuais: List[Tuple[str, Callable[[], Any]]] = [
+        ("buscar_professor", professor_aleatorio),
+        ("buscar_instituicao", instituicao_aleatoria),
+        ("buscar_vaga", vaga_aleatoria),
+        ("buscar_professores_por_nome", lambda: db.buscar_professores_por_nome(rng.choice(PRIMEIROS_NOMES)[:3])),
+        ("buscar_professores_texto", lambda: db.buscar_professores_texto(rng.choice(SOBRENOMES)[:4])),
+        ("buscar_instituicoes_por_nome", lambda: db.buscar_instituicoes_por_nome(rng.choice(TIPOS_INSTITUICAO)[:4])),
+        ("buscar_vagas_texto", lambda: db.buscar_vagas_texto(rng.choice(DISCIPLINAS)[:4])),
+        ("buscar_vagas_texto(filtro)", lambda: db.buscar_vagas_texto(rng.choice(DISCIPLINAS)[:4], filtro=filtro)),
+        ("inserir_professor", inserir_professor),
+        ("inserir_instituicao", inserir_instituicao),
+        ("inserir_vaga", inserir_vaga),
+        ("atualizar_professor", atualizar_professor),
+        ("atualizar_instituicao", atualizar_instituicao),
+        ("atualizar_vaga", atualizar_vaga),
+        # As exclusões removem os registros criados pelas inserções acima
+        ("deletar_vaga", lambda: db.deletar_vaga(novos["vagas"].pop())),
+        ("deletar_professor", lambda: db.deletar_professor(novos["professores"].pop())),
+        ("deletar_instituicao", lambda: db.deletar_instituicao(novos["instituicoes"].pop())),
+    ]
+
+    resultados = [_medir("database", nome, funcao, REPETICOES_VARREDURA) for nome, funcao in varreduras]
+    resultados += [_medir("database", nome, funcao, REPETICOES_PONTUAIS) for nome, funcao in pontuais]
+    return resultados
+
+
+def medir_relatorios(db: Database) -> List[Dict[str, Any]]:
+    """Mede cada relatório em cada formato, consumindo as linhas sem gravar"""
+    gerador = ReportGenerator(db)
+    resultados = []
+    for nome, (formatos, produzir) in RELATORIOS.items():
+        for formato in formatos:
+            resultados.append(_medir("relatorios", f"{nome}.{formato}",
+                                     lambda p=produzir, f=formato: p(gerador, f), REPETICOES_VARREDURA))
+    return resultados
+
+
+class _RaylibSemJanela:
+    """Substitui o módulo pyray durante a medição da GUI: descarta o desenho
+    e responde à entrada como se nada fosse pressionado. Os demais nomes
+    (Color, Rectangle, color_alpha, ...) vêm do pyray real."""
+
+    def __init__(self, pyray: Any):
+        self._pyray = pyray
+
+    def __getattr__(self, nome: str) -> Any:
+        if nome.startswith("draw_") or nome in ("begin_drawing", "end_drawing", "clear_background",
+                                                "begin_texture_mode", "end_texture_mode",
+                                                "unload_render_texture"):
+            return _nada
+        return getattr(self._pyray, nome)
+
+    def load_render_texture(self, largura: int, altura: int):
+        textura = SimpleNamespace(id=0, width=largura, height=altura)
+        return SimpleNamespace(id=0, texture=textura, depth=textura)
+
+    def get_mouse_position(self):
+        return self._pyray.Vector2(-1, -1)
+
+    def is_mouse_button_pressed(self, *args):
+        return False
+
+    def is_mouse_button_down(self, *args):
+        return False
+
+    def is_key_pressed(self, *args):
+        return False
+
+    def get_key_pressed(self):
+        return 0
+
+    def get_mouse_delta(self):
+        return self._pyray.Vector2(0, 0)
+
+    def get_char_pressed(self):
+        return 0
+
+    def get_mouse_wheel_move(self):
+        return 0.0
+
+    def get_frame_time(self):
+        return 1 / 60
+
+    def get_time(self):
+        return time.perf_counter()
+
+    def measure_text(self, texto: str, tamanho: int) -> int:
+        return len(texto) * tamanho // 2
+
+
+def _nada(*args, **kwargs):
+    return None
+
+
+def _percentil(valores: List[float], fracao: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+def medir_gui(db: Database, semente: int, quadros: int = QUADROS_GUI) -> List[Dict[str, Any]]:
+    """Custo de um frame de cada tela de lista, sem janela.
+
+    Para cada lista mede a abertura (primeiro frame) e dois cenários de
+    `quadros` frames: rolagem contínua (30 px por frame, como a roda do
+    mouse) e saltos para posições aleatórias; depois, frames parados nos
+    menus. Tudo é medido com e sem o cache de texturas (sufixo
+    ".sem_textura"). Vazio se o pyray não estiver instalado.
+    """
+    try:
+        import pyray
+        from app import gui as modulo_gui
+    except ImportError:
+        return []
+
+    rng = random.Random(semente + 2)
+    original = modulo_gui.rl
+    modulo_gui.rl = _RaylibSemJanela(pyray)
+    resultados = []
+    try:
+        for cache_texturas, sufixo in ((True, ""), (False, ".sem_textura")):
+            tela = modulo_gui.GUI(db, workers_relatorio=1, cache_texturas=cache_texturas)
+            try:
+                resultados.extend(_medir_telas_gui(tela, rng, quadros, sufixo))
+            finally:
+                tela.executor_relatorios.shutdown(wait=True)
+    finally:
+        modulo_gui.rl = original
+    return resultados
+
+
+def _medir_telas_gui(tela: Any, rng: random.Random, quadros: int, sufixo: str) -> List[Dict[str, Any]]:
+    resultados = []
+
+    def medir_quadros(nome: str, antes: Callable[[int], None]):
+        tempos = []
+        for quadro in range(quadros):
+            antes(quadro)
+            tela.chamadas_texto = tela.chamadas_medida = 0
+            inicio = time.perf_counter()
+            tela.atualizar()
+            tela.desenhar()
+            tempos.append(time.perf_counter() - inicio)
+        resultados.append({
+            "grupo": "gui",
+            "nome": nome + sufixo,
+            "repeticoes": quadros,
+            "itens": None,
+            "min_s": min(tempos),
+            "mediana_s": statistics.median(tempos),
+            "max_s": max(tempos),
+            "p95_s": _percentil(tempos, 0.95),
+            "draw_text_por_frame": tela._contagem_frame[0],
+            "measure_text_por_frame": tela._contagem_frame[1],
+        })
+
+    telas = {
+        "lista_professores": tela._recarregar_professores,
+        "lista_instituicoes": tela._recarregar_instituicoes,
+        "lista_vagas": tela._recarregar_vagas,
+    }
+    for nome_tela, abrir in telas.items():
+        tela.tela_atual = nome_tela
+        tela.scroll_offset = 0
+        inicio = time.perf_counter()
+        abrir()
+        tela.desenhar()
+        resultados.append(_resultado_unico("gui", f"{nome_tela}.abrir{sufixo}", time.perf_counter() - inicio, None))
+
+        maximo = tela._scroll_maximo()
+
+        def rolagem(quadro: int):
+            tela.scroll_offset = (quadro * 30) % (maximo + 1)
+
+        def salto(quadro: int):
+            tela.scroll_offset = rng.randint(0, maximo)
+
+        medir_quadros(f"{nome_tela}.rolagem", rolagem)
+        medir_quadros(f"{nome_tela}.salto", salto)
+
+    for nome_tela in ("menu_principal", "relatorios"):
+        tela.tela_atual = nome_tela
+        medir_quadros(f"{nome_tela}.parado", lambda quadro: None)
+    return resultados
+
+
+# ===== EXECUÇÃO =====
+
+def _versao_git() -> Optional[str]:
+    """Commit atual (None fora de um repositório git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(tamanhos: List[int], semente: int = 42, perfil: str = "leitura",
+             incluir_gui: bool = True, progresso: Callable[[str], None] = lambda _: None) -> Dict[str, Any]:
+    """Roda o benchmark em um banco temporário para cada tamanho"""
+    execucao: Dict[str, Any] = {
+        "versao_formato": VERSAO_FORMATO,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": _versao_git(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "semente": semente,
+        "perfil": perfil,
+        "tamanhos": {},
+    }
+    for tamanho in tamanhos:
+        with tempfile.TemporaryDirectory(prefix="benchmark_") as diretorio:
+            db = Database(os.path.join(diretorio, "benchmark.db"), perfil=perfil)
+            try:
+                progresso(f"[{tamanho}] populando")
+                tempos_carga, ids = popular(db, tamanho, semente)
+                resultados = [_resultado_unico("carga", nome, segundos, None)
+                              for nome, segundos in tempos_carga.items()]
+                progresso(f"[{tamanho}] database")
+                resultados += medir_database(db, ids, semente)
+                progresso(f"[{tamanho}] relatorios")
+                resultados += medir_relatorios(db)
+                if incluir_gui:
+                    progresso(f"[{tamanho}] gui")
+                    resultados += medir_gui(db, semente)
+            finally:
+                db.close()
+        execucao["tamanhos"][str(tamanho)] = resultados
+    return execucao
+
+
+def comparar(anterior: Dict[str, Any], atual: Dict[str, Any]) -> Iterator[str]:
+    """Linhas com a razão atual/anterior das medianas em comum"""
+    yield f"{'tamanho':>9}  {'medição':<55} {'anterior':>10} {'atual':>10} {'razão':>7}"
+    for tamanho, resultados in atual["tamanhos"].items():
+        antes = {(r["grupo"], r["nome"]): r for r in anterior.get("tamanhos", {}).get(tamanho, [])}
+        for r in resultados:
+            a = antes.get((r["grupo"], r["nome"]))
+            if a is None or not a["mediana_s"]:
+                continue
+            razao = r["mediana_s"] / a["mediana_s"]
+            yield (f"{tamanho:>9}  {r['grupo'] + '/' + r['nome']:<55} "
+                   f"{a['mediana_s'] * 1000:>8.2f}ms {r['mediana_s'] * 1000:>8.2f}ms {razao:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark com dados sintéticos (resultado em JSON)")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="quantidades de professores/vagas (ex.: 1000 100000 1000000)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--perfil", default="leitura", help="perfil de PRAGMAs do Database")
+    parser.add_argument("--sem-gui", action="store_true", help="não mede os frames das listas")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--comparar", metavar="JSON", help="resultado anterior para comparar")
+    args = parser.parse_args()
+
+    execucao = executar(args.tamanhos, args.semente, args.perfil, not args.sem_gui,
+                        progresso=lambda msg: print(msg, file=sys.stderr))
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(execucao, f, ensure_ascii=False, indent=2)
+    elif not args.comparar:
+        json.dump(execucao, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        for linha in comparar(anterior, execucao):
+            print(linha)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,11 +15,13 @@ def main():
     print("Iniciando Sistema de Professores Substitutos...")
     
     # Inicializar banco de dados (usar caminho padrão em data/)
-    db = Database()
+    # Perfil "leitura": WAL para a GUI gravar sem bloquear relatórios
+    db = Database(perfil="leitura")
     print("Banco de dados inicializado!")
     
     # Inicializar interface gráfica
-    gui = GUI(db)
+    # Ritmo "adaptativa": 60 FPS ao interagir, 10 FPS ou sono quando parada
+    gui = GUI(db, ritmo="adaptativa")
     gui.inicializar()
     print("Interface gráfica iniciada!")
     
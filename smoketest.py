@@ -39,5 +39,6 @@ rv = rep.gerar_relatorio_vagas('txt')
 print(rv.splitlines()[0], '| total lines:', len(rv.splitlines()))
 
 # Cleanup
+db.close()
 os.remove(db_path)
 print('OK')
\ No newline at end of file
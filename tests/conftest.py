@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Fixtures compartilhadas dos testes (banco SQLite em arquivo temporário)"""
+
+import os
+
+import pytest
+
+from app.database import Database
+from app.models import Instituicao, Professor
+
+
+@pytest.fixture
+def db(tmp_path):
+    banco = Database(os.path.join(str(tmp_path), "teste.db"))
+    yield banco
+    banco.close()
+
+
+@pytest.fixture
+def professor_id(db):
+    return db.inserir_professor(Professor(nome="Ana Silva", cpf="11122233344",
+                                          email="ana@example.com", especialidade="Matematica"))
+
+
+@pytest.fixture
+def instituicao_id(db):
+    return db.inserir_instituicao(Instituicao(nome="Escola A", cnpj="12.345.678/0001-00",
+                                              cidade="Recife", estado="PE"))
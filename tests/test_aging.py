@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Aging de vagas abertas com datas de cadastro nulas ou inválidas"""
+
+from datetime import datetime
+
+from app.database import FAIXA_SEM_DATA
+from app.models import Vaga
+from app.reports import ReportGenerator
+
+REFERENCIA = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def _vaga(db, instituicao_id, data_cadastro, status="Aberta"):
+    return db.inserir_vaga(Vaga(instituicao_id=instituicao_id, disciplina="Matematica",
+                                status=status, data_cadastro=data_cadastro))
+
+
+def _vagas_com_datas(db, instituicao_id):
+    ids = {
+        "antiga": _vaga(db, instituicao_id, "2025-01-01 08:00:00"),
+        "recente": _vaga(db, instituicao_id, "2025-05-30 08:00:00"),
+        "media": _vaga(db, instituicao_id, "2025-04-20 08:00:00"),
+    }
+    with db.conexao() as conn:
+        # data_cadastro nula ou ilegível (bancos antigos / importações)
+        for valor in (None, "ontem"):
+            cursor = conn.execute("INSERT INTO vagas (instituicao_id, disciplina, status, data_cadastro) "
+                                  "VALUES (?, 'Fisica', 'Aberta', ?)", (instituicao_id, valor))
+            ids[valor] = cursor.lastrowid
+    _vaga(db, instituicao_id, "2024-01-01 08:00:00", status="Preenchida")
+    return ids
+
+
+def test_top_n_ignora_datas_nulas_e_invalidas(db, instituicao_id):
+    ids = _vagas_com_datas(db, instituicao_id)
+    mais_antigas = db.aging_vagas_abertas(limite=2, referencia=REFERENCIA)
+    assert [v[0] for v in mais_antigas] == [ids["antiga"], ids["media"]]
+    assert [v[3] for v in mais_antigas] == [151, 42]
+    todas = db.aging_vagas_abertas(referencia=REFERENCIA)
+    assert [v[0] for v in todas] == [ids["antiga"], ids["media"], ids["recente"]]
+
+
+def test_faixas_contam_vagas_sem_data_a_parte(db, instituicao_id):
+    _vagas_com_datas(db, instituicao_id)
+    assert db.aging_por_faixa(REFERENCIA) == [
+        ("0-7", 1), ("8-30", 0), ("31-90", 1), ("90+", 1), (FAIXA_SEM_DATA, 2)]
+
+
+def test_faixa_sem_data_so_aparece_quando_ha_vagas_sem_data(db, instituicao_id):
+    _vaga(db, instituicao_id, "2025-05-30 08:00:00")
+    assert [rotulo for rotulo, _ in db.aging_por_faixa(REFERENCIA)] == ["0-7", "8-30", "31-90", "90+"]
+
+
+def test_relatorio_txt_lista_vagas_sem_data_na_secao_de_faixas(db, instituicao_id):
+    _vagas_com_datas(db, instituicao_id)
+    linhas = list(ReportGenerator(db).iterar_aging_vagas_abertas("txt"))
+    assert "  - sem data de cadastro: 2 vaga(s)" in linhas
+    assert sum(linha.startswith("Vaga ") for linha in linhas) == 3
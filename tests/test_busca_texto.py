@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Índices FTS5 sincronizados pelos triggers e paginação dos resultados de busca"""
+
+import pytest
+
+from app.database import FiltroVagas, LIMITE_BUSCA, Paginador
+from app.models import Instituicao, Professor, Vaga
+
+
+@pytest.fixture
+def db(db):
+    if not db.busca_texto_disponivel:
+        pytest.skip("SQLite sem FTS5")
+    return db
+
+
+def _ids(resultado):
+    return [item.id for item in resultado]
+
+
+def test_atualizacao_troca_os_termos_indexados(db, professor_id):
+    assert _ids(db.buscar_professores_texto("matemat")) == [professor_id]
+    professor = db.buscar_professor(professor_id)
+    professor.especialidade = "Química Orgânica"
+    db.atualizar_professor(professor)
+    assert db.buscar_professores_texto("matemat") == []
+    assert _ids(db.buscar_professores_texto("quimica org")) == [professor_id]
+
+
+def test_exclusao_remove_do_indice(db, professor_id, instituicao_id):
+    vaga_id = db.inserir_vaga(Vaga(instituicao_id=instituicao_id, disciplina="História",
+                                   descricao="Substituição de licença"))
+    assert _ids(db.buscar_vagas_texto("licenca")) == [vaga_id]
+    db.deletar_vaga(vaga_id)
+    db.deletar_professor(professor_id)
+    assert db.buscar_vagas_texto("licenca") == []
+    assert db.buscar_professores_texto("ana") == []
+
+
+def test_troca_de_status_nao_afeta_a_busca(db, instituicao_id):
+    vaga_id = db.inserir_vaga(Vaga(instituicao_id=instituicao_id, disciplina="Geografia"))
+    vaga = db.buscar_vaga(vaga_id)
+    vaga.status = "Preenchida"
+    db.atualizar_vaga(vaga)
+    assert _ids(db.buscar_vagas_texto("geogr")) == [vaga_id]
+
+
+def test_upsert_em_lote_reindexa(db, professor_id):
+    db.inserir_professores_em_lote(
+        [Professor(nome="Beatriz Lima", cpf="11122233344", especialidade="Artes")], conflito="atualizar")
+    assert db.buscar_professores_texto("ana silva") == []
+    assert _ids(db.buscar_professores_texto("beatriz artes")) == [professor_id]
+
+
+def _todas_as_paginas(buscar, total):
+    """Percorre um Paginador de buscas como a GUI, do primeiro ao último item"""
+    paginador = Paginador(buscar, total)
+    return [item.id for _, item in paginador.janela(0, len(paginador))]
+
+
+@pytest.mark.parametrize("com_fts", [True, False])
+def test_busca_de_vagas_pagina_alem_do_limite(db, instituicao_id, com_fts):
+    db.busca_texto_disponivel = com_fts
+    db.inserir_vagas_em_lote(
+        Vaga(instituicao_id=instituicao_id, disciplina=("Matemática", "Matemática Aplicada", "Física")[i % 3],
+             descricao="Ensino de matemática" if i % 5 == 0 else "", status=("Aberta", "Preenchida")[i % 2])
+        for i in range(3 * LIMITE_BUSCA))
+    for filtro in (None, FiltroVagas(status="Aberta")):
+        total = db.contar_vagas_texto("matem", filtro=filtro)
+        assert total > LIMITE_BUSCA
+        ids = _todas_as_paginas(lambda apos, limite: db.buscar_vagas_texto("matem", limite, filtro=filtro, apos=apos),
+                                total)
+        assert ids == _ids(db.buscar_vagas_texto("matem", limite=total + 1, filtro=filtro))
+        assert len(ids) == total == len(set(ids))
+
+
+def test_busca_de_professores_pagina_alem_do_limite(db):
+    db.inserir_professores_em_lote(
+        Professor(nome=f"Professor {i}", cpf=str(i), especialidade=("Matemática", "Física")[i % 2])
+        for i in range(2 * LIMITE_BUSCA + 10))
+    total = db.contar_professores_texto("matem")
+    assert total == LIMITE_BUSCA + 5
+    ids = _todas_as_paginas(lambda apos, limite: db.buscar_professores_texto("matem", limite, apos=apos), total)
+    assert ids == _ids(db.buscar_professores_texto("matem", limite=total))
+
+
+def test_busca_de_instituicoes_por_nome_pagina_alem_do_limite(db):
+    db.inserir_instituicoes_em_lote(
+        Instituicao(nome=("Escola Ária", "ESCOLA ARIA", "Colégio")[i % 3], cnpj=str(i)) for i in range(3 * LIMITE_BUSCA))
+    total = db.contar_instituicoes_por_nome("escola ar")
+    assert total == 2 * LIMITE_BUSCA
+    ids = _todas_as_paginas(lambda apos, limite: db.buscar_instituicoes_por_nome("escola ar", limite, apos=apos),
+                            total)
+    assert ids == _ids(db.buscar_instituicoes_por_nome("escola ar", limite=total))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Cache de entidades x transações do pool (conexao() aninhado)"""
+
+import threading
+
+import pytest
+
+
+class Falha(Exception):
+    pass
+
+
+def test_escrita_fora_de_bloco_invalida_na_hora(db, professor_id):
+    professor = db.buscar_professor(professor_id)
+    professor.nome = "Ana Souza"
+    db.atualizar_professor(professor)
+    assert db.buscar_professor(professor_id).nome == "Ana Souza"
+
+
+def test_rollback_do_bloco_externo_nao_deixa_dado_no_cache(db, professor_id):
+    db.buscar_professor(professor_id)  # aquece o cache
+    with pytest.raises(Falha):
+        with db.conexao():
+            professor = db.buscar_professor(professor_id)
+            professor.nome = "Nao Confirmado"
+            db.atualizar_professor(professor)
+            # Dentro da transação a própria thread vê a escrita...
+            assert db.buscar_professor(professor_id).nome == "Nao Confirmado"
+            raise Falha()
+    # ...mas, desfeita, nem o banco nem o cache a guardam
+    assert db.buscar_professor(professor_id).nome == "Ana Silva"
+    with db.conexao() as conn:
+        assert conn.execute("SELECT nome FROM professores WHERE id = ?",
+                            (professor_id,)).fetchone()[0] == "Ana Silva"
+
+
+def test_bloco_aninhado_invalida_somente_apos_commit_externo(db, professor_id):
+    db.buscar_professor(professor_id)
+    vistos_por_outra_thread = []
+
+    def ler():
+        vistos_por_outra_thread.append(db.buscar_professor(professor_id).nome)
+
+    with db.conexao():
+        with db.conexao():
+            professor = db.buscar_professor(professor_id)
+            professor.nome = "Ana Souza"
+            db.atualizar_professor(professor)
+        # Outra thread ainda vê (e pode guardar no cache) o valor confirmado
+        leitor = threading.Thread(target=ler)
+        leitor.start()
+        leitor.join()
+    assert vistos_por_outra_thread == ["Ana Silva"]
+    # O commit externo descarta o que foi guardado no meio tempo
+    assert db.buscar_professor(professor_id).nome == "Ana Souza"
+
+
+def test_leitura_em_transacao_aberta_nao_popula_cache(db, professor_id):
+    professor = db.buscar_professor(professor_id)
+    db.cache.limpar()
+    with db.conexao():
+        professor.email = "novo@example.com"
+        db.atualizar_professor(professor)
+        db.buscar_professor(professor_id)
+        assert len(db.cache) == 0
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Contadores da tabela `estatisticas` mantidos pelos triggers"""
+
+import random
+
+import pytest
+
+from app.models import Instituicao, Professor, Vaga
+
+DISCIPLINAS = ("Matemática", "MATEMATICA", "matemática", "Física", "História")
+STATUS = ("Aberta", "Preenchida", "Cancelada")
+SALARIOS = (None, 1000.0, 1234.56, 2500.0)
+
+
+def _contadores(db):
+    with db.conexao() as conn:
+        return {(grupo, chave): (qtd, round(soma, 6)) for grupo, chave, qtd, soma in conn.execute(
+            "SELECT grupo, chave, qtd, soma FROM estatisticas WHERE qtd > 0")}
+
+
+def _escrita_aleatoria(db, rng, instituicoes):
+    operacao = rng.randrange(7)
+    vagas = [v.id for v in db.listar_vagas()]
+    if operacao == 0 or not vagas:
+        db.inserir_vaga(Vaga(instituicao_id=rng.choice(instituicoes), disciplina=rng.choice(DISCIPLINAS),
+                             status=rng.choice(STATUS), salario=rng.choice(SALARIOS)))
+    elif operacao == 1:
+        db.inserir_vagas_em_lote(
+            Vaga(instituicao_id=rng.choice(instituicoes), disciplina=rng.choice(DISCIPLINAS),
+                 status=rng.choice(STATUS), salario=rng.choice(SALARIOS)) for _ in range(rng.randint(1, 5)))
+    elif operacao == 2:
+        # Muda um campo por vez para que cada coluna do trigger seja exercitada sozinha
+        vaga = db.buscar_vaga(rng.choice(vagas))
+        campo, valores = rng.choice((("status", STATUS), ("disciplina", DISCIPLINAS), ("salario", SALARIOS)))
+        setattr(vaga, campo, rng.choice(valores))
+        db.atualizar_vaga(vaga)
+    elif operacao == 3:
+        db.deletar_vaga(rng.choice(vagas))
+    elif operacao == 4:
+        # UPDATE de várias linhas tocando uma só coluna: um disparo do trigger por linha
+        with db.conexao() as conn:
+            if rng.random() < 0.5:
+                conn.execute("UPDATE vagas SET status = ? WHERE salario >= ?",
+                             (rng.choice(STATUS), rng.choice((1000.0, 2000.0))))
+            else:
+                conn.execute("UPDATE vagas SET salario = salario * 1.1 WHERE status = ?",
+                             (rng.choice(STATUS),))
+    elif operacao == 5:
+        cpf = str(rng.randrange(20))
+        db.inserir_professores_em_lote([Professor(nome=f"P{cpf}", cpf=cpf)], conflito="ignorar")
+    else:
+        professores = db.listar_professores()
+        if professores:
+            db.deletar_professor(rng.choice(professores).id)
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_contadores_iguais_aos_recalculados_apos_escritas_aleatorias(db, semente):
+    rng = random.Random(semente)
+    instituicoes = db.inserir_instituicoes_em_lote(
+        Instituicao(nome=f"Escola {i}", cnpj=str(i)) for i in range(3))
+    for passo in range(200):
+        _escrita_aleatoria(db, rng, instituicoes)
+        if passo % 50 == 49:
+            mantidos = _contadores(db)
+            db.reconstruir_estatisticas()
+            assert _contadores(db) == mantidos
+
+
+def test_rollback_desfaz_os_contadores(db, instituicao_id):
+    db.inserir_vaga(Vaga(instituicao_id=instituicao_id, disciplina="Física", salario=1000.0))
+    antes = _contadores(db)
+    with pytest.raises(RuntimeError):
+        with db.conexao():
+            db.inserir_vaga(Vaga(instituicao_id=instituicao_id, disciplina="Física", salario=500.0))
+            raise RuntimeError()
+    assert _contadores(db) == antes
+
+
+def test_leituras_publicas_batem_com_as_tabelas(db, instituicao_id):
+    rng = random.Random(7)
+    for _ in range(100):
+        _escrita_aleatoria(db, rng, [instituicao_id])
+    vagas = db.listar_vagas()
+    por_status = {}
+    for vaga in vagas:
+        por_status[vaga.status] = por_status.get(vaga.status, 0) + 1
+    assert db.contar_vagas_por_status() == por_status
+    assert db.contar_vagas() == len(vagas)
+    assert db.contar_professores() == len(db.listar_professores())
+    assert db.contar_vagas(status="Aberta") == por_status.get("Aberta", 0)
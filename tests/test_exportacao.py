@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Exportação em lote a partir de uma única leitura de cada tabela"""
+
+import os
+import re
+import threading
+
+from app.database import Database
+from app.exportacao import RELATORIOS, exportar_relatorios
+from app.models import Instituicao, Professor, Vaga
+from app.reports import ReportGenerator
+
+TABELAS = ("professores", "instituicoes", "vagas")
+
+
+class DatabaseRastreado(Database):
+    """Database que guarda todo SQL executado por suas conexões"""
+
+    def __init__(self, *args, **kwargs):
+        self.comandos = []
+        self.ao_executar = None
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self):
+        conn = super().get_connection()
+        conn.set_trace_callback(self._registrar)
+        return conn
+
+    def _registrar(self, sql):
+        self.comandos.append(sql)
+        if self.ao_executar is not None:
+            self.ao_executar(sql)
+
+
+def _popular(db, n=60):
+    instituicoes = db.inserir_instituicoes_em_lote(
+        Instituicao(nome=f"Escola {i}", cnpj=str(i), cidade="Recife", estado="PE") for i in range(3))
+    professores = db.inserir_professores_em_lote(
+        Professor(nome=f"Professor {i}", cpf=f"{i:011d}",
+                  especialidade=("Matemática", "Física", "Ensino de Matemática")[i % 3]) for i in range(12))
+    db.inserir_vagas_em_lote(
+        Vaga(instituicao_id=instituicoes[i % 3], disciplina=("Matemática", "MATEMATICA", "Física", "História")[i % 4],
+             carga_horaria=10 + i % 3 * 10, salario=1000.0 + (i * 37) % 500,
+             status=("Aberta", "Aberta", "Preenchida", "Cancelada")[i % 4],
+             professor_id=professores[i % 12] if i % 4 >= 2 else None,
+             data_cadastro=("2025-01-0%d 08:00:00" % (1 + i % 9), "data inválida", "2024-06-30")[i % 3])
+        for i in range(n))
+
+
+def _sem_data(conteudo):
+    """Conteúdo sem a linha "Data:" do cabeçalho (horário da geração)"""
+    return [linha for linha in conteudo.split("\n") if not linha.startswith("Data: ")]
+
+
+def test_cada_tabela_e_lida_uma_unica_vez(tmp_path):
+    db = DatabaseRastreado(os.path.join(str(tmp_path), "rastreado.db"))
+    try:
+        _popular(db)
+        db.comandos.clear()
+        exportar_relatorios(db, diretorio=os.path.join(str(tmp_path), "output"))
+        for tabela in TABELAS:
+            leituras = [sql for sql in db.comandos if re.search(rf"\b{tabela}\b", sql)]
+            assert len(leituras) == 1, (tabela, leituras)
+        assert not any(re.search(r"\bestatisticas\b", sql) for sql in db.comandos)
+    finally:
+        db.close()
+
+
+def test_exportacao_nao_ve_escritas_feitas_durante_a_leitura(tmp_path):
+    db = DatabaseRastreado(os.path.join(str(tmp_path), "wal.db"), perfil="leitura")
+    try:
+        _popular(db, n=8)
+        total_vagas = db.contar_vagas()
+        escrita_feita = []
+
+        def escrever_entre_tabelas(sql):
+            # Outra thread grava entre a leitura de professores e a de vagas
+            if not escrita_feita and re.search(r"\bFROM instituicoes\b", sql):
+                escrita_feita.append(True)
+                escritor = threading.Thread(target=lambda: db.inserir_vaga(
+                    Vaga(instituicao_id=db.listar_instituicoes()[0].id, disciplina="Química", salario=1.0)))
+                escritor.start()
+                escritor.join()
+
+        db.ao_executar = escrever_entre_tabelas
+        saida = os.path.join(str(tmp_path), "output")
+        tempos = exportar_relatorios(db, formatos=("csv",), diretorio=saida)
+        db.ao_executar = None
+
+        assert escrita_feita and db.contar_vagas() == total_vagas + 1
+        csv_vagas = next(nome for nome, _, _ in tempos if nome.startswith("relatorio_vagas_"))
+        with open(os.path.join(saida, csv_vagas), encoding="utf-8", newline="") as f:
+            assert "Química" not in f.read()
+    finally:
+        db.close()
+
+
+def test_exportacao_gera_os_mesmos_relatorios_que_o_gerador(db, tmp_path):
+    _popular(db)
+    with db.conexao() as conn:
+        conn.execute("UPDATE vagas SET data_cadastro = NULL WHERE id % 7 = 0")
+    saida = os.path.join(str(tmp_path), "output")
+    tempos = exportar_relatorios(db, diretorio=saida)
+
+    esperados = sum(len(suportados) for suportados, _ in RELATORIOS.values())
+    assert len(tempos) == esperados
+    assert sorted(os.listdir(saida)) == sorted(nome for nome, _, _ in tempos)
+
+    gerador = ReportGenerator(db)
+    for nome_arquivo, linhas, _ in tempos:
+        nome, formato = re.match(r"relatorio_(.+)_\d{8}_\d{6}\.(\w+)$", nome_arquivo).groups()
+        with open(os.path.join(saida, nome_arquivo), encoding="utf-8", newline="") as f:
+            conteudo = f.read()
+        esperado = "\n".join(RELATORIOS[nome][1](gerador, formato))
+        assert _sem_data(conteudo) == _sem_data(esperado), nome_arquivo
+        assert conteudo.count("\n") + 1 == linhas
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""FiltroVagas: a condição SQL de compilar() e aceita() concordam"""
+
+import random
+from datetime import date, datetime
+
+import pytest
+
+from app.database import FiltroVagas
+from app.models import Instituicao, Vaga
+
+DISCIPLINAS = ("Matemática", "MATEMATICA", "matematica ", "Física", "fisica", "História")
+STATUS = ("Aberta", "Preenchida", "Cancelada")
+DATAS = (None, "2024-12-31 23:59:59", "2025-01-01", "2025-01-01 00:00:00", "2025-03-15 10:00:00")
+
+
+def _popular(db, rng, n=300):
+    instituicoes = db.inserir_instituicoes_em_lote(
+        Instituicao(nome=f"Escola {i}", cnpj=f"cnpj-{i}") for i in range(3))
+    db.inserir_vagas_em_lote(
+        Vaga(instituicao_id=rng.choice(instituicoes), disciplina=rng.choice(DISCIPLINAS),
+             status=rng.choice(STATUS),
+             salario=rng.choice((None, 1000.0, 1500.5, 2000.0, 3000.0)),
+             carga_horaria=rng.choice((None, 10, 20, 40)),
+             data_cadastro=rng.choice(DATAS))
+        for _ in range(n))
+    return instituicoes
+
+
+def _filtro_aleatorio(rng, instituicoes):
+    criterios = {
+        "status": rng.choice((None, "Aberta", ("Aberta", "Cancelada"), [], ["Preenchida"])),
+        "disciplina": rng.choice((None, "matemática", "FISICA", "Química")),
+        "instituicao_id": rng.choice((None,) + tuple(instituicoes)),
+        "salario_min": rng.choice((None, 1000, 1500.5, 2500)),
+        "salario_max": rng.choice((None, 1500.5, 2000)),
+        "carga_min": rng.choice((None, 20)),
+        "carga_max": rng.choice((None, 20, 40)),
+        "cadastrada_desde": rng.choice((None, "2025-01-01", date(2025, 1, 1))),
+        "cadastrada_antes": rng.choice((None, "2025-03-15", datetime(2025, 3, 15, 10, 0, 0))),
+    }
+    # Poucos critérios por filtro, para que a maioria não seja vazia
+    ativos = rng.sample(sorted(criterios), rng.randint(0, 3))
+    return FiltroVagas(**{campo: criterios[campo] for campo in ativos})
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_compilar_e_aceita_selecionam_as_mesmas_vagas(db, semente):
+    rng = random.Random(semente)
+    instituicoes = _popular(db, rng)
+    vagas = db.listar_vagas()
+    for _ in range(150):
+        filtro = _filtro_aleatorio(rng, instituicoes)
+        em_python = sorted(v.id for v in vagas if filtro.aceita(v))
+        no_sql = sorted(v.id for v in db.consultar_vagas(filtro))
+        assert no_sql == em_python, filtro
+        assert db.contar_vagas(filtro=filtro) == len(em_python), filtro
+
+
+def test_combinar_sobrepoe_somente_criterios_preenchidos():
+    base = FiltroVagas(status="Aberta", salario_min=1000)
+    combinado = FiltroVagas.combinar(base, status=None, disciplina="Física")
+    assert combinado.criterios() == {"status": "Aberta", "disciplina": "Física", "salario_min": 1000}
+    assert FiltroVagas.combinar(base) is base
+    with pytest.raises(TypeError):
+        base.com(salario=1)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Inserção em lote e upsert por CPF/CNPJ"""
+
+import sqlite3
+
+import pytest
+
+from app.database import TAMANHO_LOTE
+from app.models import Instituicao, Professor, Vaga
+
+
+def _professores(*cpfs, nome="Professor"):
+    return [Professor(nome=f"{nome} {cpf}", cpf=cpf, especialidade="Matematica") for cpf in cpfs]
+
+
+def test_ids_na_ordem_de_entrada_em_varios_lotes(db):
+    cpfs = [f"{i:011d}" for i in range(TAMANHO_LOTE * 2 + 3)]
+    ids = db.inserir_professores_em_lote(_professores(*cpfs))
+    assert len(ids) == len(cpfs)
+    assert [db.buscar_professor(i).cpf for i in ids] == cpfs
+
+
+def test_ids_das_vagas_em_lote(db, instituicao_id):
+    disciplinas = [f"Disciplina {i}" for i in range(TAMANHO_LOTE + 1)]
+    ids = db.inserir_vagas_em_lote(Vaga(instituicao_id=instituicao_id, disciplina=d) for d in disciplinas)
+    assert [db.buscar_vaga(i).disciplina for i in ids] == disciplinas
+
+
+def test_sem_modo_de_conflito_duplicado_desfaz_o_lote(db, professor_id):
+    with pytest.raises(sqlite3.IntegrityError):
+        db.inserir_professores_em_lote(_professores("99900000000", "11122233344"))
+    assert db.contar_professores() == 1
+
+
+def test_ignorar_mantem_existente_e_retorna_seu_id(db, professor_id):
+    ids = db.inserir_professores_em_lote(_professores("11122233344", "55500000000", "55500000000"),
+                                         conflito="ignorar")
+    assert ids[0] == professor_id
+    assert ids[1] == ids[2] != professor_id
+    assert db.buscar_professor(professor_id).nome == "Ana Silva"
+    assert db.contar_professores() == 2
+
+
+def test_atualizar_sobrescreve_e_renormaliza(db, professor_id):
+    db.buscar_professor(professor_id)  # em cache
+    ids = db.inserir_professores_em_lote(
+        [Professor(nome="Ána Maria", cpf="11122233344", especialidade="Física")], conflito="atualizar")
+    assert ids == [professor_id]
+    professor = db.buscar_professor(professor_id)
+    assert (professor.nome, professor.especialidade) == ("Ána Maria", "Física")
+    assert [p.id for p in db.buscar_professores_por_nome("ana m")] == [professor_id]
+    assert db.contar_professores() == 1
+
+
+def test_upsert_de_instituicoes_pelo_cnpj(db, instituicao_id):
+    ids = db.inserir_instituicoes_em_lote(
+        [Instituicao(nome="Escola B", cnpj="12.345.678/0001-00", cidade="Natal", estado="RN"),
+         Instituicao(nome="Escola C", cnpj="99.999.999/0001-99")],
+        conflito="atualizar")
+    assert ids[0] == instituicao_id and ids[1] != instituicao_id
+    assert db.buscar_instituicao(instituicao_id).cidade == "Natal"
+
+
+def test_modo_de_conflito_invalido(db):
+    with pytest.raises(ValueError):
+        db.inserir_professores_em_lote(_professores("1"), conflito="substituir")
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Normalização do SQL registrado pela instrumentação"""
+
+from app.instrumentacao import Instrumentacao, normalizar_sql
+from app.database import Database
+from app.models import Professor
+
+
+def test_null_de_parametro_agrupa_com_valores():
+    com_valor = normalizar_sql("INSERT INTO professores (nome, email) VALUES ('Ana', 'a@x.com')")
+    com_null = normalizar_sql("INSERT INTO professores (nome, email) VALUES ('Ana',  null)")
+    assert com_valor == com_null == "INSERT INTO professores (nome, email) VALUES (?, ?)"
+
+
+def test_is_null_e_not_null_continuam_no_texto():
+    assert normalizar_sql("SELECT * FROM vagas WHERE professor_id IS  NULL AND x IS NOT NULL") == \
+        "SELECT * FROM vagas WHERE professor_id IS NULL AND x IS NOT NULL"
+    assert normalizar_sql("CREATE TABLE t (a TEXT NOT NULL)") == "CREATE TABLE t (a TEXT NOT NULL)"
+
+
+def test_insercoes_com_e_sem_none_ficam_na_mesma_chave(tmp_path):
+    instrumentacao = Instrumentacao()
+    db = Database(str(tmp_path / "i.db"), instrumentacao=instrumentacao)
+    try:
+        db.inserir_professor(Professor(nome="Ana", cpf="1", email="ana@x.com"))
+        db.inserir_professor(Professor(nome="Bia", cpf="2", email=None))
+        sql = instrumentacao.para_dict()["metodos"]["Database.inserir_professor"]["sql"]
+        inserts = {texto: vezes for texto, vezes in sql.items() if texto.startswith("INSERT INTO professores")}
+        assert list(inserts.values()) == [2]
+    finally:
+        db.close()
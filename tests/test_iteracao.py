@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Iteração em streaming (`iterar_*`) e o banco em memória com pool"""
+
+import threading
+
+from app.database import TAMANHO_LOTE, Database
+from app.models import Professor
+
+
+def _popular(db, n=2 * TAMANHO_LOTE + 200):
+    return db.inserir_professores_em_lote(Professor(nome=f"Professor {i}", cpf=str(i)) for i in range(n))
+
+
+def test_leitura_dentro_da_iteracao_em_memoria_nao_trava_o_pool():
+    db = Database(":memory:", pool_timeout=2)
+    try:
+        ids = _popular(db)
+        vistos = [db.buscar_professor(p.id).id for p in db.iterar_professores()]
+        assert vistos == ids
+    finally:
+        db.close()
+
+
+def test_bancos_em_memoria_sao_independentes():
+    primeiro, segundo = Database(":memory:"), Database(":memory:")
+    try:
+        _popular(primeiro, 3)
+        assert primeiro.contar_professores() == 3
+        assert segundo.contar_professores() == 0
+    finally:
+        primeiro.close()
+        segundo.close()
+
+
+def test_conexoes_do_pool_em_memoria_veem_o_mesmo_banco():
+    db = Database(":memory:")
+    try:
+        _popular(db, 5)
+        contagens = []
+        # Com a conexão da thread principal emprestada, a outra thread usa outra do pool
+        with db.conexao():
+            leitor = threading.Thread(target=lambda: contagens.append(len(db.listar_professores())))
+            leitor.start()
+            leitor.join()
+        assert contagens == [5]
+    finally:
+        db.close()
+
+
+def test_leitura_dentro_da_iteracao_em_arquivo(db):
+    ids = _popular(db)
+    assert [db.buscar_professor(p.id).id for p in db.iterar_professores()] == ids
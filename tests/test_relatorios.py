@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Formato dos relatórios CSV (o mesmo do csv.writer, antes do streaming)"""
+
+import csv
+from io import StringIO
+
+from app.models import Professor
+from app.reports import ReportGenerator
+
+
+def test_csv_mantem_terminador_crlf_do_csv_writer(db, professor_id):
+    db.inserir_professor(Professor(nome='Bia "B", da Silva', cpf="2", especialidade="Fisica\nQuimica"))
+    conteudo = ReportGenerator(db).gerar_relatorio_professores("csv")
+
+    buf = StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["ID", "Nome", "CPF", "Email", "Telefone", "Especialidade"])
+    for professor in db.listar_professores():
+        writer.writerow([professor.id, professor.nome, professor.cpf, professor.email or "",
+                         professor.telefone or "", professor.especialidade or ""])
+    assert conteudo == buf.getvalue().rstrip("\n")
+    assert conteudo.count("\r\n") == 2